@@ -0,0 +1,61 @@
+import argparse
+import pathlib
+import sys
+import tempfile
+import time
+import tracemalloc
+import zipfile
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parents[1] / "needle"))
+
+from functions import cdir
+
+
+def make_archive(path: pathlib.Path, members: int):
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_STORED) as archive:
+        for n in range(members):
+            archive.writestr(f"DMC-HON-A-{n:07d}-00A-040A-D/SOURCE-{n:07d}.sgm", b"")
+
+
+def namelist(path: str) -> list:
+    with zipfile.ZipFile(path, "r") as archive:
+        return archive.namelist()
+
+
+def measure(label: str, listing, path: str, members: int):
+    start = time.perf_counter()
+    names = listing(path)
+    elapsed = time.perf_counter() - start
+    assert len(names) == members
+    del names
+
+    # Peak memory is taken on a second, traced run since tracing slows
+    # allocation-heavy code far more than the mmap based reader.
+    tracemalloc.start()
+    listing(path)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    print(
+        f"{label:<18} {members:>8} members  {elapsed * 1000:9.1f} ms"
+        f"  {members / elapsed:12.0f} members/s  peak {peak / 2**20:8.1f} MiB"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Central directory listing speed")
+    parser.add_argument(
+        "--members", type=int, nargs="+", default=[10_000, 100_000, 500_000]
+    )
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for members in args.members:
+            path = pathlib.Path(tmp) / f"corpus-{members}.zip"
+            make_archive(path, members)
+            measure("ZipFile.namelist", namelist, path.as_posix(), members)
+            measure("cdir.list_members", cdir.list_members, path.as_posix(), members)
+            path.unlink()
+
+
+if __name__ == "__main__":
+    main()
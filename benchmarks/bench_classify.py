@@ -0,0 +1,87 @@
+import argparse
+import pathlib
+import random
+import sys
+import timeit
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parents[1] / "needle"))
+
+from functions.classify import classify_members
+
+
+def classify_legacy(source_list: list) -> tuple:
+    # The three comprehensions CellModel.generate_row used before the
+    # single-pass classifier, kept verbatim as the baseline.
+    zip_sfxs = {
+        pathlib.Path(each).name: pathlib.Path(each).suffix
+        for each in source_list
+        if pathlib.Path(each).suffix == ".zip"
+    }
+
+    sgml_sfxs = {
+        pathlib.Path(each).name: pathlib.Path(each).suffix
+        for each in source_list
+        if (
+            (pathlib.Path(each).suffix == ".xml")
+            or (pathlib.Path(each).suffix == ".sgm")
+            or (pathlib.Path(each).suffix == ".sgml")
+        )
+        and not (
+            pathlib.Path(each).name.startswith("PMC-")
+            or pathlib.Path(each).name.startswith("DMC-")
+        )
+    }
+
+    pdf_sfxs = {
+        pathlib.Path(each).name: pathlib.Path(each).suffix
+        for each in source_list
+        if (pathlib.Path(each).suffix == ".pdf")
+        or (pathlib.Path(each).suffix == ".PDF")
+    }
+
+    return list(zip_sfxs), list(sgml_sfxs), list(pdf_sfxs)
+
+
+def make_namelist(entries: int, seed: int = 1000) -> list:
+    rng = random.Random(seed)
+    kinds = (
+        "DMC-HON-A-{:06d}-00A-040A-D.XML",
+        "DMC-HON-A-{:06d}-00A-040A-D.xml",
+        "ICN-HON-{:06d}-001-01.CGM",
+        "ICN-HON-{:06d}-001-01.png",
+        "SOURCE-{:06d}.sgm",
+        "SOURCE-{:06d}.pdf",
+        "SOURCE-{:06d}.PDF",
+        "NESTED-{:06d}.zip",
+        "folder-{:06d}/",
+    )
+    weights = (40, 20, 15, 15, 4, 2, 1, 1, 2)
+    return [
+        "delivery/data/" + rng.choices(kinds, weights)[0].format(n)
+        for n in range(entries)
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Member classification speed")
+    parser.add_argument("--entries", type=int, default=200_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    names = make_namelist(args.entries)
+    assert tuple(classify_members(names))[:3] == classify_legacy(names)
+
+    legacy = min(
+        timeit.repeat(lambda: classify_legacy(names), number=1, repeat=args.repeat)
+    )
+    single = min(
+        timeit.repeat(lambda: classify_members(names), number=1, repeat=args.repeat)
+    )
+    print(f"entries      {len(names):>10}")
+    print(f"legacy       {legacy * 1000:10.1f} ms")
+    print(f"single-pass  {single * 1000:10.1f} ms")
+    print(f"speedup      {legacy / single:10.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+import argparse
+import os
+import pathlib
+import sys
+import time
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parents[1] / "needle"))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PySide6.QtWidgets import QApplication
+
+from functions.classify import Sources
+from functions.tabulate import LoadTable
+from functions.tabulation import new_record
+
+
+def make_records(count: int) -> list:
+    return [
+        new_record(
+            Sources([f"SOURCE-{n:06d}.zip"], [f"CHAPTER-{n:06d}.sgm"], []),
+            n,
+            f"DELIVERY-{n:06d}.zip",
+        )
+        for n in range(count)
+    ]
+
+
+def timed(label: str, table: LoadTable, action):
+    start = time.perf_counter()
+    changed = action()
+    elapsed = time.perf_counter() - start
+    print(
+        f"{label:<8} {changed:>8} rows  {elapsed * 1000:9.2f} ms"
+        f"  {table.model().rowCount():>8} visible"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Delete and restore checked rows")
+    parser.add_argument("--rows", type=int, default=20000)
+    parser.add_argument("--checked", type=int, default=10000)
+    args = parser.parse_args()
+
+    app = QApplication.instance() or QApplication([])
+    table = LoadTable()
+    model = table.source_model
+    model.append_rows(make_records(args.rows))
+    step = max(1, args.rows // args.checked)
+    for record in model.rows[::step][: args.checked]:
+        record.checked = True
+
+    timed("delete", table, lambda: model.set_hidden(True))
+    timed("restore", table, lambda: model.set_hidden(False))
+    app.processEvents()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+import argparse
+import pathlib
+import sys
+import tempfile
+import time
+import zipfile
+import zlib
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parents[1] / "needle"))
+
+from functions.manifest_cache import ManifestCache
+from functions.pdfinfo import PdfInspector, PdfJob
+
+
+def classic_pdf(pages: int, title: str, body: bytes) -> bytes:
+    kids = " ".join(f"{3 + n} 0 R" for n in range(pages))
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        f"<< /Type /Pages /Kids [{kids}] /Count {pages} >>".encode(),
+    ]
+    objects += [b"<< /Type /Page /Parent 2 0 R >>"] * pages
+    objects.append(f"<< /Title ({title}) /Producer (needle) >>".encode())
+    out = bytearray(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n" + body)
+    offsets = []
+    for number, text in enumerate(objects, 1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n%s\nendobj\n" % (number, text)
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    out += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    out += b"trailer\n<< /Size %d /Root 1 0 R /Info %d 0 R >>\n" % (
+        len(objects) + 1,
+        len(objects),
+    )
+    out += b"startxref\n%d\n%%%%EOF\n" % xref
+    return bytes(out)
+
+
+def compressed_pdf(pages: int, title: str, body: bytes) -> bytes:
+    # PDF 1.5 layout: catalog, page tree and info inside an object stream,
+    # located through a predicted cross-reference stream.
+    inner = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        f"<< /Type /Pages /Kids [] /Count {pages} >>".encode(),
+        b"<< /Title <FEFF" + title.encode("utf-16-be").hex().upper().encode() + b"> >>",
+    ]
+    header, data = [], b""
+    for number, text in enumerate(inner, 1):
+        header.append(b"%d %d" % (number, len(data)))
+        data += text + b"\n"
+    header = b" ".join(header) + b"\n"
+    packed = zlib.compress(header + data)
+    out = bytearray(b"%PDF-1.5\n" + body)
+    container = len(out)
+    out += b"4 0 obj\n<< /Type /ObjStm /N 3 /First %d" % len(header)
+    out += b" /Length %d /Filter /FlateDecode >>\nstream\n" % len(packed)
+    out += packed + b"\nendstream\nendobj\n"
+    xref = len(out)
+    rows = [
+        (0, 0, 255),
+        (2, 4, 0),
+        (2, 4, 1),
+        (2, 4, 2),
+        (1, container, 0),
+        (1, xref, 0),
+    ]
+    raw, previous = b"", bytes(6)
+    for kind, field, index in rows:
+        row = bytes([kind]) + field.to_bytes(4, "big") + bytes([index])
+        raw += b"\x02" + bytes((a - b) & 0xFF for a, b in zip(row, previous))
+        previous = row
+    packed = zlib.compress(raw)
+    out += (
+        b"5 0 obj\n<< /Type /XRef /Size 6 /W [1 4 1] /Root 1 0 R /Info 3 0 R"
+        b" /Filter /FlateDecode /DecodeParms << /Columns 6 /Predictor 12 >>"
+        b" /Length %d >>\nstream\n" % len(packed)
+    )
+    out += packed + b"\nendstream\nendobj\nstartxref\n%d\n%%%%EOF\n" % xref
+    return bytes(out)
+
+
+def make_corpus(folder: pathlib.Path, archives: int, pdfs: int, size: int) -> list:
+    body = b"% " + b"needle " * (size // 7) + b"\n"
+    jobs = []
+    for n in range(archives):
+        path = folder / f"DELIVERY-{n:05d}.zip"
+        names = []
+        # Half the archives deflate their PDFs, half store them.
+        compression = zipfile.ZIP_DEFLATED if n % 2 else zipfile.ZIP_STORED
+        with zipfile.ZipFile(path, "w", compression) as archive:
+            for m in range(pdfs):
+                make = compressed_pdf if m % 2 else classic_pdf
+                name = f"MANUAL-{n:05d}-{m:02d}.pdf"
+                archive.writestr(f"data/{name}", make(m + 1, f"Manual {n}", body))
+                names.append(name)
+        jobs.append(PdfJob(n + 1, path, tuple(names)))
+    return jobs
+
+
+def measure(label: str, inspector: PdfInspector, jobs: list):
+    start = time.perf_counter()
+    failed = 0
+    for result in inspector.run(jobs):
+        failed += sum(1 for info in result.infos if info.error)
+    elapsed = time.perf_counter() - start
+    stats = inspector.stats
+    print(
+        f"{label:<10} {stats.archives:>6} archives {stats.members:>6} PDFs"
+        f"  {elapsed:8.3f} s  {stats.archives_per_second:10.1f} archives/s"
+        f"  {stats.cached:>6} cached  {failed:>4} failed"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="PDF metadata throughput")
+    parser.add_argument("--archives", type=int, default=1000)
+    parser.add_argument("--pdfs", type=int, default=2)
+    parser.add_argument("--size", type=int, default=1024 * 1024)
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        jobs = make_corpus(pathlib.Path(tmp), args.archives, args.pdfs, args.size)
+        cache = ManifestCache(pathlib.Path(tmp) / "cache.sqlite3")
+        measure("serial", PdfInspector(max_workers=1), jobs)
+        measure("parallel", PdfInspector(max_workers=args.workers, cache=cache), jobs)
+        measure("cached", PdfInspector(max_workers=args.workers, cache=cache), jobs)
+
+
+if __name__ == "__main__":
+    main()
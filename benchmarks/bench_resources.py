@@ -0,0 +1,78 @@
+import argparse
+import pathlib
+import shutil
+import subprocess
+import sys
+import tempfile
+
+APP = pathlib.Path(__file__).resolve().parents[1] / "needle"
+
+# Run in a fresh interpreter so nothing is already imported or registered.
+MEASURE = """
+import resource, sys, time
+sys.path.insert(0, {folder!r})
+import PySide6.QtCore
+before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+started = time.perf_counter()
+import resources_rc
+elapsed = time.perf_counter() - started
+after = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+print(elapsed * 1000, (after - before) / 1024)
+"""
+
+
+def measure(folder: pathlib.Path) -> tuple:
+    result = subprocess.run(
+        [sys.executable, "-c", MEASURE.format(folder=folder.as_posix())],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    elapsed, rss = map(float, result.stdout.split())
+    return elapsed, rss
+
+
+def report(label: str, folder: pathlib.Path, runs: int):
+    # The first run also compiles the module, later ones load the cached pyc.
+    cold = measure(folder)
+    warm = min(measure(folder) for _ in range(runs))
+    print(
+        f"{label:<26} cold {cold[0]:8.1f} ms  warm {warm[0]:8.1f} ms"
+        f"  peak RSS +{warm[1]:6.1f} MiB"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Qt resource registration cost")
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # The Python module the ui files used to import, generated from the
+        # full Designer resource file.
+        legacy = pathlib.Path(tmp) / "legacy"
+        legacy.mkdir()
+        subprocess.run(
+            [
+                "pyside6-rcc",
+                "-g",
+                "python",
+                (APP / "images" / "resources.qrc").as_posix(),
+                "-o",
+                (legacy / "resources_rc.py").as_posix(),
+            ],
+            check=True,
+        )
+        # The bundle is located relative to the loader, copy both so the
+        # working tree is not polluted with a __pycache__.
+        bundle = pathlib.Path(tmp) / "bundle"
+        (bundle / "images").mkdir(parents=True)
+        shutil.copy(APP / "resources_rc.py", bundle)
+        shutil.copy(APP / "images" / "needle.rcc", bundle / "images")
+
+        report("resources_rc.py (legacy)", legacy, args.runs)
+        report("images/needle.rcc", bundle, args.runs)
+
+
+if __name__ == "__main__":
+    main()
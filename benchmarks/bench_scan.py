@@ -0,0 +1,50 @@
+import argparse
+import pathlib
+import sys
+import tempfile
+import time
+import zipfile
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parents[1] / "needle"))
+
+from functions.scanner import ArchiveScanner
+
+
+def make_corpus(folder: pathlib.Path, archives: int, members: int) -> list:
+    paths = []
+    for n in range(archives):
+        path = folder / f"DELIVERY-{n:05d}.zip"
+        with zipfile.ZipFile(path, "w", zipfile.ZIP_STORED) as archive:
+            for m in range(members):
+                suffix = (".sgm", ".xml", ".pdf", ".zip", ".txt")[m % 5]
+                archive.writestr(f"data/SRC-{n:05d}-{m:05d}{suffix}", b"")
+        paths.append(path)
+    return paths
+
+
+def measure(label: str, scan, paths: list) -> float:
+    start = time.perf_counter()
+    count = sum(1 for _ in scan(paths))
+    elapsed = time.perf_counter() - start
+    rate = count / elapsed
+    print(f"{label:<10} {count:>6} archives  {elapsed:8.3f} s  {rate:10.1f} archives/s")
+    return rate
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serial vs parallel manifest scan")
+    parser.add_argument("--archives", type=int, default=1000)
+    parser.add_argument("--members", type=int, default=200)
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = make_corpus(pathlib.Path(tmp), args.archives, args.members)
+        scanner = ArchiveScanner(max_workers=args.workers)
+        serial = measure("serial", scanner.scan_serial, paths)
+        parallel = measure("parallel", scanner.scan, paths)
+        print(f"speedup    {parallel / serial:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+import argparse
+import os
+import pathlib
+import sys
+import time
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parents[1] / "needle"))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PySide6.QtWidgets import QApplication
+
+from functions.classify import Sources
+from functions.tabulate import LoadTable
+from functions.tabulation import new_record
+
+QUERIES = ("delivery-04217", "chap", "manual 42", "multiple", "ok 9", "zzz")
+
+
+def make_records(count: int, start: int = 0) -> list:
+    return [
+        new_record(
+            Sources(
+                [f"SOURCE-{n:06d}.zip"],
+                [f"CHAPTER-{n:06d}.sgm"] + ([f"ALT-{n:06d}.sgm"] if n % 7 == 0 else []),
+                [f"MANUAL-{n:06d}.pdf"],
+            ),
+            n,
+            f"DELIVERY-{n:06d}.zip",
+        )
+        for n in range(start, start + count)
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Search box filtering")
+    parser.add_argument("--rows", type=int, default=100000)
+    parser.add_argument("--batch", type=int, default=512)
+    args = parser.parse_args()
+
+    app = QApplication.instance() or QApplication([])
+    table = LoadTable()
+    proxy = table.model()
+    start = time.perf_counter()
+    # Rows arrive in scan batches and are indexed as they come.
+    for first in range(0, args.rows, args.batch):
+        table.source_model.append_rows(
+            make_records(min(args.batch, args.rows - first), first)
+        )
+    print(f"insert+index {args.rows:>8} rows  {time.perf_counter() - start:8.3f} s")
+
+    for query in QUERIES:
+        times = []
+        # Typed a key at a time, then cleared.
+        for end in list(range(1, len(query) + 1)) + [0]:
+            begin = time.perf_counter()
+            proxy.set_query(query[:end])
+            times.append(time.perf_counter() - begin)
+            if end == len(query):
+                matched = proxy.rowCount()
+        print(
+            f"{query!r:<18} {matched:>8} rows  worst key {max(times) * 1000:7.2f} ms"
+            f"  mean {sum(times) / len(times) * 1000:7.2f} ms"
+        )
+    app.processEvents()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+import argparse
+import io
+import pathlib
+import sys
+import tempfile
+import time
+import zipfile
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parents[1] / "needle"))
+
+from functions.manifest_cache import ManifestCache
+from functions.segregation import SegregationJob, Segregator
+from functions.tabulation import NO_SOURCE
+
+
+def make_source(modules: int, s1000d: bool) -> bytes:
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as source:
+        for m in range(modules):
+            name = f"DMC-HON-A-{m:05d}.xml" if s1000d else f"CHAPTER-{m:05d}.sgm"
+            source.writestr(name, b"<dmodule/>" * 64)
+    return buffer.getvalue()
+
+
+def make_corpus(folder: pathlib.Path, archives: int, modules: int) -> list:
+    sources = (make_source(modules, True), make_source(modules, False))
+    jobs = []
+    for n in range(archives):
+        path = folder / f"DELIVERY-{n:05d}.zip"
+        name = f"SOURCE-{n:05d}.zip"
+        with zipfile.ZipFile(path, "w", zipfile.ZIP_STORED) as archive:
+            archive.writestr(f"data/{name}", sources[n % 2])
+            archive.writestr(f"data/MANUAL-{n:05d}.pdf", b"%PDF-1.4")
+        jobs.append(SegregationJob(n, path, path.stem, name, NO_SOURCE, NO_SOURCE))
+    return jobs
+
+
+def measure(label: str, segregator: Segregator, jobs: list):
+    start = time.perf_counter()
+    count = sum(1 for _ in segregator.run(jobs))
+    elapsed = time.perf_counter() - start
+    stats = segregator.stats
+    print(
+        f"{label:<10} {count:>6} archives  {elapsed:8.3f} s"
+        f"  {stats.archives_per_second:10.1f} archives/s  {stats.cached:>6} cached"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Segregation throughput")
+    parser.add_argument("--archives", type=int, default=2000)
+    parser.add_argument("--modules", type=int, default=200)
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        jobs = make_corpus(pathlib.Path(tmp), args.archives, args.modules)
+        cache = ManifestCache(pathlib.Path(tmp) / "cache.sqlite3")
+        measure("serial", Segregator(max_workers=1), jobs)
+        measure("parallel", Segregator(max_workers=args.workers, cache=cache), jobs)
+        measure("cached", Segregator(max_workers=args.workers, cache=cache), jobs)
+
+
+if __name__ == "__main__":
+    main()
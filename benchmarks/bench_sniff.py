@@ -0,0 +1,84 @@
+import argparse
+import pathlib
+import sys
+import tempfile
+import time
+import zipfile
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parents[1] / "needle"))
+
+from functions.sniff import sniff_stream
+
+HEADERS = (
+    b'<?xml version="1.0" encoding="UTF-8"?>\n'
+    b"<!DOCTYPE dmodule [\n"
+    + b'<!ENTITY ICN-HON-A-%05d SYSTEM "ICN-HON-A-%05d.cgm" NDATA cgm>\n' * 20
+    + b"]>\n"
+    b'<dmodule xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance"'
+    b' xsi:noNamespaceSchemaLocation="http://www.s1000d.org/S1000D_4-1/'
+    b'xml_schema_flat/descript.xsd">\n',
+    b'<!DOCTYPE CMM PUBLIC "-//ATA//DTD CMM//EN" "cmm.dtd">\n<CMM CHAPNBR="32">\n',
+)
+
+
+def make_archive(path: pathlib.Path, members: int, size: int) -> None:
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as archive:
+        for m in range(members):
+            head = HEADERS[m % 2]
+            if b"%05d" in head:
+                head = head.replace(b"%05d", b"%05d" % m)
+            body = b"<para>Remove the %05d bolts.</para>\n" % m
+            archive.writestr(
+                f"DATA/MODULE-{m:05d}.xml", head + body * (size // len(body))
+            )
+
+
+def sniff_all(path: pathlib.Path):
+    # ZipExtFile reads ahead, what it inflated beyond the header still counts.
+    read = inflated = compressed = 0
+    with zipfile.ZipFile(path) as archive:
+        for info in archive.infolist():
+            with archive.open(info) as stream:
+                header = sniff_stream(stream, info.filename)
+                read += header.bytes_read
+                inflated += header.bytes_read + len(stream._readbuffer)
+                inflated -= stream._offset
+                compressed += info.compress_size - stream._compress_left
+    return read, inflated, compressed
+
+
+def read_all(path: pathlib.Path):
+    total = compressed = 0
+    with zipfile.ZipFile(path) as archive:
+        for info in archive.infolist():
+            total += len(archive.read(info))
+            compressed += info.compress_size
+    return total, total, compressed
+
+
+def measure(label: str, function, path: pathlib.Path, members: int):
+    start = time.perf_counter()
+    read, inflated, compressed = function(path)
+    elapsed = time.perf_counter() - start
+    print(
+        f"{label:<8} {read / members:>12.0f} B read  {inflated / members:>12.0f} B"
+        f" inflated  {compressed / members:>10.0f} B compressed"
+        f"  {elapsed * 1000 / members:8.3f} ms/member"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Header sniffing versus full reads")
+    parser.add_argument("--members", type=int, default=200)
+    parser.add_argument("--size", type=int, default=2 * 1024 * 1024)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = pathlib.Path(tmp) / "DELIVERY.zip"
+        make_archive(path, args.members, args.size)
+        measure("sniff", sniff_all, path, args.members)
+        measure("full", read_all, path, args.members)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+import argparse
+import os
+import pathlib
+import sys
+import time
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parents[1] / "needle"))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PySide6.QtWidgets import QApplication
+
+from functions.classify import Fingerprint, Sources
+from functions.tabulate import LoadTable
+from functions.tabulation import new_record
+
+ORDERS = (
+    [("folder", False)],
+    [("folder", True)],
+    [("sgmls", True)],
+    [("size", True)],
+    [("status", False)],
+    [("status", False), ("sgmls", True), ("folder", False)],
+)
+
+
+def make_records(count: int) -> list:
+    records = []
+    for n in range(count):
+        # Unpadded, scattered numbers so the natural order differs from both
+        # the input order and a plain string sort.
+        folder = f"DELIVERY-{n * 7919 % count}"
+        sgmls = [f"CHAPTER-{n}.sgm"] + [f"ALT-{n}-{k}.sgm" for k in range(n % 3)]
+        fingerprints = tuple(
+            Fingerprint(name, name, n, (n * 131 + k) % 100000 + 1)
+            for k, name in enumerate(sgmls)
+        )
+        sources = Sources([], sgmls, [f"MANUAL-{n}.pdf"], (), fingerprints)
+        records.append(new_record(sources, n, folder + ".zip"))
+    return records
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Tabulation sorting")
+    parser.add_argument("--rows", type=int, default=100000)
+    args = parser.parse_args()
+
+    app = QApplication.instance() or QApplication([])
+    table = LoadTable()
+    proxy = table.model()
+    table.source_model.append_rows(make_records(args.rows))
+    for order in ORDERS:
+        times = []
+        # Sorted once to compute the keys and once more from the cache.
+        for _ in range(2):
+            proxy.sort_by("number")
+            # A shift+click per further key, the slowest click counts.
+            clicks = []
+            for position, (name, descending) in enumerate(order):
+                begin = time.perf_counter()
+                proxy.sort_by(name, descending, then=position > 0)
+                clicks.append(time.perf_counter() - begin)
+            times.append(max(clicks))
+        label = ", ".join(
+            f"{name}{' desc' if descending else ''}" for name, descending in order
+        )
+        first = proxy.index(0, 1).data()
+        print(
+            f"{label:<36} first {times[0] * 1000:8.2f} ms  cached"
+            f" {times[1] * 1000:8.2f} ms  top {first}"
+        )
+    app.processEvents()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+import argparse
+import os
+import pathlib
+import subprocess
+import sys
+
+APP = pathlib.Path(__file__).resolve().parents[1] / "needle"
+
+# Time to the first painted window on a warm disk cache, in milliseconds.
+BUDGET_MS = 1500
+# Nothing in this list may be imported before the user starts a scan.
+DEFERRED = ("pandas", "xlsxwriter", "pyarrow", "sqlite3", "multiprocessing")
+TARGETS = ("modules", "functions.tabulate")
+
+FIRST_WINDOW = """
+import runpy, sys, time
+started = time.perf_counter()
+sys.path.insert(0, ".")
+sys.argv = ["main.py"]
+from PySide6.QtCore import QTimer
+from PySide6.QtWidgets import QApplication
+
+def first_window():
+    elapsed = (time.perf_counter() - started) * 1000
+    print(f"FIRST_WINDOW {elapsed:.1f}")
+    print("LOADED " + " ".join(sorted(sys.modules)))
+    QApplication.instance().quit()
+
+def exec_():
+    QTimer.singleShot(0, first_window)
+    return QApplication.instance().exec()
+
+QApplication.exec = staticmethod(exec_)
+runpy.run_path("main.py", run_name="__main__")
+"""
+
+
+def run(code: str, *options) -> subprocess.CompletedProcess:
+    env = dict(
+        os.environ,
+        QT_QPA_PLATFORM=os.environ.get("QT_QPA_PLATFORM", "offscreen"),
+        NEEDLE_TRACE_STARTUP="1",
+    )
+    return subprocess.run(
+        [sys.executable, *options, "-c", code],
+        cwd=APP,
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+
+
+def import_times(target: str) -> list:
+    # -X importtime reports "self | cumulative | name" in microseconds on stderr.
+    result = run(f"import {target}", "-X", "importtime")
+    times = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:") :].split("|")
+        times.append((int(cumulative_us), int(self_us), name.strip()))
+    if result.returncode:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1])
+    return times
+
+
+def report_imports(target: str, top: int):
+    try:
+        times = import_times(target)
+    except RuntimeError as error:
+        print(f"{target:<22} skipped, {error}")
+        return
+    names = {name for *_, name in times}
+    total = max(cumulative for cumulative, *_ in times) / 1000
+    heavy = [name for name in DEFERRED if name in names]
+    print(f"{target:<22} {total:9.1f} ms  pulls in: {heavy or 'none'}")
+    for cumulative, self_us, name in sorted(times, reverse=True)[:top]:
+        print(f"    {cumulative / 1000:9.1f} ms  {self_us / 1000:8.1f} ms self  {name}")
+
+
+def report_first_window(budget_ms: float) -> bool:
+    result = run(FIRST_WINDOW)
+    lines = dict(
+        line.split(" ", 1)
+        for line in result.stdout.splitlines()
+        if line.startswith(("FIRST_WINDOW", "LOADED"))
+    )
+    if "FIRST_WINDOW" not in lines:
+        reason = (result.stderr.strip().splitlines() or ["no window shown"])[-1]
+        print(f"first window           skipped, {reason}")
+        return True
+
+    elapsed = float(lines["FIRST_WINDOW"])
+    loaded = set(lines.get("LOADED", "").split())
+    deferred = [name for name in DEFERRED if name in loaded]
+    within = elapsed <= budget_ms and not deferred
+    print(
+        f"first window           {elapsed:9.1f} ms  budget {budget_ms:.0f} ms"
+        f"  deferred modules loaded: {deferred or 'none'}"
+        f"  {'OK' if within else 'OVER BUDGET'}"
+    )
+    # Per page construction cost, as traced by the page registry.
+    for line in result.stderr.splitlines():
+        if line.startswith("needle: "):
+            print("    " + line[len("needle: ") :])
+    return within
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Application startup cost")
+    parser.add_argument("--budget-ms", type=float, default=BUDGET_MS)
+    parser.add_argument("--top", type=int, default=8)
+    args = parser.parse_args()
+
+    for target in TARGETS:
+        report_imports(target, args.top)
+    if not report_first_window(args.budget_ms):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+import argparse
+import importlib
+import os
+import pathlib
+import subprocess
+import sys
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+os.environ.setdefault("NEEDLE_CACHE", os.devnull)
+APP = pathlib.Path(__file__).resolve().parents[1] / "needle"
+sys.path.insert(0, str(APP))
+
+from PySide6.QtCore import QCoreApplication, QEvent, QThreadPool
+from PySide6.QtWidgets import QApplication, QVBoxLayout, QWidget
+
+app = QApplication([])
+# Registers the :/ icon bundle the stylesheets point at.
+importlib.import_module("resources_rc")
+
+from functions import theme
+from functions.classify import Sources
+from functions.tabulate import LoadTable, TableModel, topButton
+from functions.tabulation import new_record
+
+MODES = ("per widget", "application")
+
+
+def records(count: int) -> list:
+    return [
+        new_record(
+            Sources([f"SRC-{n}.zip"], [f"SRC-{n}.sgm", f"ALT-{n}.sgm"], []),
+            n,
+            pathlib.Path(f"DELIVERY-{n:05d}.zip"),
+        )
+        for n in range(count)
+    ]
+
+
+def style_per_widget(frame: TableModel, sheet: str):
+    # What the widgets used to do: every instance parses its own sheet.
+    frame.setStyleSheet(sheet)
+    for widget in frame.findChildren(QWidget):
+        if isinstance(widget, (topButton, LoadTable)):
+            widget.setStyleSheet(sheet)
+    frame.table.horizontalHeader().setStyleSheet(sheet)
+
+
+def build(container: QVBoxLayout, rows: list, sheet: str) -> tuple:
+    started = time.perf_counter()
+    frame = TableModel([], container)
+    QThreadPool.globalInstance().waitForDone()
+    if sheet:
+        style_per_widget(frame, sheet)
+    container.addWidget(frame)
+    frame.table.source_model.append_rows(rows)
+    app.processEvents()
+    # grab() polishes and paints everything that is visible.
+    frame.grab()
+    return frame, time.perf_counter() - started
+
+
+def measure(label: str, rows: list, reloads: int, per_widget: bool):
+    root = QWidget()
+    container = QVBoxLayout(root)
+    root.resize(1200, 800)
+    root.show()
+    sheet = theme.compile_components(theme.DEFAULT_THEME) if per_widget else ""
+    if per_widget:
+        # The theme used to live on the central widget, components inline.
+        root.setStyleSheet(theme.read_theme(theme.DEFAULT_THEME))
+    else:
+        theme.apply_theme(theme.DEFAULT_THEME)
+
+    timings = []
+    frame = None
+    for _ in range(reloads):
+        if frame is not None:
+            frame.setParent(None)
+            frame.deleteLater()
+            # Frames waiting for deletion would still be repolished.
+            QCoreApplication.sendPostedEvents(None, QEvent.DeferredDelete)
+        frame, elapsed = build(container, rows, sheet)
+        timings.append(elapsed)
+
+    started = time.perf_counter()
+    for name in (theme.next_theme(), theme.DEFAULT_THEME):
+        if per_widget:
+            root.setStyleSheet(theme.read_theme(name))
+        else:
+            theme.apply_theme(name)
+        app.processEvents()
+        root.grab()
+    switch = (time.perf_counter() - started) / 2
+
+    print(
+        f"{label:<12} {len(rows):>6} rows  first build {timings[0] * 1000:8.1f} ms"
+        f"  reload {min(timings[1:] or timings) * 1000:8.1f} ms"
+        f"  theme switch {switch * 1000:8.1f} ms"
+    )
+    root.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Stylesheet polish cost")
+    parser.add_argument("--rows", type=int, default=5_000)
+    parser.add_argument("--reloads", type=int, default=3)
+    parser.add_argument("--mode", choices=MODES)
+    args = parser.parse_args()
+
+    if args.mode:
+        measure(args.mode, records(args.rows), args.reloads, args.mode == "per widget")
+        return
+    # Each mode gets a fresh interpreter and QApplication, so neither pays
+    # for the other's leftover widgets or cached style data.
+    for mode in MODES:
+        subprocess.run([sys.executable, __file__, *sys.argv[1:], "--mode", mode])
+
+
+if __name__ == "__main__":
+    main()
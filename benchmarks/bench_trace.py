@@ -0,0 +1,47 @@
+import argparse
+import pathlib
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parents[1] / "needle"))
+
+from functions.trace import Tracer
+
+
+def measure(label: str, tracer: Tracer, count: int):
+    start = time.perf_counter()
+    for n in range(count):
+        with tracer.span("render_model", "table", rows=n):
+            pass
+    elapsed = time.perf_counter() - start
+    print(f"{label:<10} {count:>9} spans  {elapsed / count * 1e9:8.1f} ns/span")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Tracing overhead")
+    parser.add_argument("--spans", type=int, default=200000)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    for n in range(args.spans):
+        pass
+    loop = time.perf_counter() - start
+    print(
+        f"{'bare loop':<10} {args.spans:>9} spans  {loop / args.spans * 1e9:8.1f} ns/span"
+    )
+    measure("disabled", Tracer(), args.spans)
+    with tempfile.TemporaryDirectory() as tmp:
+        tracer = Tracer()
+        tracer.start()
+        measure("enabled", tracer, args.spans)
+        start = time.perf_counter()
+        path = tracer.write(pathlib.Path(tmp) / "trace.json")
+        print(
+            f"{'write':<10} {len(tracer.events):>9} spans  "
+            f"{time.perf_counter() - start:8.3f} s  {path.stat().st_size / 1024:.0f} KiB"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+import argparse
+import pathlib
+import sys
+import time
+
+from .functions.duplicates import DuplicateIndex
+from .functions.export import FORMATS, open_report
+from .functions.manifest_cache import ManifestCache
+from .functions.scanner import ArchiveScanner
+from .functions.trace import tracer
+from .functions.tabulation import (
+    DUPLICATES_COLUMN,
+    REPORT_COLUMNS,
+    collect_inputs,
+    duplicate_text,
+    new_record,
+    report_values,
+)
+
+STATUS_COLUMN = "STATUS"
+
+
+def tabulate(args) -> int:
+    out = pathlib.Path(args.out)
+    if out.suffix.lower() not in FORMATS:
+        print(f"needle: --out must end in one of {', '.join(FORMATS)}", file=sys.stderr)
+        return 2
+
+    if args.trace:
+        tracer.start(args.trace)
+    input_paths = collect_inputs(args.inputs, args.recursive)
+    if not input_paths:
+        print("needle: no archives matched", file=sys.stderr)
+        return 1
+
+    scanner = ArchiveScanner(
+        max_workers=args.workers,
+        cache=None if args.no_cache else ManifestCache(),
+        nested_depth=args.nested_depth,
+    )
+    duplicates = DuplicateIndex(confirm=args.confirm_duplicates)
+    failed = 0
+
+    def rows():
+        nonlocal failed
+        for result in scanner.scan(input_paths):
+            record = new_record(result.sources, result.row, result.path, result.error)
+            if result.error:
+                failed += 1
+                print(f"needle: {result.path}: {result.error}", file=sys.stderr)
+            # Rows are written in input order, so each names the earlier
+            # archives it duplicates.
+            duplicates.add(result.row, record.folder, result.sources, result.path)
+            record.duplicates = duplicates.matches(result.row)
+            yield report_values(record) + [
+                duplicate_text(record),
+                result.error or "OK",
+            ]
+
+    # Rows go to the report as archives finish scanning, neither the results
+    # nor the workbook are held in memory as a whole.
+    start = time.perf_counter()
+    columns = REPORT_COLUMNS + (DUPLICATES_COLUMN, STATUS_COLUMN)
+    with tracer.span("tabulate", "cli", archives=len(input_paths)):
+        with open_report(out, columns) as writer:
+            writer.write_rows(rows())
+    stats = writer.stats
+    print(
+        f"{stats.rows} archives tabulated, {failed} unreadable,"
+        f" {stats.rows / (time.perf_counter() - start):.1f} archives/s,"
+        f" {stats.bytes / 1024:.1f} KiB written"
+        f" ({stats.bytes_per_second / 1024:.1f} KiB/s) -> {out}"
+    )
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m needle")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    command = commands.add_parser(
+        "tabulate", help="list the ZIP, XML/SGML and PDF sources of archives"
+    )
+    command.add_argument("inputs", nargs="+", help="archives, folders or globs")
+    command.add_argument(
+        "--out", required=True, help="report file, .xlsx, .csv or .parquet"
+    )
+    command.add_argument(
+        "--recursive", action="store_true", help="search folders recursively"
+    )
+    command.add_argument("--workers", type=int, default=None)
+    command.add_argument(
+        "--nested-depth", type=int, default=0, help="levels of inner archives to open"
+    )
+    command.add_argument(
+        "--no-cache", action="store_true", help="ignore the manifest cache"
+    )
+    command.add_argument(
+        "--confirm-duplicates",
+        action="store_true",
+        help="hash members whose CRC and size match before reporting duplicates",
+    )
+    command.add_argument(
+        "--trace", metavar="PATH", help="write a Chrome/Perfetto trace of the run"
+    )
+    command.set_defaults(handler=tabulate)
+    return parser
+
+
+def main(argv=None) -> int:
+    args = build_parser().parse_args(argv)
+    return args.handler(args)
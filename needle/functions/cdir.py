@@ -0,0 +1,251 @@
+import io
+import mmap
+import struct
+import zipfile
+from typing import NamedTuple
+
+# Record layouts from the ZIP application note, matching zipfile's own.
+END_RECORD = struct.Struct("<4s4H2LH")
+END_RECORD_64_LOCATOR = struct.Struct("<4sLQL")
+END_RECORD_64 = struct.Struct("<4sQ2H2L4Q")
+CENTRAL_HEADER = struct.Struct("<4s4B4HL2L5H2L")
+LOCAL_HEADER = struct.Struct("<4s5H3L2H")
+
+END_SIGNATURE = b"PK\x05\x06"
+END_64_LOCATOR_SIGNATURE = b"PK\x06\x07"
+END_64_SIGNATURE = b"PK\x06\x06"
+CENTRAL_SIGNATURE = b"PK\x01\x02"
+LOCAL_SIGNATURE = b"PK\x03\x04"
+
+MAX_COMMENT = 0xFFFF
+ZIP64_LIMIT = 0xFFFFFFFF
+ZIP64_EXTRA = 0x0001
+UTF8_FLAG = 0x800
+# Forward seeks inside a compressed member are done by decompressing and
+# discarding data, cap the chunk so each nesting level holds at most this much.
+SEEK_CHUNK_BYTES = 1024 * 1024
+
+
+class CentralDirectoryError(Exception):
+    pass
+
+
+class Member(NamedTuple):
+    name: str
+    compress_size: int
+    file_size: int
+    crc: int
+
+
+def locate(view: memoryview) -> tuple:
+    size = len(view)
+    if size < END_RECORD.size:
+        raise CentralDirectoryError("too small for an end of central directory")
+
+    tail_start = max(0, size - END_RECORD.size - MAX_COMMENT)
+    position = bytes(view[tail_start:]).rfind(END_SIGNATURE)
+    if position < 0:
+        raise CentralDirectoryError("no end of central directory record")
+    position += tail_start
+
+    (_, disk, cd_disk, _, _, cd_size, _, comment) = END_RECORD.unpack_from(
+        view, position
+    )
+    if position + END_RECORD.size + comment != size or disk or cd_disk:
+        # Comments holding the signature, trailing junk and spanned archives
+        # are left to zipfile.
+        raise CentralDirectoryError("unusual end of central directory record")
+
+    end = position
+    locator = position - END_RECORD_64_LOCATOR.size
+    if locator >= 0 and view[locator : locator + 4] == END_64_LOCATOR_SIGNATURE:
+        end = locator - END_RECORD_64.size
+        if end < 0 or view[end : end + 4] != END_64_SIGNATURE:
+            raise CentralDirectoryError("missing zip64 end of central directory")
+        (*_, cd_size, _) = END_RECORD_64.unpack_from(view, end)
+
+    # Data prepended to the archive (self-extractors) shifts every offset,
+    # the directory always ends right before the end record.
+    start = end - cd_size
+    if start < 0:
+        raise CentralDirectoryError("central directory outside the file")
+    return start, end
+
+
+def parse(view: memoryview, names_only: bool) -> list:
+    start, end = locate(view)
+    members = []
+    append = members.append
+    unpack = CENTRAL_HEADER.unpack_from
+    header_size = CENTRAL_HEADER.size
+    offset = start
+    # The directory size is authoritative, entry counts overflow in archives
+    # written without zip64 records.
+    while offset < end:
+        if offset + header_size > end:
+            raise CentralDirectoryError("truncated central directory")
+        (
+            signature,
+            _,
+            _,
+            _,
+            _,
+            flags,
+            _,
+            _,
+            _,
+            crc,
+            compress_size,
+            file_size,
+            name_length,
+            extra_length,
+            comment_length,
+            *_,
+        ) = unpack(view, offset)
+        if signature != CENTRAL_SIGNATURE:
+            raise CentralDirectoryError("bad central directory header")
+
+        name_start = offset + header_size
+        raw = bytes(view[name_start : name_start + name_length])
+        name = raw.decode("utf-8" if flags & UTF8_FLAG else "cp437")
+        if "\x00" in name:
+            name = name[: name.find("\x00")]
+
+        if names_only:
+            append(name)
+        else:
+            if ZIP64_LIMIT in (compress_size, file_size):
+                extra_start = name_start + name_length
+                file_size, compress_size = zip64_sizes(
+                    view[extra_start : extra_start + extra_length],
+                    file_size,
+                    compress_size,
+                )
+            append(Member(name, compress_size, file_size, crc))
+        offset = name_start + name_length + extra_length + comment_length
+    return members
+
+
+def zip64_sizes(extra: memoryview, file_size: int, compress_size: int) -> tuple:
+    position = 0
+    while position + 4 <= len(extra):
+        kind, length = struct.unpack_from("<2H", extra, position)
+        if kind == ZIP64_EXTRA:
+            values = iter(struct.unpack_from(f"<{length // 8}Q", extra, position + 4))
+            # Only the fields saturated in the fixed header are present.
+            if file_size == ZIP64_LIMIT:
+                file_size = next(values)
+            if compress_size == ZIP64_LIMIT:
+                compress_size = next(values)
+            return file_size, compress_size
+        position += 4 + length
+    raise CentralDirectoryError("missing zip64 extra field")
+
+
+def read(input_path: str, names_only: bool = False) -> list:
+    with open(input_path, "rb") as archive:
+        # mmap keeps the directory out of the Python heap, only names and
+        # the few integers per member are materialised.
+        with mmap.mmap(archive.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            with memoryview(mapped) as view:
+                return parse(view, names_only)
+
+
+def read_stored(input_path: str, header_offset: int, size: int) -> list:
+    with open(input_path, "rb") as archive:
+        with mmap.mmap(archive.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            with memoryview(mapped) as view:
+                (signature, *_, name_length, extra_length) = LOCAL_HEADER.unpack_from(
+                    view, header_offset
+                )
+                if signature != LOCAL_SIGNATURE:
+                    raise CentralDirectoryError("bad local file header")
+                start = header_offset + LOCAL_HEADER.size + name_length + extra_length
+                with view[start : start + size] as member:
+                    return parse(member, names_only=True)
+
+
+class StoredMember(io.RawIOBase):
+    # A byte range of the archive file, seeks cost nothing and only what is
+    # read is ever loaded.
+    def __init__(self, archive, start: int, size: int) -> None:
+        super().__init__()
+        self.archive = archive
+        self.start = start
+        self.size = size
+        self.position = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self.position
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        base = (0, self.position, self.size)[whence]
+        self.position = max(0, base + offset)
+        return self.position
+
+    def readinto(self, buffer) -> int:
+        count = max(0, min(len(buffer), self.size - self.position))
+        self.archive.seek(self.start + self.position)
+        count = self.archive.readinto(memoryview(buffer)[:count])
+        self.position += count
+        return count
+
+    def close(self):
+        if not self.closed:
+            self.archive.close()
+        super().close()
+
+
+def open_stored(input_path: str, header_offset: int, size: int) -> io.BufferedReader:
+    archive = open(input_path, "rb")
+    try:
+        archive.seek(header_offset)
+        (signature, *_, name_length, extra_length) = LOCAL_HEADER.unpack(
+            archive.read(LOCAL_HEADER.size)
+        )
+        if signature != LOCAL_SIGNATURE:
+            raise CentralDirectoryError("bad local file header")
+    except BaseException:
+        archive.close()
+        raise
+    start = header_offset + LOCAL_HEADER.size + name_length + extra_length
+    return io.BufferedReader(StoredMember(archive, start, size))
+
+
+def list_inner_members(archive: zipfile.ZipFile, info: zipfile.ZipInfo) -> list:
+    # An inner archive stored without compression is a plain byte range of
+    # the outer file, its directory is parsed in place from the map.
+    if info.compress_type == zipfile.ZIP_STORED and archive.filename:
+        try:
+            return read_stored(archive.filename, info.header_offset, info.file_size)
+        except (CentralDirectoryError, struct.error, ValueError, StopIteration):
+            pass
+    with archive.open(info) as stream:
+        stream.MAX_SEEK_READ = SEEK_CHUNK_BYTES
+        with zipfile.ZipFile(stream) as inner:
+            return inner.namelist()
+
+
+def list_members(input_path: str) -> list:
+    try:
+        return read(input_path, names_only=True)
+    except (CentralDirectoryError, struct.error, ValueError, StopIteration):
+        with zipfile.ZipFile(input_path, "r") as archive:
+            return archive.namelist()
+
+
+def list_member_info(input_path: str) -> list:
+    try:
+        return read(input_path)
+    except (CentralDirectoryError, struct.error, ValueError, StopIteration):
+        with zipfile.ZipFile(input_path, "r") as archive:
+            return [
+                Member(info.filename, info.compress_size, info.file_size, info.CRC)
+                for info in archive.infolist()
+            ]
@@ -0,0 +1,96 @@
+from typing import Iterable, NamedTuple, Optional
+
+ZIP_SUFFIXES = (".zip",)
+SGML_SUFFIXES = (".xml", ".sgm", ".sgml")
+PDF_SUFFIXES = (".pdf", ".PDF")
+SOURCE_SUFFIXES = ZIP_SUFFIXES + SGML_SUFFIXES + PDF_SUFFIXES
+
+# Data and publication modules are S1000D content, not standalone sources.
+EXCLUDED_PREFIXES = ("PMC-", "DMC-")
+
+
+class InnerArchive(NamedTuple):
+    # Name is the chain of archive names from the top level, "a.zip/b.zip".
+    name: str
+    zips: list
+    sgmls: list
+    pdfs: list
+    error: Optional[str] = None
+
+
+class Fingerprint(NamedTuple):
+    # Name is the file name tabulation lists, member the full path inside
+    # the archive, crc and size come from the central directory.
+    name: str
+    member: str
+    crc: int
+    size: int
+
+    @property
+    def key(self) -> tuple:
+        return self.crc, self.size
+
+
+class Sources(NamedTuple):
+    zips: list
+    sgmls: list
+    pdfs: list
+    nested: tuple = ()
+    fingerprints: tuple = ()
+
+    @property
+    def counts(self) -> tuple:
+        return len(self.zips), len(self.sgmls), len(self.pdfs)
+
+    def inner(self, name: str) -> list:
+        return [
+            each
+            for each in self.nested
+            if each.name == name or each.name.startswith(name + "/")
+        ]
+
+    @classmethod
+    def from_json(cls, payload: list) -> "Sources":
+        zips, sgmls, pdfs, nested, fingerprints = payload
+        return cls(
+            zips,
+            sgmls,
+            pdfs,
+            tuple(InnerArchive(*each) for each in nested),
+            tuple(Fingerprint(*each) for each in fingerprints),
+        )
+
+
+def bucket_members(names: Iterable[str]) -> tuple:
+    # Names are bucketed by their final component, first occurrence wins, the
+    # same rules pathlib.Path(name).name/.suffix gave per member before. Each
+    # name maps to the position of that first member.
+    zips, sgmls, pdfs = {}, {}, {}
+    for position, entry in enumerate(names):
+        if entry[-1:] in ("/", "\\"):
+            entry = entry.rstrip("/\\")
+        # Most members of a large delivery are neither of the three kinds, the
+        # C-level suffix test lets them through without any slicing.
+        if not entry.endswith(SOURCE_SUFFIXES):
+            continue
+        name = entry[max(entry.rfind("/"), entry.rfind("\\")) + 1 :]
+        dot = name.rfind(".")
+        if dot <= 0:
+            continue
+        suffix = name[dot:]
+        if suffix == ".zip":
+            zips.setdefault(name, position)
+        elif suffix in SGML_SUFFIXES:
+            if not name.startswith(EXCLUDED_PREFIXES):
+                sgmls.setdefault(name, position)
+        elif suffix in PDF_SUFFIXES:
+            pdfs.setdefault(name, position)
+    return zips, sgmls, pdfs
+
+
+def classify_members(names: Iterable[str]) -> Sources:
+    zips, sgmls, pdfs = bucket_members(names)
+    return Sources(list(zips), list(sgmls), list(pdfs))
+
+
+EMPTY_SOURCES = Sources((), (), ())
@@ -0,0 +1,204 @@
+import bisect
+import hashlib
+import os
+import pathlib
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable, NamedTuple, Optional
+
+from .classify import Fingerprint, Sources
+
+HASH_CHUNK_BYTES = 1024 * 1024
+
+
+class Occurrence(NamedTuple):
+    row: int
+    folder: str
+    path: Optional[pathlib.Path]
+    fingerprint: Fingerprint
+
+
+def source_fingerprints(members: list, buckets: tuple) -> tuple:
+    # Buckets map each listed name to its first member, see bucket_members.
+    return tuple(
+        Fingerprint(name, members[position].name, members[position].crc, size)
+        for bucket in buckets
+        for name, position in bucket.items()
+        if (size := members[position].file_size)
+    )
+
+
+def hash_member(input_path, member: str) -> Optional[str]:
+    digest = hashlib.blake2b(digest_size=16)
+    try:
+        with zipfile.ZipFile(input_path, "r") as archive:
+            with archive.open(member) as stream:
+                while chunk := stream.read(HASH_CHUNK_BYTES):
+                    digest.update(chunk)
+    except (zipfile.BadZipFile, OSError, KeyError, RuntimeError, NotImplementedError):
+        return None
+    return digest.hexdigest()
+
+
+class DuplicateGroup:
+    # Every occurrence of one (crc, size). Records hold the group itself, so
+    # a row joining it costs the same however many rows already share it.
+    __slots__ = ("rows", "order", "digests", "partitions")
+
+    def __init__(self, digests: Optional[dict] = None):
+        # Row to its occurrences, usually one, and the rows in order.
+        self.rows = {}
+        self.order = []
+        # With confirmation, the rows sorted by full content hash.
+        self.digests = digests
+        self.partitions = {}
+
+    @property
+    def shared(self) -> bool:
+        return len(self.rows) > 1
+
+    def add(self, occurrence: Occurrence):
+        found = self.rows.get(occurrence.row)
+        if found is None:
+            self.rows[occurrence.row] = [occurrence]
+            bisect.insort(self.order, occurrence.row)
+        else:
+            found.append(occurrence)
+
+    def remove(self, row: int):
+        if self.rows.pop(row, None) is None:
+            return
+        for rows in (self.order, *self.partitions.values()):
+            position = bisect.bisect_left(rows, row)
+            if position < len(rows) and rows[position] == row:
+                del rows[position]
+
+    def place(self, row: int, digest: str):
+        rows = self.partitions.setdefault(digest, [])
+        position = bisect.bisect_left(rows, row)
+        if position == len(rows) or rows[position] != row:
+            rows.insert(position, row)
+
+    def peers(self, row: int) -> list:
+        # Rows holding the same content as row, in order and row included.
+        if self.digests is None:
+            return self.order
+        own = self.rows.get(row)
+        digest = own and self.digests.get(hash_key(own[0]))
+        return self.partitions.get(digest, []) if digest else []
+
+    def count(self, row: int, earlier: bool = False) -> int:
+        # Other rows holding the same content, or only those before row.
+        peers = self.peers(row)
+        position = bisect.bisect_left(peers, row)
+        if earlier:
+            return position
+        return len(peers) - (position < len(peers) and peers[position] == row)
+
+    def folders(self, row: int, limit: int, earlier: bool = False) -> list:
+        folders = []
+        for other in self.peers(row):
+            if len(folders) == limit or earlier and other >= row:
+                break
+            if other != row:
+                folders.append(self.rows[other][0].folder)
+        return folders
+
+
+def hash_key(occurrence: Occurrence) -> tuple:
+    return occurrence.path, occurrence.fingerprint.member
+
+
+class DuplicateIndex:
+    def __init__(self, confirm: bool = False, max_workers: Optional[int] = None):
+        self.confirm = confirm
+        self.max_workers = max_workers or min(32, (os.cpu_count() or 1) + 4)
+        # (crc, size) to its group, and each row's own fingerprints.
+        self.groups = {}
+        self.rows = {}
+        self.digests = {}
+
+    def add(self, row: int, folder: str, sources: Sources, path=None) -> set:
+        # Returns the keys this row made shared, only their first row has to
+        # be told. Rows already sharing a key hold its group and see the new
+        # occurrence through it.
+        if row in self.rows:
+            return set()
+        fingerprints = sources.fingerprints
+        self.rows[row] = fingerprints
+        shared = set()
+        for fingerprint in fingerprints:
+            group = self.groups.get(fingerprint.key)
+            if group is None:
+                group = self.groups[fingerprint.key] = DuplicateGroup(
+                    self.digests if self.confirm else None
+                )
+            was_shared = group.shared
+            group.add(Occurrence(row, folder, path, fingerprint))
+            if group.shared and not was_shared:
+                shared.add(fingerprint.key)
+        if self.confirm:
+            self.hash_row(row, fingerprints, shared)
+        return shared
+
+    def remove(self, row: int) -> set:
+        # Returns the keys no longer shared once the row is gone. One
+        # archive can hold the same content under several names, each key
+        # is dropped once.
+        shared = set()
+        for key in {fingerprint.key for fingerprint in self.rows.pop(row, ())}:
+            group = self.groups.get(key)
+            if group is None:
+                continue
+            was_shared = group.shared
+            group.remove(row)
+            if not group.rows:
+                del self.groups[key]
+            elif was_shared and not group.shared:
+                shared.add(key)
+        return shared
+
+    def rows_of(self, keys: Iterable) -> set:
+        return {
+            row for key in keys if key in self.groups for row in self.groups[key].rows
+        }
+
+    def hash_row(self, row: int, fingerprints: tuple, shared: set):
+        # Only shared content is hashed: this row's, and the first row of a
+        # key it just made shared.
+        occurrences = []
+        for key in {fingerprint.key for fingerprint in fingerprints}:
+            group = self.groups[key]
+            if not group.shared:
+                continue
+            rows = group.rows if key in shared else (row,)
+            occurrences += [
+                (group, each) for other in rows for each in group.rows[other]
+            ]
+        pending = [
+            each
+            for _, each in occurrences
+            if each.path is not None and hash_key(each) not in self.digests
+        ]
+        if pending:
+            with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+                digests = pool.map(
+                    lambda each: hash_member(each.path, each.fingerprint.member),
+                    pending,
+                )
+                for each, digest in zip(pending, digests):
+                    self.digests[hash_key(each)] = digest
+        for group, each in occurrences:
+            digest = self.digests.get(hash_key(each))
+            if digest is not None:
+                group.place(each.row, digest)
+
+    def matches(self, row: int) -> dict:
+        # Name to the shared group of its content, for names some other
+        # archive also holds.
+        found = {}
+        for fingerprint in self.rows.get(row, ()):
+            group = self.groups[fingerprint.key]
+            if group.shared and group.count(row):
+                found[fingerprint.name] = group
+        return found
@@ -0,0 +1,183 @@
+import csv
+import itertools
+import pathlib
+import re
+import time
+from abc import ABC, abstractmethod
+from typing import Iterable, NamedTuple
+
+from .tabulation import REPORT_COLUMNS
+
+SHEET_NAME = "REMARKS"
+TABLE_STYLE = "Table Style Medium 2"
+FORMATS = (".xlsx", ".csv", ".parquet")
+# Save dialog filters, the first is the default.
+FILE_FILTERS = "Excel (*.xlsx);;CSV (*.csv);;Parquet (*.parquet)"
+FILTER_SUFFIX = re.compile(r"\(\*(\.\w+)\)")
+# Rows are handed to the underlying writer in chunks of this size.
+CHUNK_ROWS = 10_000
+# xlsxwriter cannot build a styled table while streaming, smaller reports
+# are kept in memory so they still get one.
+TABLE_ROW_LIMIT = 20_000
+
+
+class ExportStats(NamedTuple):
+    path: pathlib.Path
+    rows: int
+    bytes: int
+    seconds: float
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows / self.seconds if self.seconds else 0.0
+
+    @property
+    def bytes_per_second(self) -> float:
+        return self.bytes / self.seconds if self.seconds else 0.0
+
+
+class ReportWriter(ABC):
+    def __init__(self, path: pathlib.Path, columns=REPORT_COLUMNS) -> None:
+        self.path = pathlib.Path(path)
+        self.columns = tuple(columns)
+        self.rows = 0
+        self.stats = None
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        self.open()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+        self.stats = ExportStats(
+            self.path,
+            self.rows,
+            self.path.stat().st_size if self.path.exists() else 0,
+            time.perf_counter() - self.started,
+        )
+
+    def write_rows(self, rows: Iterable):
+        rows = iter(rows)
+        while True:
+            chunk = list(itertools.islice(rows, CHUNK_ROWS))
+            if not chunk:
+                break
+            self.write_chunk(chunk)
+            self.rows += len(chunk)
+
+    @abstractmethod
+    def open(self):
+        pass
+
+    @abstractmethod
+    def write_chunk(self, chunk: list):
+        pass
+
+    @abstractmethod
+    def close(self):
+        pass
+
+
+class CsvReportWriter(ReportWriter):
+    def open(self):
+        self.file = open(self.path, "w", newline="", encoding="utf-8")
+        self.writer = csv.writer(self.file)
+        self.writer.writerow(self.columns)
+
+    def write_chunk(self, chunk: list):
+        self.writer.writerows(chunk)
+
+    def close(self):
+        self.file.close()
+
+
+class ExcelReportWriter(ReportWriter):
+    def __init__(
+        self, path: pathlib.Path, columns=REPORT_COLUMNS, constant_memory=True
+    ) -> None:
+        super().__init__(path, columns)
+        self.constant_memory = constant_memory
+
+    def open(self):
+        import xlsxwriter
+
+        self.workbook = xlsxwriter.Workbook(
+            self.path.as_posix(), {"constant_memory": self.constant_memory}
+        )
+        self.sheet = self.workbook.add_worksheet(SHEET_NAME)
+        self.sheet.set_column(0, len(self.columns) - 1, 30)
+        # Rows are flushed to disk as soon as the next one starts in constant
+        # memory mode, so the header goes first and is filtered at the end.
+        header = self.workbook.add_format({"bold": True})
+        self.sheet.write_row(0, 0, self.columns, header)
+        self.sheet.freeze_panes(1, 0)
+
+    def write_chunk(self, chunk: list):
+        for offset, row in enumerate(chunk, self.rows + 1):
+            self.sheet.write_row(offset, 0, row)
+
+    def close(self):
+        last_column = len(self.columns) - 1
+        if self.constant_memory or not self.rows:
+            self.sheet.autofilter(0, 0, self.rows, last_column)
+        else:
+            self.sheet.add_table(
+                0,
+                0,
+                self.rows,
+                last_column,
+                {
+                    "columns": [{"header": column} for column in self.columns],
+                    "style": TABLE_STYLE,
+                },
+            )
+        self.workbook.close()
+
+
+class ParquetReportWriter(ReportWriter):
+    def open(self):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        self.pa = pa
+        self.schema = pa.schema([(column, pa.string()) for column in self.columns])
+        self.writer = pq.ParquetWriter(self.path.as_posix(), self.schema)
+
+    def write_chunk(self, chunk: list):
+        # Each chunk becomes one row group, nothing else is kept in memory.
+        columns = [list(column) for column in zip(*chunk)]
+        self.writer.write_table(self.pa.Table.from_arrays(columns, schema=self.schema))
+
+    def close(self):
+        self.writer.close()
+
+
+def report_path(path, selected_filter: str = "") -> pathlib.Path:
+    # A name typed without a known extension gets the one of the filter the
+    # user picked, Excel when there is none.
+    path = pathlib.Path(path)
+    if path.suffix.lower() in FORMATS:
+        return path
+    match = FILTER_SUFFIX.search(selected_filter)
+    return path.with_name(path.name + (match.group(1) if match else FORMATS[0]))
+
+
+def open_report(path, columns=REPORT_COLUMNS, expected_rows=None) -> ReportWriter:
+    path = pathlib.Path(path)
+    suffix = path.suffix.lower()
+    if suffix == ".csv":
+        return CsvReportWriter(path, columns)
+    if suffix == ".xlsx":
+        constant_memory = expected_rows is None or expected_rows > TABLE_ROW_LIMIT
+        return ExcelReportWriter(path, columns, constant_memory)
+    if suffix == ".parquet":
+        return ParquetReportWriter(path, columns)
+    raise ValueError(f"unsupported report format '{path.suffix}'")
+
+
+def write_report(path, rows: Iterable, columns=REPORT_COLUMNS) -> ExportStats:
+    expected_rows = len(rows) if isinstance(rows, (list, tuple)) else None
+    with open_report(path, columns, expected_rows) as writer:
+        writer.write_rows(rows)
+    return writer.stats
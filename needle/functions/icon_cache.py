@@ -0,0 +1,53 @@
+from PySide6.QtCore import QSize, QTimer
+from PySide6.QtGui import QGuiApplication, QIcon
+
+ICON_PREFIX = ":/icons/icons/"
+# QPushButton's default icon size, what every button below is painted at.
+BUTTON_ICON_SIZE = QSize(16, 16)
+BUTTON_ICONS = (
+    "cil-arrow-circle-right.png",
+    "cil-browser.png",
+    "cil-external-link.png",
+    "cil-save.png",
+    "cil-reload.png",
+    "cil-x.png",
+    "cil-window-restore.png",
+    "cil-x-circle.png",
+    "cil-folder-open.png",
+)
+
+icons = {}
+
+
+def resource_path(name: str) -> str:
+    return name if name.startswith(":") else ICON_PREFIX + name
+
+
+def icon(name: str) -> QIcon:
+    # One QIcon per resource for the whole process. Its engine decodes the
+    # PNG once and the scaled pixmaps Qt caches for it are keyed by the
+    # icon, so every button showing it reuses them across table reloads.
+    path = resource_path(name)
+    found = icons.get(path)
+    if found is None:
+        found = icons[path] = QIcon(path)
+    return found
+
+
+def device_pixel_ratio() -> float:
+    screen = QGuiApplication.primaryScreen()
+    return screen.devicePixelRatio() if screen else 1.0
+
+
+def warm(names, size: QSize):
+    # The pixmaps are dropped, what matters is the copy each QIcon keeps
+    # for the size and ratio the buttons paint it at.
+    ratio = device_pixel_ratio()
+    for name in names:
+        icon(name).pixmap(size, ratio)
+
+
+def prewarm(names=BUTTON_ICONS, size: QSize = BUTTON_ICON_SIZE):
+    # Decoding and scaling happen once the event loop is idle, after the
+    # first window is up, instead of while the first table is built.
+    QTimer.singleShot(0, lambda: warm(names, size))
@@ -0,0 +1,219 @@
+import hashlib
+import json
+import os
+import pathlib
+import sqlite3
+import threading
+import time
+from typing import Optional
+
+from .classify import Sources
+
+
+class ManifestCache:
+    SCHEMA_VERSION = 4
+    DEFAULT_PATH = pathlib.Path.home() / ".needle" / "manifest_cache.sqlite3"
+    MAX_BYTES = 64 * 1024 * 1024
+    # Enough of the archive tail to cover the end-of-central-directory record
+    # and, for ordinary deliveries, the central directory itself.
+    HASH_TAIL_BYTES = 64 * 1024
+
+    def __init__(
+        self,
+        path: Optional[pathlib.Path] = None,
+        max_bytes: int = MAX_BYTES,
+        hash_contents: bool = False,
+    ) -> None:
+        self.path = pathlib.Path(
+            path or os.environ.get("NEEDLE_CACHE", self.DEFAULT_PATH)
+        )
+        self.max_bytes = max_bytes
+        self.hash_contents = hash_contents
+        self.enabled = True
+        self.local = threading.local()
+        self.lock = threading.Lock()
+        # Paths served from the cache and when, written on flush so a lookup
+        # never opens a write transaction.
+        self.used = {}
+
+    def connection(self) -> Optional[sqlite3.Connection]:
+        connection = getattr(self.local, "connection", None)
+        if connection is not None or not self.enabled:
+            return connection
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            connection = sqlite3.connect(self.path.as_posix(), timeout=5)
+            # Writes commit one by one. With a write-ahead log a commit does
+            # not sync the disk and readers never wait for a writer.
+            connection.execute("PRAGMA journal_mode = WAL")
+            connection.execute("PRAGMA synchronous = NORMAL")
+            if connection.execute("PRAGMA user_version").fetchone()[0] != (
+                self.SCHEMA_VERSION
+            ):
+                connection.execute("DROP TABLE IF EXISTS manifests")
+                connection.execute("DROP TABLE IF EXISTS details")
+                connection.execute(f"PRAGMA user_version = {self.SCHEMA_VERSION}")
+            connection.execute(
+                """CREATE TABLE IF NOT EXISTS manifests (
+                    path TEXT PRIMARY KEY,
+                    size INTEGER NOT NULL,
+                    mtime_ns INTEGER NOT NULL,
+                    digest TEXT,
+                    variant TEXT NOT NULL,
+                    payload TEXT NOT NULL,
+                    nbytes INTEGER NOT NULL,
+                    last_used REAL NOT NULL
+                )"""
+            )
+            connection.execute(
+                "CREATE INDEX IF NOT EXISTS manifests_lru ON manifests (last_used)"
+            )
+            # Results derived from an archive's contents, such as segregation
+            # verdicts, live and are evicted with its manifest.
+            connection.execute(
+                """CREATE TABLE IF NOT EXISTS details (
+                    path TEXT NOT NULL,
+                    kind TEXT NOT NULL,
+                    name TEXT NOT NULL,
+                    size INTEGER NOT NULL,
+                    mtime_ns INTEGER NOT NULL,
+                    digest TEXT,
+                    payload TEXT NOT NULL,
+                    PRIMARY KEY (path, kind, name)
+                )"""
+            )
+            connection.commit()
+        except (OSError, sqlite3.Error):
+            # A read-only or locked cache must never stop a scan.
+            self.enabled = False
+            return None
+        self.local.connection = connection
+        return connection
+
+    def key(self, input_path: pathlib.Path) -> Optional[tuple]:
+        try:
+            stat = input_path.stat()
+        except OSError:
+            return None
+        digest = self.digest(input_path, stat.st_size) if self.hash_contents else None
+        return str(input_path.resolve()), stat.st_size, stat.st_mtime_ns, digest
+
+    def digest(self, input_path: pathlib.Path, size: int) -> Optional[str]:
+        try:
+            with open(input_path, "rb") as archive:
+                archive.seek(max(0, size - self.HASH_TAIL_BYTES))
+                return hashlib.blake2b(archive.read(), digest_size=16).hexdigest()
+        except OSError:
+            return None
+
+    def get(self, input_path: pathlib.Path, variant: str = "") -> Optional[Sources]:
+        connection = self.connection()
+        key = self.key(pathlib.Path(input_path))
+        if connection is None or key is None:
+            return None
+        try:
+            found = connection.execute(
+                "SELECT size, mtime_ns, digest, variant, payload"
+                " FROM manifests WHERE path = ?",
+                (key[0],),
+            ).fetchone()
+        except sqlite3.Error:
+            return None
+        if found is None or tuple(found[:4]) != key[1:] + (variant,):
+            return None
+        self.used[key[0]] = time.time()
+        return Sources.from_json(json.loads(found[4]))
+
+    def put(self, input_path: pathlib.Path, sources: Sources, variant: str = ""):
+        connection = self.connection()
+        key = self.key(pathlib.Path(input_path))
+        if connection is None or key is None:
+            return
+        payload = json.dumps(sources, separators=(",", ":"))
+        self.write(
+            "INSERT OR REPLACE INTO manifests VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            key + (variant, payload, len(payload), time.time()),
+        )
+
+    def get_detail(self, input_path: pathlib.Path, kind: str, name: str = ""):
+        connection = self.connection()
+        key = self.key(pathlib.Path(input_path))
+        if connection is None or key is None:
+            return None
+        try:
+            found = connection.execute(
+                "SELECT size, mtime_ns, digest, payload FROM details"
+                " WHERE path = ? AND kind = ? AND name = ?",
+                (key[0], kind, name),
+            ).fetchone()
+        except sqlite3.Error:
+            return None
+        if found is None or tuple(found[:3]) != key[1:]:
+            return None
+        return json.loads(found[3])
+
+    def put_detail(self, input_path: pathlib.Path, kind: str, name: str, value):
+        connection = self.connection()
+        key = self.key(pathlib.Path(input_path))
+        if connection is None or key is None:
+            return
+        payload = json.dumps(value, separators=(",", ":"))
+        self.write(
+            "INSERT OR REPLACE INTO details VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (key[0], kind, name) + key[1:] + (payload,),
+        )
+
+    def write(self, statement: str, values: tuple):
+        # Each write commits at once. Scan threads have a connection each,
+        # a transaction left open would lock the others out for the run.
+        connection = self.connection()
+        try:
+            connection.execute(statement, values)
+            connection.commit()
+        except sqlite3.Error:
+            connection.rollback()
+
+    def flush(self):
+        connection = self.connection()
+        if connection is None:
+            return
+        with self.lock:
+            used, self.used = self.used, {}
+            try:
+                connection.executemany(
+                    "UPDATE manifests SET last_used = ? WHERE path = ?",
+                    [(when, path) for path, when in used.items()],
+                )
+                self.evict(connection)
+                connection.commit()
+            except sqlite3.Error:
+                connection.rollback()
+
+    def evict(self, connection: sqlite3.Connection):
+        total = connection.execute(
+            "SELECT COALESCE(SUM(nbytes), 0) FROM manifests"
+        ).fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        # Drop least recently used manifests until the cache is back under
+        # three quarters of its cap, so eviction does not run on every flush.
+        excess = total - self.max_bytes * 3 // 4
+        dropped = 0
+        rows = connection.execute(
+            "SELECT path, nbytes FROM manifests ORDER BY last_used"
+        ).fetchall()
+        stale = []
+        for path, nbytes in rows:
+            if dropped >= excess:
+                break
+            stale.append((path,))
+            dropped += nbytes
+        connection.executemany("DELETE FROM manifests WHERE path = ?", stale)
+        connection.executemany("DELETE FROM details WHERE path = ?", stale)
+
+    def clear(self):
+        connection = self.connection()
+        if connection is not None:
+            connection.execute("DELETE FROM manifests")
+            connection.execute("DELETE FROM details")
+            connection.commit()
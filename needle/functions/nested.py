@@ -0,0 +1,45 @@
+import zipfile
+
+from .cdir import SEEK_CHUNK_BYTES
+from .classify import InnerArchive, classify_members
+
+
+def error_text(error: Exception) -> str:
+    return str(error) or type(error).__name__
+
+
+def scan_nested(
+    archive: zipfile.ZipFile, depth: int, max_member_bytes: int, prefix: str = ""
+) -> list:
+    found = []
+    if depth <= 0:
+        return found
+
+    for info in archive.infolist():
+        if info.is_dir() or not info.filename.endswith(".zip"):
+            continue
+        name = prefix + info.filename.rstrip("/").rpartition("/")[2]
+        if info.file_size > max_member_bytes:
+            found.append(
+                InnerArchive(name, [], [], [], f"skipped, {info.file_size} bytes")
+            )
+            continue
+
+        try:
+            # The inner archive is read straight from the parent's decompressed
+            # stream, zipfile only seeks to the central directory and back.
+            with archive.open(info) as stream:
+                stream.MAX_SEEK_READ = SEEK_CHUNK_BYTES
+                with zipfile.ZipFile(stream) as child:
+                    sources = classify_members(child.namelist())
+                    found.append(
+                        InnerArchive(name, sources.zips, sources.sgmls, sources.pdfs)
+                    )
+                    found.extend(
+                        scan_nested(child, depth - 1, max_member_bytes, name + "/")
+                    )
+        except Exception as error:
+            # A corrupt inner archive fails in zlib, zipfile or anywhere in
+            # between, it is reported on its own and the parent row stays.
+            found.append(InnerArchive(name, [], [], [], error_text(error)))
+    return found
@@ -0,0 +1,54 @@
+import sys
+import time
+from typing import Callable, Optional
+
+from PySide6.QtCore import QTimer
+from PySide6.QtWidgets import QStackedWidget, QWidget
+
+from .trace import tracer
+
+
+class PageRegistry:
+    def __init__(self, stack: QStackedWidget) -> None:
+        self.stack = stack
+        self.builders = {}
+        self.timings = {}
+
+    def register(self, page: QWidget, builder: Optional[Callable] = None):
+        # Pages without a builder are complete as generated by setupUi.
+        self.builders[page] = builder
+
+    def record(self, name: str, seconds: float):
+        self.timings[name] = seconds
+
+    def ensure(self, page: QWidget):
+        builder = self.builders.get(page)
+        if builder is None:
+            return
+        self.builders[page] = None
+        started = time.perf_counter()
+        with tracer.span("build_page", "page", page=page.objectName()):
+            builder(page)
+        self.record(page.objectName(), time.perf_counter() - started)
+
+    def show(self, page: QWidget):
+        # A page's contents are built the first time it is navigated to.
+        self.ensure(page)
+        self.stack.setCurrentWidget(page)
+
+    def pending(self) -> list:
+        return [page for page, builder in self.builders.items() if builder]
+
+    def prebuild(self):
+        # Builds one remaining page per idle turn of the event loop, so input
+        # is never blocked for longer than the slowest single page.
+        pending = self.pending()
+        if pending:
+            self.ensure(pending[0])
+            QTimer.singleShot(0, self.prebuild)
+
+    def trace(self, started: Optional[float] = None, out=sys.stderr):
+        if started is not None:
+            self.record("first window", time.perf_counter() - started)
+        for name, seconds in self.timings.items():
+            print(f"needle: {name:<20} {seconds * 1000:8.1f} ms", file=out)
@@ -0,0 +1,516 @@
+import os
+import pathlib
+import re
+import struct
+import time
+import zipfile
+import zlib
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Iterator, NamedTuple, Optional
+
+from .cdir import SEEK_CHUNK_BYTES, CentralDirectoryError, open_stored
+
+# Metadata is cached per archive under this kind, changing what is read
+# below only needs a new kind.
+CACHE_KIND = "pdfinfo:1"
+
+# The header and linearization dictionary sit in the first kilobyte, the
+# trailer and startxref in the last few.
+HEAD_BYTES = 1024
+TAIL_BYTES = 8 * 1024
+OBJECT_BYTES = 4 * 1024
+MAX_OBJECT_BYTES = 256 * 1024
+MAX_STREAM_BYTES = 16 * 1024 * 1024
+MAX_XREF_SECTIONS = 32
+
+VERSION = re.compile(rb"%PDF-(\d+\.\d+)")
+REFERENCE = rb"\s+(\d+)\s+(\d+)\s+R"
+ROOT = re.compile(rb"/Root" + REFERENCE)
+INFO = re.compile(rb"/Info" + REFERENCE)
+PAGES = re.compile(rb"/Pages" + REFERENCE)
+ENCRYPT = re.compile(rb"/Encrypt[\s/<\d]")
+PREV = re.compile(rb"/Prev\s+(\d+)")
+XREF_STREAM = re.compile(rb"/XRefStm\s+(\d+)")
+COUNT = re.compile(rb"/Count\s+(\d+)")
+LENGTH = re.compile(rb"/Length\s+(\d+)(?:\s+(\d+)\s+R)?")
+STREAM = re.compile(rb">>\s*(stream)\r?\n")
+LINEARIZED = re.compile(rb"/Linearized\s")
+LINEARIZED_LENGTH = re.compile(rb"/L\s+(\d+)")
+LINEARIZED_PAGES = re.compile(rb"/N\s+(\d+)")
+CATALOG_VERSION = re.compile(rb"/Version\s*/(\d+\.\d+)")
+TITLE = re.compile(rb"/Title\s*([(<])")
+INTEGERS = re.compile(rb"\d+")
+OBJECT_HEADER = re.compile(rb"\s*(\d+)\s+(\d+)\s+obj")
+
+
+class PdfError(Exception):
+    pass
+
+
+class PdfInfo(NamedTuple):
+    name: str
+    pages: Optional[int] = None
+    version: Optional[str] = None
+    title: Optional[str] = None
+    encrypted: bool = False
+    linearized: bool = False
+    error: Optional[str] = None
+
+    @property
+    def summary(self) -> str:
+        if self.error:
+            return "unreadable"
+        flags = [f"{self.pages} pp" if self.pages is not None else "? pp"]
+        if self.encrypted:
+            flags.append("encrypted")
+        return ", ".join(flags)
+
+    @property
+    def description(self) -> str:
+        if self.error:
+            return f"{self.name}: {self.error}"
+        return "\n".join(
+            (
+                self.name,
+                f"Pages: {'unknown' if self.pages is None else self.pages}",
+                f"PDF version: {self.version or 'unknown'}",
+                f"Title: {self.title or '-'}",
+                f"Encrypted: {'yes' if self.encrypted else 'no'}",
+                f"Linearized: {'yes' if self.linearized else 'no'}",
+            )
+        )
+
+
+def read_at(stream, offset: int, size: int) -> bytes:
+    stream.seek(offset)
+    return stream.read(size)
+
+
+def read_object(stream, offset: int) -> bytes:
+    # Objects are read in growing windows up to their stream keyword or end,
+    # only the dictionary part is ever needed from here.
+    size = OBJECT_BYTES
+    while True:
+        data = read_at(stream, offset, size)
+        end = data.find(b"endobj")
+        found = STREAM.search(data, 0, None if end < 0 else end)
+        if found:
+            return data[: found.start(1)]
+        if end >= 0:
+            return data[:end]
+        if len(data) < size or size >= MAX_OBJECT_BYTES:
+            raise PdfError(f"unterminated object at {offset}")
+        size *= 4
+
+
+def read_stream(stream, offset: int, length_of) -> tuple:
+    head = read_object(stream, offset)
+    match = LENGTH.search(head)
+    if match is None:
+        raise PdfError(f"stream without length at {offset}")
+    length = (
+        int(match[1]) if match[2] is None else length_of(int(match[1]), int(match[2]))
+    )
+    if length > MAX_STREAM_BYTES:
+        raise PdfError(f"stream of {length} bytes at {offset}")
+    start = offset + len(head) + len(b"stream")
+    data = read_at(stream, start, length + 2)
+    # The keyword is followed by CRLF or LF before the data begins.
+    if data.startswith(b"\r\n"):
+        data = data[2:] + stream.read(2)
+    elif data.startswith(b"\n"):
+        data = data[1:] + stream.read(1)
+    return head, decode_stream(head, data[:length])
+
+
+def decode_stream(head: bytes, data: bytes) -> bytes:
+    filters = re.findall(rb"/(\w+Decode)", head)
+    if filters not in ([], [b"FlateDecode"]):
+        raise PdfError("unsupported stream filter")
+    if filters:
+        data = zlib.decompress(data)
+    predictor = re.search(rb"/Predictor\s+(\d+)", head)
+    if predictor and int(predictor[1]) >= 10:
+        columns = re.search(rb"/Columns\s+(\d+)", head)
+        data = unpredict(data, int(columns[1]) if columns else 1)
+    return data
+
+
+def unpredict(data: bytes, columns: int) -> bytes:
+    # PNG row filters, one filter byte ahead of each row, one byte per pixel.
+    rows = []
+    previous = bytearray(columns)
+    for start in range(0, len(data) - columns, columns + 1):
+        kind = data[start]
+        row = bytearray(data[start + 1 : start + 1 + columns])
+        for i in range(columns):
+            left = row[i - 1] if i else 0
+            up = previous[i]
+            if kind == 1:
+                row[i] = (row[i] + left) & 0xFF
+            elif kind == 2:
+                row[i] = (row[i] + up) & 0xFF
+            elif kind == 3:
+                row[i] = (row[i] + (left + up) // 2) & 0xFF
+            elif kind == 4:
+                corner = previous[i - 1] if i else 0
+                guess = left + up - corner
+                nearest = min(
+                    (abs(guess - left), 0, left),
+                    (abs(guess - up), 1, up),
+                    (abs(guess - corner), 2, corner),
+                )[2]
+                row[i] = (row[i] + nearest) & 0xFF
+            elif kind:
+                raise PdfError(f"unsupported predictor row {kind}")
+        rows.append(bytes(row))
+        previous = row
+    return b"".join(rows)
+
+
+def read_literal(data: bytes, start: int) -> bytes:
+    escapes = {ord("n"): 10, ord("r"): 13, ord("t"): 9, ord("b"): 8, ord("f"): 12}
+    out = bytearray()
+    depth = 1
+    position = start
+    while position < len(data):
+        char = data[position]
+        position += 1
+        if char == ord("\\"):
+            char = data[position] if position < len(data) else 0
+            position += 1
+            if char in escapes:
+                out.append(escapes[char])
+            elif ord("0") <= char <= ord("7"):
+                digits = data[position - 1 : position + 2]
+                octal = re.match(rb"[0-7]{1,3}", digits)[0]
+                out.append(int(octal, 8) & 0xFF)
+                position += len(octal) - 1
+            elif char not in (10, 13):
+                out.append(char)
+            continue
+        if char == ord("("):
+            depth += 1
+        elif char == ord(")"):
+            depth -= 1
+            if not depth:
+                break
+        out.append(char)
+    return bytes(out)
+
+
+def read_title(dictionary: bytes) -> Optional[str]:
+    match = TITLE.search(dictionary)
+    if match is None:
+        return None
+    if match[1] == b"(":
+        raw = read_literal(dictionary, match.end())
+    else:
+        end = dictionary.find(b">", match.end())
+        digits = re.sub(rb"\s", b"", dictionary[match.end() : end])
+        raw = bytes.fromhex((digits + b"0" * (len(digits) % 2)).decode("ascii"))
+    if raw.startswith(b"\xfe\xff"):
+        return raw[2:].decode("utf-16-be", errors="replace").strip() or None
+    return raw.decode("latin-1").strip() or None
+
+
+class XrefTable:
+    def __init__(self, stream) -> None:
+        self.stream = stream
+        # Object number to (1, offset) or (2, object stream, index).
+        self.entries = {}
+        self.trailer = b""
+        self.object_streams = {}
+
+    def load(self, offset: int):
+        seen = set()
+        while offset is not None and offset not in seen:
+            if len(seen) >= MAX_XREF_SECTIONS:
+                raise PdfError("too many cross-reference sections")
+            seen.add(offset)
+            # The newest section is read first, older ones never override it.
+            if read_at(self.stream, offset, 4) == b"xref":
+                trailer = self.load_table(offset)
+                hybrid = XREF_STREAM.search(trailer)
+                if hybrid:
+                    self.load_stream(int(hybrid[1]))
+            else:
+                trailer = self.load_stream(offset)
+            if not self.trailer:
+                self.trailer = trailer
+            prev = PREV.search(trailer)
+            offset = int(prev[1]) if prev else None
+
+    def load_table(self, offset: int) -> bytes:
+        stream = self.stream
+        stream.seek(offset + 4)
+        while True:
+            line = stream.readline(256).strip()
+            if not line:
+                continue
+            if line.startswith(b"trailer"):
+                rest = line[len(b"trailer") :] + stream.read(TAIL_BYTES)
+                end = rest.find(b"startxref")
+                return rest if end < 0 else rest[:end]
+            fields = line.split()
+            if len(fields) != 2 or not all(each.isdigit() for each in fields):
+                raise PdfError(f"bad cross-reference table at {offset}")
+            first, count = int(fields[0]), int(fields[1])
+            table = stream.read(20 * count)
+            for index in range(count):
+                entry = table[20 * index : 20 * index + 18]
+                if entry[17:18] == b"n":
+                    self.entries.setdefault(first + index, (1, int(entry[:10])))
+
+    def load_stream(self, offset: int) -> bytes:
+        head, data = read_stream(self.stream, offset, self.direct_length)
+        if b"/XRef" not in head:
+            raise PdfError(f"no cross-reference at {offset}")
+        widths = [
+            int(each)
+            for each in INTEGERS.findall(re.search(rb"/W\s*\[([^\]]*)\]", head)[1])
+        ]
+        index = re.search(rb"/Index\s*\[([^\]]*)\]", head)
+        size = re.search(rb"/Size\s+(\d+)", head)
+        ranges = (
+            [int(each) for each in INTEGERS.findall(index[1])]
+            if index
+            else [0, int(size[1])]
+        )
+        width = sum(widths)
+        position = 0
+        for first, count in zip(ranges[::2], ranges[1::2]):
+            for number in range(first, first + count):
+                entry = data[position : position + width]
+                position += width
+                if len(entry) < width:
+                    raise PdfError("truncated cross-reference stream")
+                fields = []
+                start = 0
+                for each in widths:
+                    fields.append(int.from_bytes(entry[start : start + each], "big"))
+                    start += each
+                # A missing type field means an ordinary in-use object.
+                kind = fields[0] if widths[0] else 1
+                if kind in (1, 2):
+                    self.entries.setdefault(number, (kind, *fields[1:]))
+        return head
+
+    def direct_length(self, number: int, generation: int) -> int:
+        text = self.resolve(number)
+        found = INTEGERS.search(text[text.find(b"obj") + 3 :])
+        if found is None:
+            raise PdfError(f"bad stream length object {number}")
+        return int(found[0])
+
+    def offset(self, number: int) -> int:
+        entry = self.entries.get(number)
+        if entry is None:
+            return -1
+        return entry[1] if entry[0] == 1 else self.entries.get(entry[1], (0, -1))[1]
+
+    def resolve(self, number: int) -> bytes:
+        entry = self.entries.get(number)
+        if entry is None:
+            raise PdfError(f"object {number} not found")
+        if entry[0] == 1:
+            text = read_object(self.stream, entry[1])
+            header = OBJECT_HEADER.match(text)
+            if header is None or int(header[1]) != number:
+                raise PdfError(f"object {number} not at offset {entry[1]}")
+            return text
+        return self.resolve_compressed(number, entry[1], entry[2])
+
+    def resolve_compressed(self, number: int, container: int, index: int) -> bytes:
+        if container not in self.object_streams:
+            location = self.entries.get(container)
+            if location is None or location[0] != 1:
+                raise PdfError(f"object stream {container} not found")
+            head, data = read_stream(self.stream, location[1], self.direct_length)
+            count = int(re.search(rb"/N\s+(\d+)", head)[1])
+            first = int(re.search(rb"/First\s+(\d+)", head)[1])
+            pairs = [int(each) for each in INTEGERS.findall(data[:first])]
+            self.object_streams[container] = (data, first, pairs[: 2 * count])
+        data, first, pairs = self.object_streams[container]
+        if pairs[2 * index : 2 * index + 1] != [number]:
+            raise PdfError(f"object {number} not in object stream {container}")
+        start = first + pairs[2 * index + 1]
+        end = first + pairs[2 * index + 3] if 2 * index + 3 < len(pairs) else len(data)
+        return data[start:end]
+
+
+def read_info(stream, size: int, name: str) -> PdfInfo:
+    head = read_at(stream, 0, HEAD_BYTES)
+    version = VERSION.search(head)
+    if version is None:
+        raise PdfError("no PDF header")
+    version = version[1].decode("ascii")
+
+    # A linearized file announces itself, and its page count, in the first
+    # object, but only while its length still matches the file.
+    pages = None
+    linearized = False
+    if LINEARIZED.search(head):
+        length = LINEARIZED_LENGTH.search(head)
+        linearized = length is not None and int(length[1]) == size
+        count = LINEARIZED_PAGES.search(head)
+        if linearized and count:
+            pages = int(count[1])
+
+    tail = read_at(stream, max(0, size - TAIL_BYTES), TAIL_BYTES)
+    marker = tail.rfind(b"startxref")
+    if marker < 0:
+        raise PdfError("no startxref")
+    start = INTEGERS.search(tail, marker + len(b"startxref"))
+    if start is None:
+        raise PdfError("bad startxref")
+    xref = XrefTable(stream)
+    xref.load(int(start[0]))
+
+    trailer = xref.trailer
+    encrypted = ENCRYPT.search(trailer) is not None
+    root = ROOT.search(trailer)
+    info = INFO.search(trailer)
+    if root is None:
+        raise PdfError("no document catalog")
+
+    # Decompressing members can only seek forward cheaply, objects are
+    # fetched in file order so each pass over the member is shared.
+    wanted = [int(root[1])] + ([int(info[1])] if info else [])
+    texts = {number: xref.resolve(number) for number in sorted(wanted, key=xref.offset)}
+    catalog = texts[int(root[1])]
+    override = CATALOG_VERSION.search(catalog)
+    if override and float(override[1]) > float(version):
+        version = override[1].decode("ascii")
+    if pages is None:
+        tree = PAGES.search(catalog)
+        count = COUNT.search(xref.resolve(int(tree[1]))) if tree else None
+        pages = int(count[1]) if count else None
+    # Strings of an encrypted file are ciphertext.
+    title = read_title(texts[int(info[1])]) if info and not encrypted else None
+    return PdfInfo(name, pages, version, title, encrypted, linearized)
+
+
+def open_member(archive: zipfile.ZipFile, info: zipfile.ZipInfo):
+    # Stored PDFs are read in place, deflated ones through zipfile, which
+    # decompresses forward seeks in bounded chunks.
+    if info.compress_type == zipfile.ZIP_STORED and archive.filename:
+        try:
+            return open_stored(archive.filename, info.header_offset, info.file_size)
+        except (CentralDirectoryError, struct.error, OSError):
+            pass
+    stream = archive.open(info)
+    stream.MAX_SEEK_READ = SEEK_CHUNK_BYTES
+    return stream
+
+
+def inspect_member(archive: zipfile.ZipFile, info: zipfile.ZipInfo) -> PdfInfo:
+    name = info.filename.rpartition("/")[2]
+    try:
+        with open_member(archive, info) as stream:
+            return read_info(stream, info.file_size, name)
+    except (
+        PdfError,
+        zipfile.BadZipFile,
+        zlib.error,
+        OSError,
+        RuntimeError,
+        NotImplementedError,
+    ) as error:
+        return PdfInfo(name, error=str(error))
+    except (ValueError, TypeError, IndexError):
+        # Dictionaries missing a required entry surface as failed lookups.
+        return PdfInfo(name, error="malformed PDF")
+
+
+def inspect_archive(input_path, names: list) -> list:
+    # Names are the file names tabulation lists, the first member carrying
+    # each one is the one shown.
+    members = {}
+    with zipfile.ZipFile(input_path, "r") as archive:
+        for info in archive.infolist():
+            base = info.filename.rpartition("/")[2]
+            if not info.is_dir() and base in names:
+                members.setdefault(base, info)
+        return [
+            inspect_member(archive, members[name])
+            if name in members
+            else PdfInfo(name, error="not found")
+            for name in names
+        ]
+
+
+class PdfJob(NamedTuple):
+    row: int
+    path: pathlib.Path
+    names: tuple
+
+    @property
+    def cache_name(self) -> str:
+        return "|".join(self.names)
+
+
+class PdfResult(NamedTuple):
+    job: PdfJob
+    infos: list
+    cached: bool = False
+
+
+class PdfStats(NamedTuple):
+    archives: int
+    members: int
+    cached: int
+    seconds: float
+
+    @property
+    def archives_per_second(self) -> float:
+        return self.archives / self.seconds if self.seconds else 0.0
+
+
+def inspect(job: PdfJob) -> list:
+    try:
+        return inspect_archive(job.path, job.names)
+    except (zipfile.BadZipFile, OSError) as error:
+        return [PdfInfo(name, error=str(error)) for name in job.names]
+
+
+class PdfInspector:
+    def __init__(self, max_workers: Optional[int] = None, cache=None) -> None:
+        self.max_workers = max_workers or min(32, (os.cpu_count() or 1) + 4)
+        self.cache = cache
+        self.stats = None
+
+    def lookup(self, job: PdfJob) -> Optional[list]:
+        if not self.cache:
+            return None
+        found = self.cache.get_detail(job.path, CACHE_KIND, job.cache_name)
+        return [PdfInfo(*each) for each in found] if found else None
+
+    def inspect(self, job: PdfJob) -> PdfResult:
+        # Cache lookups happen in the workers, as in Segregator.segregate.
+        infos = self.lookup(job)
+        if infos is not None:
+            return PdfResult(job, infos, True)
+        infos = inspect(job)
+        if self.cache:
+            self.cache.put_detail(job.path, CACHE_KIND, job.cache_name, infos)
+        return PdfResult(job, infos)
+
+    def run(self, jobs: list) -> Iterator[PdfResult]:
+        # Same shape as Segregator.run, results in completion order.
+        started = time.perf_counter()
+        done = members = cached = 0
+        pool = ThreadPoolExecutor(max_workers=self.max_workers)
+        try:
+            futures = [pool.submit(self.inspect, job) for job in jobs]
+            for future in as_completed(futures):
+                result = future.result()
+                done += 1
+                cached += result.cached
+                members += len(result.infos)
+                yield result
+        finally:
+            pool.shutdown(wait=False, cancel_futures=True)
+            if self.cache:
+                self.cache.flush()
+            self.stats = PdfStats(done, members, cached, time.perf_counter() - started)
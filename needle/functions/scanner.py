@@ -0,0 +1,174 @@
+import os
+import pathlib
+import threading
+import zipfile
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Iterator, NamedTuple, Optional
+
+from .cdir import list_member_info
+from .classify import EMPTY_SOURCES, Sources, bucket_members
+from .duplicates import source_fingerprints
+from .nested import error_text, scan_nested
+from .trace import tracer
+
+
+class ScanResult(NamedTuple):
+    row: int
+    path: pathlib.Path
+    sources: Sources
+    error: Optional[str] = None
+
+
+def scan_archive(
+    input_path: str, nested_depth: int = 0, nested_member_bytes: int = 0
+) -> Sources:
+    # CRC and size of the listed sources come with the same directory read,
+    # duplicates across archives are found without opening any member.
+    with tracer.span("scan_archive", "scan", path=input_path):
+        with tracer.span("list_members", "scan", path=input_path):
+            members = list_member_info(input_path)
+        with tracer.span("classify", "scan", members=len(members)):
+            buckets = bucket_members([member.name for member in members])
+            sources = Sources(
+                *(list(bucket) for bucket in buckets),
+                fingerprints=source_fingerprints(members, buckets),
+            )
+        if nested_depth > 0 and sources.zips:
+            with tracer.span("scan_nested", "scan", path=input_path):
+                with zipfile.ZipFile(input_path, "r") as archive:
+                    nested = scan_nested(archive, nested_depth, nested_member_bytes)
+            sources = sources._replace(nested=tuple(nested))
+        return sources
+
+
+class ProcessPool:
+    # multiprocessing is only paid for once an archive actually needs it,
+    # not at application start.
+    def __init__(self, max_workers: int) -> None:
+        self.max_workers = max_workers
+        self.pool = None
+        self.lock = threading.Lock()
+
+    def submit(self, *args) -> Future:
+        with self.lock:
+            if self.pool is None:
+                from concurrent.futures import ProcessPoolExecutor
+
+                self.pool = ProcessPoolExecutor(max_workers=self.max_workers)
+        return self.pool.submit(*args)
+
+    def shutdown(self):
+        with self.lock:
+            if self.pool is not None:
+                self.pool.shutdown(wait=False, cancel_futures=True)
+
+
+class ArchiveScanner:
+    # Archives above this size usually carry central directories big enough
+    # for parsing to hold the GIL noticeably, so they go to a process pool.
+    LARGE_ARCHIVE_BYTES = 256 * 1024 * 1024
+    # Inner archives above this size are reported but not opened.
+    NESTED_MEMBER_BYTES = 512 * 1024 * 1024
+    # Archives queued per worker ahead of the row being handed out.
+    QUEUED_PER_WORKER = 4
+
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        large_archive_bytes: Optional[int] = LARGE_ARCHIVE_BYTES,
+        cache=None,
+        nested_depth: int = 0,
+        nested_member_bytes: int = NESTED_MEMBER_BYTES,
+    ) -> None:
+        self.max_workers = max_workers or min(32, (os.cpu_count() or 1) + 4)
+        self.large_archive_bytes = large_archive_bytes
+        self.cache = cache
+        self.nested_depth = nested_depth
+        self.nested_member_bytes = nested_member_bytes
+        # Manifests scanned with different nesting options are cached apart.
+        self.variant = f"nested:{nested_depth}:{nested_member_bytes}"
+
+    def scan(self, input_paths: list, rows: list = None) -> Iterator[ScanResult]:
+        # Rows number the results, positions in input_paths unless given.
+        input_paths = [pathlib.Path(each) for each in input_paths]
+        if not input_paths:
+            return
+        if rows is None:
+            rows = range(len(input_paths))
+
+        threads = ThreadPoolExecutor(max_workers=self.max_workers)
+        processes = ProcessPool(min(self.max_workers, os.cpu_count() or 1))
+        try:
+            # Cache lookups and size checks happen in the workers as well, and
+            # only a window of archives is queued ahead of the row handed out.
+            # The first row waits for its own archive, not a pass over all.
+            ahead = self.max_workers * self.QUEUED_PER_WORKER
+            queued = deque()
+            for row, input_path in zip(rows, input_paths):
+                future = threads.submit(self.scan_path, input_path, processes)
+                queued.append((row, input_path, future))
+                # Results are handed out in input order as soon as the next
+                # row is ready, later archives keep scanning meanwhile.
+                while queued and (len(queued) > ahead or queued[0][2].done()):
+                    yield self.collect(*queued.popleft())
+            while queued:
+                yield self.collect(*queued.popleft())
+        finally:
+            threads.shutdown(wait=False, cancel_futures=True)
+            processes.shutdown()
+            if self.cache:
+                self.cache.flush()
+
+    def scan_path(self, input_path: pathlib.Path, processes: "ProcessPool") -> Sources:
+        cached = self.cache.get(input_path, self.variant) if self.cache else None
+        if cached is not None:
+            return cached
+        if self.is_large(input_path):
+            sources = self.submit(processes, input_path).result()
+        else:
+            sources = scan_archive(
+                input_path.as_posix(), self.nested_depth, self.nested_member_bytes
+            )
+        if self.cache:
+            self.cache.put(input_path, sources, self.variant)
+        return sources
+
+    def scan_serial(self, input_paths: list) -> Iterator[ScanResult]:
+        for row, input_path in enumerate(input_paths):
+            input_path = pathlib.Path(input_path)
+            try:
+                sources = scan_archive(
+                    input_path.as_posix(), self.nested_depth, self.nested_member_bytes
+                )
+            except Exception as error:
+                yield ScanResult(row, input_path, EMPTY_SOURCES, error_text(error))
+            else:
+                yield ScanResult(row, input_path, sources)
+
+    def submit(self, pool, input_path: pathlib.Path) -> Future:
+        return pool.submit(
+            scan_archive,
+            input_path.as_posix(),
+            self.nested_depth,
+            self.nested_member_bytes,
+        )
+
+    def is_large(self, input_path: pathlib.Path) -> bool:
+        if self.large_archive_bytes is None:
+            return False
+        try:
+            return input_path.stat().st_size >= self.large_archive_bytes
+        except OSError:
+            return False
+
+    @staticmethod
+    def collect(row: int, input_path: pathlib.Path, future: Future) -> ScanResult:
+        # Whatever one archive raises becomes its error row, the remaining
+        # archives keep coming.
+        try:
+            # Time spent here is the consumer waiting on the scan.
+            with tracer.span("collect", "scan", row=row):
+                return ScanResult(row, input_path, future.result())
+        except Exception as error:
+            return ScanResult(row, input_path, EMPTY_SOURCES, error_text(error))
@@ -0,0 +1,101 @@
+from typing import Iterable
+
+from .tabulation import Record
+
+
+def status_words(record: Record) -> list:
+    words = []
+    if record.error:
+        words.append("unreadable")
+    if not any(record.sources.counts):
+        words.append("nothing found")
+    elif not record.locked and any(
+        len(sources) > 1 and record.selected[column] is None
+        for column, sources in enumerate(record.sources[:3])
+    ):
+        words.append("multiple")
+    if record.duplicates:
+        words.append("duplicate")
+    if any(info.encrypted for info in record.pdf_info.values()):
+        words.append("encrypted")
+    return words or ["ok"]
+
+
+def record_text(record: Record) -> str:
+    sources = record.sources
+    return "\n".join(
+        [record.folder, *sources.zips, *sources.sgmls, *sources.pdfs]
+        + status_words(record)
+    ).lower()
+
+
+class SearchIndex:
+    def __init__(self) -> None:
+        # Lowercased text per record number, and the same texts lined up
+        # with the model rows, None for hidden rows.
+        self.cache = {}
+        self.texts = []
+        # The previous query and the rows it matched, a query typed on from
+        # it only has to look at those.
+        self.last = None
+
+    def text(self, record: Record) -> str:
+        text = self.cache.get(record.number)
+        if text is None:
+            text = self.cache[record.number] = record_text(record)
+        return text
+
+    def rebuild(self, records: list):
+        self.texts = [
+            None if record.hidden else self.text(record) for record in records
+        ]
+        self.last = None
+
+    def extend(self, records: Iterable):
+        self.texts.extend(
+            None if record.hidden else self.text(record) for record in records
+        )
+        self.last = None
+
+    def refresh(self, records: list, first: int, last: int):
+        for position in range(first, last + 1):
+            record = records[position]
+            self.cache.pop(record.number, None)
+            self.texts[position] = None if record.hidden else self.text(record)
+        self.last = None
+
+    def forget(self, records: Iterable):
+        for record in records:
+            self.cache.pop(record.number, None)
+
+    def search(self, query: str, first: int = 0) -> list:
+        # Positions of the visible rows, from first on, holding every word
+        # of the query. Each word narrows the previous word's matches.
+        query = query.lower()
+        tokens = query.split()
+        texts = self.texts
+        if first == 0 and self.last is not None and query.startswith(self.last[0]):
+            # Words before the last one of the previous query are unchanged.
+            previous, positions = self.last
+            done = len(previous.split())
+            if done and not previous[-1].isspace():
+                done -= 1
+            del tokens[:done]
+        elif not tokens:
+            positions = [
+                position
+                for position, text in enumerate(texts[first:], first)
+                if text is not None
+            ]
+        else:
+            token = tokens.pop(0)
+            positions = [
+                position
+                for position, text in enumerate(texts[first:], first)
+                if text is not None and token in text
+            ]
+        for token in tokens:
+            positions = [position for position in positions if token in texts[position]]
+        if first == 0:
+            self.last = (query, positions)
+        return positions
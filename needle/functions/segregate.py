@@ -0,0 +1,130 @@
+from PySide6.QtCore import *
+from PySide6.QtGui import *
+from PySide6.QtWidgets import *
+from collections import Counter
+from typing import Any
+from .segregation import CATEGORIES, SegregationStats, Segregator
+from .workers import SegregationWorker
+
+
+class SegregationModel(QAbstractTableModel):
+    HEADERS = ("FOLDER NAME", "CATEGORY", "SOURCE", "DETAIL")
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.results = []
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self.results)
+
+    def columnCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def headerData(
+        self, section: int, orientation: Qt.Orientation, role: int = Qt.DisplayRole
+    ):
+        if orientation == Qt.Horizontal and role == Qt.DisplayRole:
+            return self.HEADERS[section]
+        return None
+
+    def data(self, index: QModelIndex, role: int = Qt.DisplayRole) -> Any:
+        if not index.isValid() or role not in (Qt.DisplayRole, Qt.ToolTipRole):
+            return None
+        result = self.results[index.row()]
+        column = index.column()
+        if column == 0:
+            return result.job.folder
+        if column == 1:
+            return result.verdict.category
+        if column == 2:
+            return result.verdict.source
+        return result.verdict.error or result.verdict.detail
+
+    def clear(self):
+        self.beginResetModel()
+        self.results = []
+        self.endResetModel()
+
+    def append_results(self, results: list):
+        # Verdicts arrive in completion order, the table keeps that order so
+        # each batch is a single append.
+        if not results:
+            return
+        first = len(self.results)
+        self.beginInsertRows(QModelIndex(), first, first + len(results) - 1)
+        self.results.extend(results)
+        self.endInsertRows()
+
+
+class SegregationView(QFrame):
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.worker = None
+        self.counts = Counter()
+        self.initUi()
+
+    def initUi(self):
+        layoutV = QVBoxLayout(self)
+
+        self.summary = QLabel()
+        self.progress_bar = QProgressBar()
+        self.progress_bar.setFormat("%v / %m archives")
+        self.progress_bar.hide()
+        self.status = QLabel()
+
+        self.table = QTableView()
+        self.table.setModel(SegregationModel(self.table))
+        self.table.verticalHeader().hide()
+        self.table.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+        self.table.verticalHeader().setDefaultSectionSize(35)
+        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        self.table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+
+        layoutV.addWidget(self.summary)
+        layoutV.addWidget(self.progress_bar)
+        layoutV.addWidget(self.status)
+        layoutV.addWidget(self.table)
+
+    def start(self, jobs: list, segregator: Segregator):
+        if self.worker is not None:
+            self.worker.cancel()
+        self.table.model().clear()
+        self.counts.clear()
+        self.show_summary()
+        self.progress_bar.setRange(0, len(jobs))
+        self.progress_bar.setValue(0)
+        self.progress_bar.show()
+        self.status.setText("  Segregating...")
+
+        self.worker = SegregationWorker(jobs, segregator)
+        self.worker.signals.verdicts.connect(self.insert_results)
+        self.worker.signals.progress.connect(self.show_progress)
+        self.worker.signals.finished.connect(self.segregation_finished)
+        QThreadPool.globalInstance().start(self.worker)
+
+    def insert_results(self, results: list):
+        if self.sender() is not self.worker.signals:
+            return
+        self.table.model().append_results(results)
+        self.counts.update(result.verdict.category for result in results)
+        self.show_summary()
+
+    def show_progress(self, done: int, total: int):
+        # A cancelled run may still deliver its last batch, only the current
+        # worker is listened to.
+        if self.sender() is self.worker.signals:
+            self.progress_bar.setValue(done)
+
+    def show_summary(self):
+        counts = (f"{each}: {self.counts[each]}" for each in CATEGORIES)
+        self.summary.setText("  " + "    ".join(counts))
+
+    def segregation_finished(self, stats: SegregationStats):
+        if self.sender() is not self.worker.signals:
+            return
+        self.progress_bar.hide()
+        self.status.setText(
+            f"  Segregated {stats.archives} archives in {stats.seconds:.2f} s"
+            f" ({stats.archives_per_second:.0f} archives/s,"
+            f" {stats.cached} from cache)"
+        )
@@ -0,0 +1,171 @@
+import os
+import pathlib
+import time
+import zipfile
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Iterator, NamedTuple, Optional
+
+from .cdir import list_inner_members
+from .classify import EXCLUDED_PREFIXES, SGML_SUFFIXES
+from .nested import error_text
+from .sniff import sniff_member
+from .tabulation import NO_SOURCE
+
+S1000D = "S1000D"
+NON_S1000D = "NON-S1000D XML/SGML"
+ISPEC = "ISPEC 2200"
+PDF_ONLY = "PDF ONLY"
+UNREADABLE = "UNREADABLE"
+CATEGORIES = (S1000D, NON_S1000D, ISPEC, PDF_ONLY, UNREADABLE)
+
+# Verdicts are cached per archive under this kind, changing the rules below
+# only needs a new kind.
+CACHE_KIND = "segregation:3"
+
+
+class SegregationJob(NamedTuple):
+    row: int
+    path: pathlib.Path
+    folder: str
+    zip_source: str
+    sgml_source: str
+    pdf_source: str
+
+    @property
+    def cache_name(self) -> str:
+        return "|".join((self.zip_source, self.sgml_source, self.pdf_source))
+
+
+class Verdict(NamedTuple):
+    category: str
+    source: str
+    detail: str = ""
+    error: Optional[str] = None
+
+
+class SegregationResult(NamedTuple):
+    job: SegregationJob
+    verdict: Verdict
+    cached: bool = False
+
+
+class SegregationStats(NamedTuple):
+    archives: int
+    cached: int
+    seconds: float
+
+    @property
+    def archives_per_second(self) -> float:
+        return self.archives / self.seconds if self.seconds else 0.0
+
+
+def find_member(archive: zipfile.ZipFile, name: str) -> Optional[zipfile.ZipInfo]:
+    # Sources are listed by file name, the member may sit in any folder.
+    for info in archive.infolist():
+        if not info.is_dir() and info.filename.rpartition("/")[2] == name:
+            return info
+    return None
+
+
+def count_modules(names: list) -> tuple:
+    modules = markup = 0
+    for name in names:
+        base = name.rpartition("/")[2]
+        if not base.endswith(SGML_SUFFIXES):
+            continue
+        markup += 1
+        if base.startswith(EXCLUDED_PREFIXES):
+            modules += 1
+    return modules, markup
+
+
+def sniff_zip_source(input_path, name: str) -> Verdict:
+    with zipfile.ZipFile(input_path, "r") as archive:
+        info = find_member(archive, name)
+        if info is None:
+            return Verdict(UNREADABLE, name, error=f"{name} not found")
+        names = list_inner_members(archive, info)
+    # S1000D packages carry their content as data and publication modules.
+    modules, markup = count_modules(names)
+    if modules:
+        return Verdict(S1000D, name, f"{modules} data/publication modules")
+    return Verdict(NON_S1000D, name, f"{markup} XML/SGML files")
+
+
+def sniff_sgml_source(input_path, name: str) -> Verdict:
+    with zipfile.ZipFile(input_path, "r") as archive:
+        info = find_member(archive, name)
+        if info is None:
+            return Verdict(UNREADABLE, name, error=f"{name} not found")
+        header = sniff_member(archive, info)
+    if header.error and not header.bytes_read:
+        return Verdict(UNREADABLE, name, error=header.error)
+    detail = " ".join(filter(None, (header.root, header.public_id or header.schema)))
+    # Loose markup is S1000D or ISPEC 2200 when its header says so, any
+    # other XML/SGML is neither.
+    if header.kind == "S1000D":
+        return Verdict(S1000D, name, detail)
+    if header.kind == "ISPEC":
+        return Verdict(ISPEC, name, detail)
+    return Verdict(NON_S1000D, name, detail)
+
+
+def segregate(job: SegregationJob) -> Verdict:
+    # A damaged source, a corrupt inner deflate stream raising zlib.error
+    # among them, makes only this archive unreadable.
+    if job.zip_source != NO_SOURCE:
+        try:
+            return sniff_zip_source(job.path, job.zip_source)
+        except Exception as error:
+            return Verdict(UNREADABLE, job.zip_source, error=error_text(error))
+    if job.sgml_source != NO_SOURCE:
+        try:
+            return sniff_sgml_source(job.path, job.sgml_source)
+        except Exception as error:
+            return Verdict(UNREADABLE, job.sgml_source, error=error_text(error))
+    if job.pdf_source != NO_SOURCE:
+        return Verdict(PDF_ONLY, job.pdf_source)
+    return Verdict(UNREADABLE, NO_SOURCE, error="no source selected")
+
+
+class Segregator:
+    def __init__(self, max_workers: Optional[int] = None, cache=None) -> None:
+        self.max_workers = max_workers or min(32, (os.cpu_count() or 1) + 4)
+        self.cache = cache
+        self.stats = None
+
+    def lookup(self, job: SegregationJob) -> Optional[Verdict]:
+        if not self.cache:
+            return None
+        found = self.cache.get_detail(job.path, CACHE_KIND, job.cache_name)
+        return Verdict(*found) if found else None
+
+    def segregate(self, job: SegregationJob) -> SegregationResult:
+        # The cache is looked up in the worker too, nothing runs archive by
+        # archive before the pool starts.
+        verdict = self.lookup(job)
+        if verdict is not None:
+            return SegregationResult(job, verdict, True)
+        verdict = segregate(job)
+        # Unreadable archives are retried on the next run.
+        if self.cache and verdict.error is None:
+            self.cache.put_detail(job.path, CACHE_KIND, job.cache_name, verdict)
+        return SegregationResult(job, verdict)
+
+    def run(self, jobs: list) -> Iterator[SegregationResult]:
+        # Results come back in completion order, each carries its job.
+        started = time.perf_counter()
+        done = cached = 0
+        pool = ThreadPoolExecutor(max_workers=self.max_workers)
+        try:
+            futures = [pool.submit(self.segregate, job) for job in jobs]
+            for future in as_completed(futures):
+                result = future.result()
+                done += 1
+                cached += result.cached
+                yield result
+        finally:
+            pool.shutdown(wait=False, cancel_futures=True)
+            if self.cache:
+                self.cache.flush()
+            self.stats = SegregationStats(done, cached, time.perf_counter() - started)
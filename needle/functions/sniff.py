@@ -0,0 +1,203 @@
+import re
+import zipfile
+from typing import Iterable, NamedTuple, Optional
+
+from .classify import SGML_SUFFIXES
+from .nested import error_text
+
+# Members are decompressed in chunks of this size until the root start tag
+# has been seen, and never beyond the limit.
+HEAD_CHUNK = 4096
+HEAD_LIMIT = 64 * 1024
+
+S1000D_ROOTS = ("dmodule", "pm", "dml", "comrep", "ddn", "scormContentPackage")
+# ATA iSpec 2200 public identifiers and schemas, ATA as a word so DATA or
+# metadata.dtd do not count.
+ISPEC_MARKER = re.compile(r"\bATA\b|ISPEC|SPEC ?2200", re.IGNORECASE)
+
+XML_DECLARATION = re.compile(rb"""encoding\s*=\s*["']([A-Za-z0-9._-]+)["']""")
+DOCTYPE = re.compile(
+    r"""<!DOCTYPE\s+([^\s\[>]+)"""
+    r"""(?:\s+PUBLIC\s+(?:"([^"]*)"|'([^']*)'))?"""
+    r"""(?:\s+(?:SYSTEM\s+)?(?:"([^"]*)"|'([^']*)'))?""",
+    re.IGNORECASE,
+)
+ATTRIBUTE = re.compile(r"""([^\s=/>]+)\s*=\s*(?:"([^"]*)"|'([^']*)')""")
+
+
+class MarkupHeader(NamedTuple):
+    name: str
+    root: Optional[str] = None
+    doctype: Optional[str] = None
+    public_id: Optional[str] = None
+    system_id: Optional[str] = None
+    namespace: Optional[str] = None
+    schema: Optional[str] = None
+    encoding: Optional[str] = None
+    bytes_read: int = 0
+    error: Optional[str] = None
+
+    @property
+    def kind(self) -> Optional[str]:
+        identifiers = " ".join(
+            each or "" for each in (self.public_id, self.system_id, self.schema)
+        )
+        if self.root in S1000D_ROOTS or "s1000d" in identifiers.lower():
+            return "S1000D"
+        if ISPEC_MARKER.search(identifiers):
+            return "ISPEC"
+        return None
+
+
+class Incomplete(Exception):
+    pass
+
+
+def close(text: str, start: int, end: str) -> int:
+    found = text.find(end, start)
+    if found < 0:
+        raise Incomplete
+    return found + len(end)
+
+
+def doctype_end(text: str, start: int) -> int:
+    # The internal subset may hold any number of declarations and their own
+    # '>' characters, the DOCTYPE only ends after its closing bracket.
+    quote = None
+    for position in range(start, len(text)):
+        char = text[position]
+        if quote:
+            if char == quote:
+                quote = None
+        elif char in "\"'":
+            quote = char
+        elif char == "[":
+            return close(text, close(text, position, "]"), ">")
+        elif char == ">":
+            return position + 1
+    raise Incomplete
+
+
+def tag_end(text: str, start: int) -> int:
+    quote = None
+    for position in range(start, len(text)):
+        char = text[position]
+        if quote:
+            if char == quote:
+                quote = None
+        elif char in "\"'":
+            quote = char
+        elif char == ">":
+            return position + 1
+    raise Incomplete
+
+
+def parse_head(text: str, name: str) -> MarkupHeader:
+    # Walks the prolog: declarations, comments and processing instructions
+    # are skipped until the DOCTYPE and the root element start tag.
+    header = MarkupHeader(name)
+    position = 0
+    while True:
+        start = text.find("<", position)
+        if start < 0 or start + 1 >= len(text):
+            raise Incomplete
+        if text.startswith("<?", start):
+            position = close(text, start, "?>")
+        elif text.startswith("<!--", start):
+            position = close(text, start + 4, "-->")
+        elif text[start : start + 9].upper() == "<!DOCTYPE":
+            position = doctype_end(text, start + 9)
+            match = DOCTYPE.match(text, start, position)
+            if match:
+                header = header._replace(
+                    doctype=match[1],
+                    public_id=match[2] or match[3],
+                    system_id=match[4] or match[5],
+                )
+        elif text.startswith("<!", start):
+            position = close(text, start, ">")
+        else:
+            end = tag_end(text, start + 1)
+            tag = text[start + 1 : end - 1].rstrip("/")
+            root = tag.split(None, 1)[0] if tag.strip() else ""
+            attributes = {
+                match[1]: match[2] if match[2] is not None else match[3]
+                for match in ATTRIBUTE.finditer(tag[len(root) :])
+            }
+            prefix = root.partition(":")[0] if ":" in root else None
+            namespace = attributes.get(f"xmlns:{prefix}" if prefix else "xmlns")
+            schema = next(
+                (
+                    value
+                    for key, value in attributes.items()
+                    if key.endswith(("noNamespaceSchemaLocation", ":schemaLocation"))
+                ),
+                None,
+            )
+            return header._replace(
+                root=root.rpartition(":")[2], namespace=namespace, schema=schema
+            )
+
+
+def decode(head: bytes, encoding: Optional[str]) -> str:
+    if head.startswith((b"\xff\xfe", b"\xfe\xff")):
+        return head.decode("utf-16", errors="ignore")
+    # Markup delimiters are ASCII in every other encoding these files use,
+    # names and identifiers only need to survive the round trip.
+    return head.decode(encoding or "utf-8", errors="replace")
+
+
+def sniff_stream(stream, name: str, limit: int = HEAD_LIMIT) -> MarkupHeader:
+    head = b""
+    encoding = None
+    while len(head) < limit:
+        chunk = stream.read(min(HEAD_CHUNK, limit - len(head)))
+        if not chunk:
+            break
+        head += chunk
+        if encoding is None:
+            declared = XML_DECLARATION.search(head, 0, 200)
+            encoding = declared[1].decode("ascii") if declared else None
+        try:
+            header = parse_head(decode(head, encoding), name)
+        except (Incomplete, LookupError):
+            continue
+        return header._replace(encoding=encoding, bytes_read=len(head))
+    return MarkupHeader(
+        name,
+        encoding=encoding,
+        bytes_read=len(head),
+        error="no root element" if len(head) < limit else "header too long",
+    )
+
+
+def sniff_member(
+    archive: zipfile.ZipFile, info: zipfile.ZipInfo, limit: int = HEAD_LIMIT
+) -> MarkupHeader:
+    name = info.filename.rpartition("/")[2]
+    try:
+        # ZipExtFile decompresses on demand, only what has been read so far
+        # is ever inflated.
+        with archive.open(info) as stream:
+            return sniff_stream(stream, name, limit)
+    except Exception as error:
+        # Corrupt deflate data raises zlib.error, not a zipfile error.
+        return MarkupHeader(name, error=error_text(error))
+
+
+def sniff_archive(
+    input_path, names: Optional[Iterable[str]] = None, limit: int = HEAD_LIMIT
+) -> list:
+    # Names are the file names tabulation lists, every XML/SGML member is
+    # sniffed when none are given.
+    wanted = set(names) if names is not None else None
+    headers = []
+    with zipfile.ZipFile(input_path, "r") as archive:
+        for info in archive.infolist():
+            base = info.filename.rpartition("/")[2]
+            if info.is_dir() or not base.endswith(SGML_SUFFIXES):
+                continue
+            if wanted is not None and base not in wanted:
+                continue
+            headers.append(sniff_member(archive, info, limit))
+    return headers
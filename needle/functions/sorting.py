@@ -0,0 +1,120 @@
+import re
+
+from .search import status_words
+from .tabulation import Record
+
+DIGITS = re.compile(r"\d+")
+# Worst first, a row sorts by the most serious of its status words.
+STATUS_ORDER = (
+    "unreadable",
+    "nothing found",
+    "multiple",
+    "duplicate",
+    "encrypted",
+    "ok",
+)
+
+
+def natural_key(text: str) -> str:
+    # Digit runs are written as their length and value, so plain string
+    # comparison puts DELIVERY-9 before DELIVERY-10 and stays in C.
+    return DIGITS.sub(natural_number, text.lower())
+
+
+def natural_number(match: re.Match) -> str:
+    digits = match.group().lstrip("0") or "0"
+    return f"{len(digits):03d}{digits}"
+
+
+def total_size(record: Record) -> int:
+    # Uncompressed bytes of the listed sources, from the central directory.
+    return sum(fingerprint.size for fingerprint in record.sources.fingerprints)
+
+
+def status_rank(record: Record) -> int:
+    return min(STATUS_ORDER.index(word) for word in status_words(record))
+
+
+SORT_KEYS = {
+    "number": lambda record: record.number,
+    "folder": lambda record: natural_key(record.folder),
+    "zips": lambda record: len(record.sources.zips),
+    "sgmls": lambda record: len(record.sources.sgmls),
+    "pdfs": lambda record: len(record.sources.pdfs),
+    "size": total_size,
+    "status": status_rank,
+}
+# Keys that follow the row's state, duplicates found later, sources picked
+# or PDFs checked, rather than its scan alone.
+STATE_KEYS = frozenset({"status"})
+# What clicking each table header sorts by.
+COLUMN_KEYS = ("number", "folder", "zips", "sgmls", "pdfs")
+
+
+class SortIndex:
+    def __init__(self) -> None:
+        # Key name to record number to that record's key, computed once.
+        self.cache = {name: {} for name in SORT_KEYS}
+        # Key name to record number to the rank of its key among every
+        # cached one, rebuilt after rows come or go.
+        self.ranks = {}
+
+    def forget(self, records):
+        for record in records:
+            for cache in self.cache.values():
+                cache.pop(record.number, None)
+        self.ranks.clear()
+
+    def add(self, records):
+        # Scan keys are worked out as rows arrive, the first sort does not
+        # pay. State keys wait for the sort, a row's state is not final yet.
+        for name, function in SORT_KEYS.items():
+            if name in STATE_KEYS:
+                continue
+            cache = self.cache[name]
+            for record in records:
+                cache[record.number] = function(record)
+        self.ranks.clear()
+
+    def fill(self, name: str, records: list, numbers: list):
+        cache = self.cache[name]
+        missing = [number for number in numbers if number not in cache]
+        if missing:
+            function = SORT_KEYS[name]
+            by_number = {record.number: record for record in records}
+            for number in missing:
+                cache[number] = function(by_number[number])
+            self.ranks.pop(name, None)
+
+    def rank(self, name: str) -> dict:
+        ranks = self.ranks.get(name)
+        if ranks is None:
+            cache = self.cache[name]
+            values = {
+                value: rank for rank, value in enumerate(sorted(set(cache.values())))
+            }
+            ranks = self.ranks[name] = {
+                number: values[value] for number, value in cache.items()
+            }
+        return ranks
+
+    def order(self, records: list, positions: list, order: list) -> list:
+        # Order lists (name, descending) most significant first. Keys are
+        # compared as integer ranks, several keys fold into one integer so a
+        # single stable sort handles any mix of directions.
+        numbers = [records[position].number for position in positions]
+        base = len(records) + 1
+        combined = None
+        for name, descending in order:
+            self.fill(name, records, numbers)
+            ranks = self.rank(name)
+            sign = -1 if descending else 1
+            if combined is None:
+                combined = [sign * ranks[number] for number in numbers]
+            else:
+                combined = [
+                    each * base + sign * ranks[number]
+                    for each, number in zip(combined, numbers)
+                ]
+        ranked = sorted(range(len(positions)), key=combined.__getitem__)
+        return [positions[each] for each in ranked]
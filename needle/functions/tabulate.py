@@ -1,11 +1,45 @@
 from PySide6.QtGui import *
 from PySide6.QtCore import *
 from PySide6.QtWidgets import *
+import bisect
 import pathlib
-import zipfile
+from operator import attrgetter
 from typing import Any
-import pandas as pd
-from io import BytesIO
+from . import icon_cache
+from .classify import Sources
+from .duplicates import DuplicateIndex
+from .export import FILE_FILTERS, ExportStats, report_path
+from .scanner import ArchiveScanner
+from .search import SearchIndex
+from .segregation import SegregationJob, Segregator
+from .sorting import COLUMN_KEYS, SortIndex
+from .trace import tracer
+from .tabulation import (
+    DUPLICATES_COLUMN,
+    DUPLICATES_SHOWN,
+    REPORT_COLUMNS,
+    Record,
+    duplicate_text,
+    more_text,
+    new_record,
+    record_values,
+    source_text,
+)
+from .watch import FolderWatcher
+from .workers import ExportWorker, PdfInfoWorker, ScanWorker
+from .manifest_cache import ManifestCache
+from .pdfinfo import PdfInspector, PdfJob
+
+manifest_cache = ManifestCache()
+
+
+class TableSignals(QObject):
+    # Carries the saved rows to the Segregation page, which is not part of
+    # the table and may not be built yet.
+    segregation_requested = Signal(list, object)
+
+
+table_signals = TableSignals()
 
 
 class ProxyModel(QAbstractProxyModel):
@@ -60,138 +94,611 @@ class ProxyModel(QAbstractProxyModel):
         return self.sourceModel().removeRows(row, count - 1)
 
 
-class CellModel:
-    raw_table_data = []
+def nested_summary(sources: Sources, name: str, limit: int = 8) -> str:
+    lines = []
+    for inner in sources.inner(name):
+        if inner.error:
+            lines.append(f"{inner.name}: {inner.error}")
+            continue
+        lines.append(inner.name)
+        for label, members in (("XML/SGML", inner.sgmls), ("PDF", inner.pdfs)):
+            if members:
+                more = (
+                    f" (+{len(members) - limit} more)" if len(members) > limit else ""
+                )
+                lines.append(f"    {label}: " + ", ".join(members[:limit]) + more)
+    return "\n".join(lines) or name
 
-    def __init__(self, table: QTableWidget) -> None:
-        self.table = table
 
-    def render_model(self, input_paths: list):
-        self.input_paths = input_paths
-        for row, input_path in enumerate(self.input_paths):
-            with zipfile.ZipFile(input_path.as_posix(), "r") as archive:
-                self.generate_row(archive.namelist(), row, input_path)
-        self.table.removeRow(self.table.rowCount() - 1)
-
-    def generate_row(self, source_list: list, row: int, input_path: pathlib.Path):
-        self.table.insertRow(row)
-        label0 = QLabel(text=pathlib.Path(input_path).name.replace(".zip", ""))
-        checkbox = QCheckBox(text=" " + str(row + 1) + ".")
-        label0.setAlignment(Qt.AlignCenter)
-        self.table.setRowHeight(row, 45)
-        self.table.setCellWidget(row, 0, checkbox)
-        self.table.setCellWidget(row, 1, label0)
-
-        zip_sfxs = {
-            pathlib.Path(each).name: pathlib.Path(each).suffix
-            for each in source_list
-            if pathlib.Path(each).suffix == ".zip"
-        }
+def duplicate_tooltip(record: Record, name: str) -> str:
+    row = record.number - 1
+    group = record.duplicates[name]
+    folders = group.folders(row, DUPLICATES_SHOWN)
+    return "Same content also in: " + more_text(folders, group.count(row))
+
+
+class CellModel:
+    # How many levels of archives inside ZIP sources are opened to show
+    # their XML/SGML and PDF contents, 0 lists ZIP sources by name only.
+    # Opening one decompresses the whole inner archive, so it is opt-in.
+    NESTED_DEPTH = 0
 
-        sgml_sfxs = {
-            pathlib.Path(each).name: pathlib.Path(each).suffix
-            for each in source_list
-            if (
-                (pathlib.Path(each).suffix == ".xml")
-                or (pathlib.Path(each).suffix == ".sgm")
-                or (pathlib.Path(each).suffix == ".sgml")
+    @classmethod
+    def scanner(cls, nested_depth: int = NESTED_DEPTH) -> ArchiveScanner:
+        return ArchiveScanner(cache=manifest_cache, nested_depth=nested_depth)
+
+    def __init__(self, table: QTableView) -> None:
+        self.table = table
+        self.model = table.source_model
+
+    def render_model(self, results: list):
+        with tracer.span("render_model", "table", rows=len(results)):
+            self.model.append_rows(
+                [
+                    self.build_row(
+                        result.sources, result.row, result.path, result.error
+                    )
+                    for result in results
+                ]
             )
-            and not (
-                pathlib.Path(each).name.startswith("PMC-")
-                or pathlib.Path(each).name.startswith("DMC-")
+
+    def update_model(self, results: list):
+        with tracer.span("update_model", "table", rows=len(results)):
+            self.model.upsert_rows(
+                [
+                    self.build_row(
+                        result.sources, result.row, result.path, result.error
+                    )
+                    for result in results
+                ]
             )
-        }
 
-        pdf_sfxs = {
-            pathlib.Path(each).name: pathlib.Path(each).suffix
-            for each in source_list
-            if (pathlib.Path(each).suffix == ".pdf")
-            or (pathlib.Path(each).suffix == ".PDF")
-        }
+    def build_row(
+        self, sources: Sources, row: int, input_path: pathlib.Path, error=None
+    ):
+        return new_record(sources, row, input_path, error)
 
-        source_lens = (
-            len(list(zip_sfxs.keys())),
-            len(list(sgml_sfxs.keys())),
-            len(list(pdf_sfxs.keys())),
-        )
 
-        if any(source_lens):
-            # ZIP sources
-            if source_lens[0] > 1:
-                self.widget_multiple_source(row, 2, zip_sfxs)
+class TabulationModel(QAbstractTableModel):
+    SourceStateRole = Qt.UserRole + 1
+    DuplicateRole = Qt.UserRole + 2
 
-            elif source_lens[0] == 1:
-                self.widget_single_source(row, 2, zip_sfxs)
+    # SOURCE CELL STATES
+    EMPTY = 0
+    SINGLE = 1
+    MULTIPLE = 2
+    NO_SOURCE = 3
+    NOTHING_FOUND = 4
 
-            else:
-                self.widget_no_source("No archive found", row, 2)
+    HEADERS = ("  Select  ", "FOLDER NAME", "ZIP SOURCE", "XML/SGML", "PDF SOURCE")
+    NO_SOURCE_SIGNALS = ("No archive found", "No XML/SGML found", "No PDF found")
+    MULTIPLE_PLACEHOLDER = "    -- Multiple Source Found --"
+    NOTHING_FOUND_TEXT = "    -- No Source Found --"
+    UNREADABLE_TEXT = "    -- Unreadable Archive --"
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.rows = []
+        # The rows' numbers in row order, kept in step with rows so a
+        # number is found by bisection instead of a pass over every row.
+        self.numbers = []
+        self.duplicates = DuplicateIndex()
 
-            # SGML sources
-            if source_lens[1] > 1:
-                self.widget_multiple_source(row, 3, sgml_sfxs)
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self.rows)
 
-            elif source_lens[1] == 1:
-                self.widget_single_source(row, 3, sgml_sfxs)
+    def columnCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self.HEADERS)
 
-            else:
-                self.widget_no_source("No XML/SGML found", row, 3)
+    def headerData(
+        self, section: int, orientation: Qt.Orientation, role: int = Qt.DisplayRole
+    ):
+        if orientation == Qt.Horizontal and role == Qt.DisplayRole:
+            return self.HEADERS[section]
+        return None
+
+    def flags(self, index: QModelIndex) -> Qt.ItemFlag:
+        if not index.isValid():
+            return Qt.NoItemFlags
+        if index.column() == 0:
+            return Qt.ItemIsEnabled | Qt.ItemIsUserCheckable
+        if self.source_state(index) == self.MULTIPLE:
+            return Qt.ItemIsEnabled | Qt.ItemIsEditable
+        return Qt.ItemIsEnabled
 
-            # PDF sources
-            if source_lens[2] > 1:
-                self.widget_multiple_source(row, 4, pdf_sfxs)
+    def data(self, index: QModelIndex, role: int = Qt.DisplayRole) -> Any:
+        if not index.isValid():
+            return None
+        record = self.rows[index.row()]
+        column = index.column()
+
+        if column == 0:
+            if role == Qt.DisplayRole:
+                return " " + str(record.number) + "."
+            if role == Qt.CheckStateRole:
+                return Qt.Checked if record.checked else Qt.Unchecked
+            return None
 
-            elif source_lens[2] == 1:
-                self.widget_single_source(row, 4, pdf_sfxs)
+        if role == Qt.TextAlignmentRole:
+            return Qt.AlignCenter
+        if column == 1:
+            if role == Qt.ToolTipRole and record.error:
+                return record.folder + "\n" + record.error
+            if role in (Qt.DisplayRole, Qt.ToolTipRole):
+                return record.folder
+            return None
 
-            else:
-                self.widget_no_source("No PDF found", row, 4)
+        state = self.source_state(index)
+        if role == self.SourceStateRole:
+            return state
+        if role == Qt.EditRole:
+            return record.selected[column - 2]
+        if role == self.DuplicateRole:
+            return state in (self.SINGLE, self.MULTIPLE) and (
+                source_text(record, column - 2) in record.duplicates
+            )
+        if role not in (Qt.DisplayRole, Qt.ToolTipRole):
+            return None
 
+        if state in (self.SINGLE, self.MULTIPLE):
+            text = source_text(record, column - 2)
+            if role == Qt.ToolTipRole and text in record.duplicates:
+                return "\n\n".join(
+                    (
+                        self.source_data(record, column, text, role),
+                        duplicate_tooltip(record, text),
+                    )
+                )
+            return self.source_data(record, column, text, role)
+        if state == self.NO_SOURCE:
+            return (
+                "--" if role == Qt.DisplayRole else self.NO_SOURCE_SIGNALS[column - 2]
+            )
+        if state == self.NOTHING_FOUND:
+            if record.error:
+                return self.UNREADABLE_TEXT if role == Qt.DisplayRole else record.error
+            return self.NOTHING_FOUND_TEXT
+        return None
+
+    def source_data(self, record: Record, column: int, text, role: int):
+        if role == Qt.ToolTipRole and column == 2 and record.sources.nested:
+            names = record.sources.zips if text is None else [text]
+            return "\n".join(nested_summary(record.sources, each) for each in names)
+        if column == 4 and record.pdf_info:
+            return self.pdf_text(record, text, role)
+        if text is None and role == Qt.DisplayRole:
+            return self.MULTIPLE_PLACEHOLDER
+        return text
+
+    def pdf_text(self, record: Record, text, role: int):
+        infos = record.pdf_info
+        if text is None:
+            if role == Qt.DisplayRole:
+                return self.MULTIPLE_PLACEHOLDER
+            return "\n\n".join(info.description for info in infos.values())
+        info = infos.get(text)
+        if info is None:
+            return text
+        if role == Qt.DisplayRole:
+            return f"{text}  ({info.summary})"
+        return info.description
+
+    def setData(self, index: QModelIndex, value: Any, role: int = Qt.EditRole) -> bool:
+        if not index.isValid():
+            return False
+        record = self.rows[index.row()]
+        if index.column() == 0 and role == Qt.CheckStateRole:
+            record.checked = Qt.CheckState(value) == Qt.Checked
+        elif index.column() >= 2 and role == Qt.EditRole:
+            record.select(index.column() - 2, value)
         else:
-            label = QLabel(text="    -- No Source Found --")
-            label.setStyleSheet("border-color: rgb(150, 150, 150);")
-            label.setCursor(Qt.ForbiddenCursor)
-            self.table.setCellWidget(row, 2, label)
-            label.setAlignment(Qt.AlignCenter)
-            self.table.setSpan(
-                row, 2, self.table.rowSpan(row, 2), self.table.columnSpan(row, 2) * 3
+            return False
+        self.dataChanged.emit(index, index, [role])
+        return True
+
+    def source_state(self, index: QModelIndex) -> int:
+        record = self.rows[index.row()]
+        if not any(record.sources.counts):
+            # The whole row is a single notice, drawn in the middle column.
+            return self.NOTHING_FOUND if index.column() == 3 else self.EMPTY
+        count = len(record.sources[index.column() - 2])
+        if count > 1 and not record.locked:
+            return self.MULTIPLE
+        if count >= 1:
+            return self.SINGLE
+        return self.NO_SOURCE
+
+    def append_rows(self, records: list):
+        if not records:
+            return
+        with tracer.span("append_rows", "table", rows=len(records)):
+            # Duplicates are known before the filter proxy indexes the new
+            # rows' search text and sort keys.
+            with tracer.span("index_duplicates", "table", rows=len(records)):
+                self.index_duplicates(records)
+            self.add_rows(records)
+
+    def add_rows(self, records: list):
+        # Records come in input order. Rows after the last one are appended
+        # and the proxy extends its caches for them alone. Rows in between
+        # move every later row, one reset rebuilds the proxy once for all.
+        if not self.numbers or records[0].number > self.numbers[-1]:
+            first = len(self.rows)
+            self.beginInsertRows(QModelIndex(), first, first + len(records) - 1)
+            self.rows.extend(records)
+            self.numbers.extend(record.number for record in records)
+            self.endInsertRows()
+            return
+        self.beginResetModel()
+        self.rows.extend(records)
+        self.rows.sort(key=attrgetter("number"))
+        self.numbers = [record.number for record in self.rows]
+        self.endResetModel()
+
+    def position(self, number: int) -> int:
+        numbers = self.numbers
+        position = bisect.bisect_left(numbers, number)
+        if position < len(numbers) and numbers[position] == number:
+            return position
+        return -1
+
+    def upsert_rows(self, records: list):
+        # Rescanned archives replace their row, new ones are added in input
+        # order.
+        shared = set()
+        replaced = []
+        added = []
+        for record in records:
+            position = self.position(record.number)
+            if position < 0:
+                added.append(record)
+                continue
+            shared |= self.duplicates.remove(record.number - 1)
+            # A deleted archive stays deleted when its file changes.
+            record.hidden = self.rows[position].hidden
+            self.rows[position] = record
+            replaced.append(record)
+        # The proxy rebuilds a row's text when it is added or changed, so
+        # duplicates are indexed first.
+        self.index_duplicates(replaced + added, shared)
+        if added:
+            self.add_rows(sorted(added, key=attrgetter("number")))
+        for record in replaced:
+            position = self.position(record.number)
+            self.dataChanged.emit(self.index(position, 0), self.index(position, 4), [])
+
+    def remove_numbers(self, numbers: list):
+        shared = set()
+        for number in numbers:
+            shared |= self.duplicates.remove(number - 1)
+            position = self.position(number)
+            if position >= 0:
+                self.beginRemoveRows(QModelIndex(), position, position)
+                del self.rows[position]
+                del self.numbers[position]
+                self.endRemoveRows()
+        self.index_duplicates([], shared)
+
+    def index_duplicates(self, records: list, shared: set = frozenset()):
+        # Central directory CRCs and sizes are compared as rows arrive. Rows
+        # hold the shared groups, so rows already shown are only revisited
+        # when they gain their first or lose their last duplicate of a name.
+        shared = set(shared)
+        for record in records:
+            shared |= self.duplicates.add(
+                record.number - 1, record.folder, record.sources
             )
+        for record in records:
+            record.duplicates = self.duplicates.matches(record.number - 1)
+        touched = self.duplicates.rows_of(shared)
+        touched.difference_update(record.number - 1 for record in records)
+        for number in sorted(each + 1 for each in touched):
+            row = self.position(number)
+            if row >= 0:
+                record = self.rows[row]
+                record.duplicates = self.duplicates.matches(number - 1)
+                self.dataChanged.emit(self.index(row, 2), self.index(row, 4), [])
+
+    def set_hidden(self, hidden: bool) -> int:
+        # Deleting hides the checked rows and restoring shows every hidden
+        # one. The records stay in memory, and a single reset lets the proxy
+        # refilter in one pass, scattered rows would otherwise each be
+        # removed or inserted on their own.
+        changed = [
+            record
+            for record in self.rows
+            if record.hidden != hidden and (record.checked or not hidden)
+        ]
+        if changed:
+            self.beginResetModel()
+            for record in changed:
+                record.hidden = hidden
+                record.checked = False
+            self.endResetModel()
+        return len(changed)
+
+    def visible_rows(self) -> list:
+        return [record for record in self.rows if not record.hidden]
+
+    def set_pdf_info(self, results: list):
+        changed = []
+        for result in results:
+            row = self.position(result.job.row)
+            if row >= 0:
+                self.rows[row].pdf_info = {info.name: info for info in result.infos}
+                changed.append(row)
+        if changed:
+            self.dataChanged.emit(
+                self.index(min(changed), 4), self.index(max(changed), 4), []
+            )
+
+    def lock_selection(self):
+        for record in self.rows:
+            record.locked = True
+        if self.rows:
+            self.dataChanged.emit(
+                self.index(0, 2), self.index(len(self.rows) - 1, 4), []
+            )
+
+
+class SourceDelegate(QStyledItemDelegate):
+    BORDER_SINGLE = QColor(98, 114, 164)
+    BORDER_MULTIPLE = QColor(255, 85, 85)
+    BORDER_NOTHING = QColor(150, 150, 150)
+    BORDER_HOVER = QColor(139, 233, 253)
+    BORDER_DUPLICATE = QColor(241, 250, 140)
 
-    def widget_multiple_source(self, row, col, src_sfxs):
-        combox_lay = QComboBox()
-        model = QStandardItemModel()
-        for archive in list(src_sfxs.keys()):
-            model.appendRow(QStandardItem(archive))
-        combox_lay.setModel(ProxyModel(model, "    -- Multiple Source Found --"))
-        combox_lay.setCurrentIndex(0)
+    def paint(
+        self, painter: QPainter, option: QStyleOptionViewItem, index: QModelIndex
+    ):
+        state = index.data(TabulationModel.SourceStateRole)
+        if index.column() == 0:
+            return super().paint(painter, option, index)
+        if state == TabulationModel.EMPTY:
+            return
+
+        if state == TabulationModel.MULTIPLE:
+            color = self.BORDER_MULTIPLE
+        elif state == TabulationModel.NOTHING_FOUND:
+            color = self.BORDER_NOTHING
+        elif index.data(TabulationModel.DuplicateRole):
+            color = self.BORDER_DUPLICATE
+        else:
+            color = self.BORDER_SINGLE
+        if option.state & QStyle.State_MouseOver:
+            color = self.BORDER_HOVER
+
+        rect = option.rect.adjusted(2, 10, -2, -1)
+        if state == TabulationModel.NOTHING_FOUND:
+            # Stretch the notice across the three source columns.
+            width = option.rect.width()
+            rect = rect.adjusted(-width, 0, width, 0)
+
+        painter.save()
+        painter.setRenderHint(QPainter.Antialiasing)
+        painter.setClipping(False)
+        painter.setPen(QPen(color, 1.5))
+        painter.drawRoundedRect(QRectF(rect), 10, 10)
+        font = QFont(option.font)
+        font.setWeight(QFont.DemiBold)
+        painter.setFont(font)
+        painter.setPen(option.palette.color(QPalette.Text))
+        text = QFontMetrics(font).elidedText(
+            str(index.data(Qt.DisplayRole)), Qt.ElideMiddle, rect.width() - 10
+        )
+        painter.drawText(rect, Qt.AlignCenter, text)
+        painter.restore()
+
+    def createEditor(
+        self, parent: QWidget, option: QStyleOptionViewItem, index: QModelIndex
+    ):
+        source = index.model().mapToSource(index)
+        record = source.model().rows[source.row()]
+        combox_lay = QComboBox(parent)
+        model = QStandardItemModel(combox_lay)
+        for archive in record.sources[index.column() - 2]:
+            item = QStandardItem(archive)
+            if index.column() == 2:
+                item.setToolTip(nested_summary(record.sources, archive))
+            elif archive in record.pdf_info:
+                item.setToolTip(record.pdf_info[archive].description)
+            model.appendRow(item)
+        combox_lay.setModel(
+            ProxyModel(model, TabulationModel.MULTIPLE_PLACEHOLDER, combox_lay)
+        )
         combox_lay.setCursor(Qt.PointingHandCursor)
-        self.table.setCellWidget(row, col, combox_lay)
+        combox_lay.activated.connect(lambda: self.commit_and_close(combox_lay))
+        QTimer.singleShot(0, combox_lay.showPopup)
+        return combox_lay
+
+    def setEditorData(self, editor: QComboBox, index: QModelIndex):
+        selected = index.data(Qt.EditRole)
+        editor.setCurrentIndex(0 if selected is None else selected + 1)
 
-    def widget_single_source(self, row, col, src_sfxs):
-        label = QLabel(text=list(src_sfxs.keys())[0])
-        label.setToolTip(list(src_sfxs.keys())[0])
-        label.setAlignment(Qt.AlignCenter)
-        self.table.setCellWidget(row, col, label)
+    def setModelData(
+        self, editor: QComboBox, model: QAbstractItemModel, index: QModelIndex
+    ):
+        current = editor.currentIndex()
+        model.setData(index, None if current <= 0 else current - 1, Qt.EditRole)
+
+    def updateEditorGeometry(
+        self, editor: QWidget, option: QStyleOptionViewItem, index: QModelIndex
+    ):
+        editor.setGeometry(option.rect)
 
-    def widget_no_source(self, signal, row, col):
-        label = QLabel(text="--")
-        label.setToolTip(signal)
-        label.setAlignment(Qt.AlignCenter)
-        self.table.setCellWidget(row, col, label)
+    def commit_and_close(self, editor: QComboBox):
+        self.commitData.emit(editor)
+        self.closeEditor.emit(editor)
 
 
-class LoadTable(QTableWidget):
-    def __init__(self, input_files: list, parent=None):
-        super(LoadTable, self).__init__(1, 5, parent)
-        self.setFont(QFont("Helvetica", 10, QFont.Normal, italic=False))
-        headertitle = (
-            "  Select  ",
-            "FOLDER NAME",
-            "ZIP SOURCE",
-            "XML/SGML",
-            "PDF SOURCE",
+class RowFilterProxy(QAbstractProxyModel):
+    # Shows the rows that are not hidden and match the search box, in the
+    # chosen sort order. The mapping is a plain list of source rows computed
+    # from the search and sort indexes, Qt never calls back into Python per
+    # row to filter or compare.
+    def __init__(self, model: TabulationModel, parent=None):
+        super().__init__(parent)
+        self.search = SearchIndex()
+        self.sort_keys = SortIndex()
+        self.query = ""
+        # (key name, descending) pairs, most significant first, empty keeps
+        # the input order.
+        self.order = []
+        self.mapping = []
+        self.inverse = None
+        self.setSourceModel(model)
+        model.rowsInserted.connect(self.source_rows_inserted)
+        model.rowsAboutToBeRemoved.connect(self.source_rows_about_to_be_removed)
+        model.rowsRemoved.connect(self.source_reset)
+        model.modelAboutToBeReset.connect(self.beginResetModel)
+        model.modelReset.connect(self.source_reset)
+        model.dataChanged.connect(self.source_data_changed)
+
+    def index(self, row: int, column: int, parent: QModelIndex = QModelIndex()):
+        if parent.isValid() or not 0 <= row < len(self.mapping):
+            return QModelIndex()
+        return self.createIndex(row, column)
+
+    def parent(self, index: QModelIndex = QModelIndex()) -> QModelIndex:
+        return QModelIndex()
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self.mapping)
+
+    def columnCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else self.sourceModel().columnCount()
+
+    def hasChildren(self, parent: QModelIndex = QModelIndex()) -> bool:
+        return not parent.isValid() and bool(self.mapping)
+
+    def headerData(
+        self, section: int, orientation: Qt.Orientation, role: int = Qt.DisplayRole
+    ):
+        return self.sourceModel().headerData(section, orientation, role)
+
+    def mapToSource(self, proxyIndex: QModelIndex) -> QModelIndex:
+        if not proxyIndex.isValid():
+            return QModelIndex()
+        return self.sourceModel().index(
+            self.mapping[proxyIndex.row()], proxyIndex.column()
         )
-        self.setHorizontalHeaderLabels(headertitle)
+
+    def mapFromSource(self, sourceIndex: QModelIndex) -> QModelIndex:
+        if not sourceIndex.isValid():
+            return QModelIndex()
+        if self.inverse is None:
+            self.inverse = {row: position for position, row in enumerate(self.mapping)}
+        position = self.inverse.get(sourceIndex.row())
+        if position is None:
+            return QModelIndex()
+        return self.createIndex(position, sourceIndex.column())
+
+    def set_query(self, query: str):
+        if query == self.query:
+            return
+        self.query = query
+        self.beginResetModel()
+        self.refilter()
+        self.endResetModel()
+
+    def sort(self, column: int, order: Qt.SortOrder = Qt.AscendingOrder):
+        # Shift+click sorts by the column within the current order.
+        then = bool(QGuiApplication.keyboardModifiers() & Qt.ShiftModifier)
+        if column < 0:
+            self.sort_by("number")
+        else:
+            self.sort_by(COLUMN_KEYS[column], order == Qt.DescendingOrder, then)
+
+    def sort_by(self, name: str, descending: bool = False, then: bool = False):
+        order = [each for each in self.order if each[0] != name] if then else []
+        order.append((name, descending))
+        if order == [("number", False)]:
+            order = []
+        if order == self.order:
+            return
+        self.order = order
+        self.beginResetModel()
+        self.refilter()
+        self.endResetModel()
+
+    def refilter(self):
+        with tracer.span("refilter", "table", query=self.query, order=self.order):
+            mapping = self.search.search(self.query)
+            if self.order:
+                mapping = self.sort_keys.order(
+                    self.sourceModel().rows, mapping, self.order
+                )
+        self.mapping = mapping
+        self.inverse = None
+
+    def source_rows_inserted(self, parent: QModelIndex, first: int, last: int):
+        rows = self.sourceModel().rows
+        if first != len(self.search.texts) or self.order:
+            # Rows inserted in between move every later source row, and a
+            # sorted table has to place new rows among the old ones.
+            self.beginResetModel()
+            self.source_reset()
+            return
+        # Appended rows are indexed as they arrive and only they are searched.
+        self.search.extend(rows[first : last + 1])
+        self.sort_keys.add(rows[first : last + 1])
+        added = self.search.search(self.query, first)
+        if added:
+            start = len(self.mapping)
+            self.beginInsertRows(QModelIndex(), start, start + len(added) - 1)
+            self.mapping.extend(added)
+            self.inverse = None
+            self.endInsertRows()
+
+    def source_rows_about_to_be_removed(
+        self, parent: QModelIndex, first: int, last: int
+    ):
+        self.beginResetModel()
+        self.search.forget(self.sourceModel().rows[first : last + 1])
+        self.sort_keys.forget(self.sourceModel().rows[first : last + 1])
+
+    def source_reset(self):
+        self.search.rebuild(self.sourceModel().rows)
+        self.refilter()
+        self.endResetModel()
+
+    def source_data_changed(
+        self, top_left: QModelIndex, bottom_right: QModelIndex, roles
+    ):
+        if roles != [Qt.CheckStateRole]:
+            # Changed rows are searchable by their new text from the next
+            # keystroke or sort on, rows are not pulled out from under the
+            # user.
+            rows = self.sourceModel().rows
+            self.search.refresh(rows, top_left.row(), bottom_right.row())
+            self.sort_keys.forget(rows[top_left.row() : bottom_right.row() + 1])
+        if self.mapping:
+            self.dataChanged.emit(
+                self.index(0, top_left.column()),
+                self.index(len(self.mapping) - 1, bottom_right.column()),
+                roles,
+            )
+
+
+class LoadTable(QTableView):
+    def __init__(self, parent=None):
+        super(LoadTable, self).__init__(parent)
+        # Rows live in the source model, the view only sees those the proxy
+        # lets through.
+        self.source_model = TabulationModel(self)
+        self.setModel(RowFilterProxy(self.source_model, self))
+        self.setItemDelegate(SourceDelegate(self))
+        self.setFont(QFont("Helvetica", 10, QFont.Normal, italic=False))
+        self.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.clicked.connect(self.edit_source)
+        self.setMouseTracking(True)
+        self.setShowGrid(False)
+        self.setWordWrap(False)
         self.verticalHeader().hide()
+        # A fixed row height lets the view map scroll offsets to rows without
+        # measuring every row, which keeps scrolling cheap at any row count.
+        self.verticalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
+        self.verticalHeader().setDefaultSectionSize(45)
         self.horizontalHeader().setHighlightSections(False)
         self.resizeColumnToContents(0)
         self.horizontalHeader().setSectionResizeMode(0, QHeaderView.ResizeMode.Fixed)
@@ -199,77 +706,45 @@ class LoadTable(QTableWidget):
         self.horizontalHeader().setSectionResizeMode(2, QHeaderView.ResizeMode.Stretch)
         self.horizontalHeader().setSectionResizeMode(3, QHeaderView.ResizeMode.Stretch)
         self.horizontalHeader().setSectionResizeMode(4, QHeaderView.ResizeMode.Stretch)
-        self.horizontalHeader().setStyleSheet(
-            """
-            QHeaderView::section {
-                border-top:1.5px solid;
-                border-left:1.5px solid;
-                border-right:1.5px solid;
-                border-bottom: 1.5px solid;
-                padding:4px;
-                margin-left: 5px;
-                border-radius: 10px;
-                border-color: rgb(180, 100, 180);
-                font-weight:600;
-                margin-right: 5px;
-        }
-        """
-        )
 
-        self.setStyleSheet(
-            """
-        QLabel { 
-                border-top:1.5px solid;
-                border-left:1.5px solid;
-                border-right:1.5px solid;
-                border-bottom: 1.5px solid;
-                border-radius: 10px;
-                border-color: rgb(98, 114, 164);
-                font-weight:600;
-                margin-top: 10px;
-                height: 50px;
-                           }
-        QLabel:hover { 
-                border-top:1.5px solid;
-                border-left:1.5px solid;
-                border-right:1.5px solid;
-                border-bottom: 1.5px solid;
-                border-radius: 10px;
-                border-color: rgb(139, 233, 253);
-                font-weight:600;
-                margin-top: 10px;
-                height: 50px;
-                           }
-        QComboBox { 
-                border-top:1.5px solid;
-                border-left:1.5px solid;
-                border-right:1.5px solid;
-                border-bottom: 1.5px solid;
-                border-radius: 10px;
-                border-color: rgb(255, 85, 85);
-                font-weight:600;
-                margin-top: 10px;
-                height: 50px;
-                           }
-
-        QComboBox:hover { 
-                border-top:1.5px solid;
-                border-left:1.5px solid;
-                border-right:1.5px solid;
-                border-bottom: 1.5px solid;
-                border-radius: 10px;
-                border-color: rgb(139, 233, 253);
-                font-weight:600;
-                margin-top: 10px;
-                height: 50px;
-                           }
-        """
-        )
+        self.horizontalHeader().setSortIndicator(-1, Qt.AscendingOrder)
+        self.setSortingEnabled(True)
+        self.horizontalHeader().setContextMenuPolicy(Qt.CustomContextMenu)
+        self.horizontalHeader().customContextMenuRequested.connect(self.header_menu)
 
-        CellModel(self).render_model(input_files)
         self.setFocusPolicy(Qt.NoFocus)
         self.setSelectionMode(QAbstractItemView.NoSelection)
 
+    def header_menu(self, position: QPoint):
+        # Keys without a column of their own.
+        menu = QMenu(self)
+        for label, name, descending in (
+            ("Sort by status", "status", False),
+            ("Sort by total size", "size", True),
+            ("Input order", "number", False),
+        ):
+            action = menu.addAction(label)
+            action.triggered.connect(
+                lambda checked=False, name=name, descending=descending: self.sort_by(
+                    name, descending
+                )
+            )
+        menu.exec(self.horizontalHeader().mapToGlobal(position))
+
+    def sort_by(self, name: str, descending: bool):
+        then = bool(QGuiApplication.keyboardModifiers() & Qt.ShiftModifier)
+        header = self.horizontalHeader()
+        # The indicator only marks header sorts, setting it would sort again.
+        header.blockSignals(True)
+        header.setSortIndicator(-1, Qt.AscendingOrder)
+        header.blockSignals(False)
+        self.model().sort_by(name, descending, then)
+
+    def edit_source(self, index: QModelIndex):
+        # Combo boxes only exist while a cell with several sources is edited.
+        if index.flags() & Qt.ItemIsEditable:
+            self.edit(index)
+
 
 class topButton(QPushButton):
     def __init__(self, text: str, icon: str):
@@ -280,70 +755,145 @@ class topButton(QPushButton):
 
     def configure(self):
         self.setText(self.name)
-        icon = QIcon()
-        icon.addFile(f":/icons/icons/{self.ico}", QSize(), QIcon.Normal, QIcon.Off)
-        self.setIcon(icon)
+        self.setIcon(icon_cache.icon(self.ico))
         self.setMinimumHeight(40)
         self.setMinimumWidth(100)
-        self.setStyleSheet(
-            """
-                QPushButton {
-                    background-color: rgb(100, 30, 156);
-                    border: 1.5px solid;
-                    border-color: rgb(100, 100, 100);
-                    border-radius: 15px;
-                }
-
-                QPushButton:hover {
-                    background-color: rgb(111, 56, 167);
-                    border-color: rgb(180, 100, 180);
-                }
-
-                QPushButton:disabled {
-                    background-color: rgb(50, 50, 50);
-                    border-color: rgb(100, 100, 100);
-                }
-
-                QPushButton:pressed {
-                    background-color: #6272a4;
-                    border-color: #bd93f1;
-                }
-            """
-        )
 
 
 class TableModel(QFrame):
-    deleted_rows = []
-
-    def __init__(self, input_files: list, parent_layout: QVBoxLayout):
+    def __init__(
+        self,
+        input_files: list,
+        parent_layout: QVBoxLayout,
+        watch_folders: list = (),
+        nested_depth: int = CellModel.NESTED_DEPTH,
+    ):
         super().__init__()
-        del self.deleted_rows[:]
         if isinstance(input_files, str):
             self.input_files = input_files.split("; ")
         else:
-            self.input_files = input_files
+            # The folder watch appends to the list, the caller's stays as is.
+            self.input_files = list(input_files)
         self.parent_layout = parent_layout
+        self.watch_folders = [pathlib.Path(each).absolute() for each in watch_folders]
+        self.nested_depth = nested_depth
+        self.pdf_worker = None
+        self.watcher = None
+        self.watch_workers = []
         self.initUi()
-        self.setStyleSheet(
-            """QFrame {
-                        border: none;
-                            }"""
-        )
 
     def initUi(self):
-        layoutV = QVBoxLayout(self)
-
-        area = QScrollArea(self)
-        area.setWidgetResizable(True)
-        scrollAreaWidgetContents = QWidget()
-        mainlayout = QHBoxLayout()
-        self.table = LoadTable(self.input_files)
-
-        mainlayout.addWidget(self.table)
-        self.setTopButtons(layoutV)
-        scrollAreaWidgetContents.setLayout(mainlayout)
-        area.setWidget(scrollAreaWidgetContents)
-        layoutV.addWidget(area)
+        with tracer.span("build_table", "page", archives=len(self.input_files)):
+            layoutV = QVBoxLayout(self)
+
+            area = QScrollArea(self)
+            area.setWidgetResizable(True)
+            scrollAreaWidgetContents = QWidget()
+            mainlayout = QHBoxLayout()
+            self.table = LoadTable()
+
+            mainlayout.addWidget(self.table)
+            self.setTopButtons(layoutV)
+            self.setProgressBar(layoutV)
+            scrollAreaWidgetContents.setLayout(mainlayout)
+            area.setWidget(scrollAreaWidgetContents)
+            layoutV.addWidget(area)
+            self.start_scan()
+
+    def setProgressBar(self, rootlayout: QVBoxLayout):
+        self.progress_frame = QWidget()
+        mainlayout = QHBoxLayout(self.progress_frame)
+        mainlayout.setContentsMargins(0, 0, 0, 0)
+
+        self.progress_bar = QProgressBar()
+        self.progress_bar.setRange(0, len(self.input_files))
+        self.progress_bar.setValue(0)
+        self.progress_bar.setFormat("%v / %m archives")
+        self.progress_status = QLabel()
+        self.cancel_button = topButton("  Cancel", "cil-x-circle.png")
+        self.cancel_button.clicked.connect(self.cancel_scan)
+
+        mainlayout.addWidget(self.progress_bar, 1)
+        mainlayout.addWidget(self.progress_status, 1)
+        mainlayout.addWidget(self.cancel_button)
+        rootlayout.addWidget(self.progress_frame)
+
+    def start_scan(self):
+        for button in (self.save_button, self.delete_button):
+            button.setEnabled(False)
+        self.worker = ScanWorker(self.input_files, CellModel.scanner(self.nested_depth))
+        self.worker.signals.rows.connect(self.insert_rows)
+        self.worker.signals.progress.connect(self.show_progress)
+        self.worker.signals.finished.connect(self.scan_finished)
+        QThreadPool.globalInstance().start(self.worker)
+
+    def insert_rows(self, results: list):
+        CellModel(self.table).render_model(results)
+
+    def show_progress(self, done: int, total: int, name: str):
+        self.progress_bar.setValue(done)
+        self.progress_status.setText(f"  Scanned {name}" if name else "")
+
+    def cancel_scan(self):
+        self.cancel_button.setEnabled(False)
+        self.progress_status.setText("  Cancelling...")
+        self.worker.cancel()
+
+    def scan_finished(self, cancelled: bool):
+        failed = sum(1 for record in self.table.source_model.rows if record.error)
+        if cancelled or failed:
+            summary = "Scan cancelled, " if cancelled else ""
+            summary += f"{len(self.table.source_model.rows)} archives listed"
+            if failed:
+                summary += f", {failed} could not be read"
+            self.show_status("  " + summary)
+        else:
+            self.progress_frame.hide()
+        for button in (self.save_button, self.delete_button):
+            button.setEnabled(True)
+        self.watch_button.setEnabled(bool(self.watch_folders))
+        self.inspect_pdfs()
+
+    def inspect_pdfs(self):
+        # Rows still without PDF metadata are inspected after the scan, the
+        # PDF SOURCE cells fill in as archives finish.
+        if self.pdf_worker is not None:
+            self.pdf_worker.cancel()
+        jobs = [
+            PdfJob(
+                record.number,
+                pathlib.Path(self.input_files[record.number - 1]),
+                tuple(record.sources.pdfs),
+            )
+            for record in self.table.source_model.rows
+            if record.sources.pdfs and not record.pdf_info
+        ]
+        if not jobs:
+            return
+        self.pdf_worker = PdfInfoWorker(jobs, PdfInspector(cache=manifest_cache))
+        self.pdf_worker.signals.infos.connect(self.insert_pdf_info)
+        self.pdf_worker.signals.finished.connect(self.pdf_inspection_finished)
+        QThreadPool.globalInstance().start(self.pdf_worker)
+
+    def insert_pdf_info(self, results: list):
+        if self.sender() is self.pdf_worker.signals:
+            self.table.source_model.set_pdf_info(results)
+
+    def pdf_inspection_finished(self, stats):
+        if self.sender() is not self.pdf_worker.signals:
+            return
+        infos = [
+            info
+            for record in self.table.source_model.rows
+            for info in record.pdf_info.values()
+        ]
+        unreadable = sum(1 for info in infos if info.error)
+        encrypted = sum(1 for info in infos if info.encrypted)
+        if unreadable or encrypted:
+            self.show_status(
+                f"  Checked {len(infos)} PDFs in {stats.seconds:.2f} s,"
+                f" {unreadable} unreadable, {encrypted} encrypted"
+            )
 
     def setTopButtons(self, rootlayout: QVBoxLayout):
         mainlayout = QHBoxLayout()
@@ -354,8 +904,24 @@ class TableModel(QFrame):
         self.reload_button = topButton("  Reload", "cil-reload.png")
         self.delete_button = topButton("  Delete", "cil-x.png")
         self.restore_button = topButton("  Restore", "cil-window-restore.png")
+        self.watch_button = topButton("  Watch", "cil-folder-open.png")
+        self.watch_button.setCheckable(True)
+        self.watch_button.setToolTip(
+            "\n".join(
+                ["Add, update and remove rows as archives change in:"]
+                + [each.as_posix() for each in self.watch_folders]
+            )
+        )
+
+        self.search_box = QLineEdit()
+        self.search_box.setPlaceholderText("Search folders, sources, status")
+        self.search_box.setClearButtonEnabled(True)
+        self.search_box.setMinimumHeight(40)
+        self.search_box.setMinimumWidth(260)
+        self.search_box.textChanged.connect(self.table.model().set_query)
 
         self.restore_button.setEnabled(False)
+        self.watch_button.setEnabled(False)
         self.reload_button.setEnabled(False)
         self.next_button.setEnabled(False)
         self.export_button.setEnabled(False)
@@ -364,11 +930,14 @@ class TableModel(QFrame):
         self.reload_button.clicked.connect(self.reload_table_data)
         self.delete_button.clicked.connect(self.remove_rows)
         self.restore_button.clicked.connect(self.restore_rows)
+        self.watch_button.toggled.connect(self.toggle_watch)
         self.next_button.clicked.connect(self.segregation_context)
         self.export_button.clicked.connect(self.export_to_excel)
 
+        mainlayout.addWidget(self.search_box)
         mainlayout.addWidget(self.delete_button)
         mainlayout.addWidget(self.restore_button)
+        mainlayout.addWidget(self.watch_button)
         mainlayout.addWidget(self.save_button)
         mainlayout.addWidget(self.reload_button)
         mainlayout.addWidget(self.export_button)
@@ -377,105 +946,152 @@ class TableModel(QFrame):
         mainlayout.setAlignment(Qt.AlignRight)
         rootlayout.addLayout(mainlayout)
 
+    def show_status(self, text: str):
+        self.cancel_button.hide()
+        self.progress_bar.hide()
+        self.progress_status.setText(text)
+        self.progress_frame.show()
+
     def save_data(self):
-        self.table_data = []
-        self.table_save = True
-        del self.table_data[:]
-        for row in range(self.table.rowCount()):
-            row_data = []
-            for column in range(self.table.columnCount()):
-                each = self.table.cellWidget(row, column)
-                if isinstance(each, QLabel):
-                    row_data.append(each.text())
-                elif isinstance(each, QComboBox):
-                    current_text = each.currentText()
-                    if not current_text.__contains__("Multiple Source Found"):
-                        label5 = QLabel(text=current_text)
-                        row_data.append(current_text)
-                        self.table.removeCellWidget(row, column)
-                        self.table.setCellWidget(row, column, label5)
-                        label5.setToolTip(current_text)
-                        label5.setAlignment(Qt.AlignCenter)
-                    else:
-                        self.table_save = False
-                elif each == None:
-                    row_data.append(None)
+        with tracer.span("save_data", "table"):
+            self.table_data = []
+            self.table_save = True
+            model = self.table.source_model
+            for record in model.visible_rows():
+                row_data = record_values(record)
+                if row_data is None:
+                    continue
+                if None in row_data:
+                    self.table_save = False
+                    break
+                self.table_data.append(row_data + [duplicate_text(record)])
+
             if self.table_save == True:
-                self.table_data.append(row_data)
-
-        if self.table_save == True:
-            for i, items in enumerate(self.table_data):
-                if None in items:
-                    del self.table_data[i]
-            self.reload_button.setEnabled(True)
-            self.next_button.setEnabled(True)
-            self.delete_button.setEnabled(False)
-            self.restore_button.setEnabled(False)
-            self.export_button.setEnabled(True)
-        else:
-            del self.table_data[:]
+                model.lock_selection()
+                self.reload_button.setEnabled(True)
+                self.next_button.setEnabled(True)
+                self.delete_button.setEnabled(False)
+                self.restore_button.setEnabled(False)
+                self.export_button.setEnabled(True)
+            else:
+                del self.table_data[:]
 
     def reload_table_data(self):
+        if self.pdf_worker is not None:
+            self.pdf_worker.cancel()
+        self.toggle_watch(False)
         self.setParent(None)
-        self.parent_layout.addWidget(TableModel(self.input_files, self.parent_layout))
+        self.parent_layout.addWidget(
+            TableModel(
+                self.input_files,
+                self.parent_layout,
+                self.watch_folders,
+                self.nested_depth,
+            )
+        )
 
-    def remove_rows(self):
-        [self.remove_selected() for n in range(2)]
-
-    def remove_selected(self):
-        for row_checked in range(self.table.rowCount()):
-            checkmark = self.table.cellWidget(row_checked, 0)
-            if isinstance(checkmark, QCheckBox) and checkmark.isChecked():
-                self.deleted_rows.append(
-                    int(checkmark.text().replace(" ", "").replace(".", "")) - 1
-                )
+    def toggle_watch(self, watching: bool):
+        if self.watcher is not None:
+            self.watcher.stop()
+            self.watcher.deleteLater()
+            self.watcher = None
+        if watching:
+            # Only what changes from now on is rescanned, every other row
+            # keeps its scan and its cached manifest.
+            self.watcher = FolderWatcher(self.watch_folders, parent=self)
+            self.watcher.changes.connect(self.apply_changes)
+            self.watcher.start()
+            self.show_status(
+                "  Watching " + ", ".join(each.name for each in self.watch_folders)
+            )
 
-        for row_count in range(self.table.rowCount()):
-            checkbox = self.table.cellWidget(row_count, 0)
-            if isinstance(checkbox, QCheckBox) and checkbox.isChecked():
-                self.table.removeRow(row_count)
+    def apply_changes(self, changes):
+        rows = {
+            pathlib.Path(each).absolute(): row
+            for row, each in enumerate(self.input_files)
+        }
+        rescan = []
+        for path in changes.added + changes.changed:
+            row = rows.get(path)
+            if row is None:
+                if path in changes.changed:
+                    continue
+                row = len(self.input_files)
+                self.input_files.append(path)
+            rescan.append(row)
+        removed = [rows[path] + 1 for path in changes.removed if path in rows]
+        if removed:
+            self.table.source_model.remove_numbers(removed)
+        if rescan:
+            worker = ScanWorker(
+                [self.input_files[row] for row in rescan],
+                CellModel.scanner(self.nested_depth),
+                rescan,
+            )
+            worker.signals.rows.connect(self.update_rows)
+            worker.signals.finished.connect(self.watch_scan_finished)
+            self.watch_workers.append(worker)
+            QThreadPool.globalInstance().start(worker)
+        self.show_status(
+            f"  Watching: {len(changes.added)} added, {len(changes.changed)}"
+            f" updated, {len(removed)} removed"
+        )
+
+    def update_rows(self, results: list):
+        CellModel(self.table).update_model(results)
 
-        self.restore_button.setEnabled(True)
+    def watch_scan_finished(self, cancelled: bool):
+        self.watch_workers = [
+            each for each in self.watch_workers if each.signals is not self.sender()
+        ]
+        self.inspect_pdfs()
+
+    def remove_rows(self):
+        if self.table.source_model.set_hidden(True):
+            self.restore_button.setEnabled(True)
 
     def restore_rows(self):
-        for each in dict.fromkeys(self.deleted_rows):
-            with zipfile.ZipFile(self.input_files[each].as_posix(), "r") as archive:
-                CellModel(self.table).generate_row(
-                    archive.namelist(), each, self.input_files[each]
-                )
+        # Hidden rows kept their scan, PDF details and duplicates, nothing
+        # is read back from disk.
+        self.table.source_model.set_hidden(False)
         self.restore_button.setEnabled(False)
-        del self.deleted_rows[:]
 
     def segregation_context(self):
-        for source in self.table_data:
-            # S1000D/NONS1000D
-            if source[1] != "--":
-                pass
-            # ISPEC
-            elif source[2] != "--":
-                pass
-
-            # PDF
-            elif source[3] != "--":
-                pass
+        jobs = []
+        for record in self.table.source_model.visible_rows():
+            values = record_values(record)
+            if values is None:
+                continue
+            row = record.number - 1
+            jobs.append(
+                SegregationJob(row, pathlib.Path(self.input_files[row]), *values)
+            )
+        table_signals.segregation_requested.emit(jobs, Segregator(cache=manifest_cache))
 
     def export_to_excel(self):
-        filename = QFileDialog.getSaveFileName(self, filter="*.xlsx")
+        filename = QFileDialog.getSaveFileName(self, filter=FILE_FILTERS)
         if filename != ("", ""):
-            excel = pathlib.Path(filename[0])
-            df = pd.DataFrame(
-                self.table_data,
-                columns=[
-                    "FOLDER NAME",
-                    "ZIP SOURCE",
-                    "XML/SGML",
-                    "PDF SOURCE",
-                ],
-            )
-            with pd.ExcelWriter(excel, mode="w", engine="xlsxwriter") as writer:
-                df.to_excel(writer, "REMARKS", index=False)
-                tbl_hdr = [{"header": c} for c in df.columns]
-                writer.sheets["REMARKS"].add_table(
-                    "A1:" + "D" + str(len(df) + 1),
-                    {"columns": tbl_hdr, "style": "Table Style Medium 2"},
+            with tracer.span("export_to_excel", "export", rows=len(self.table_data)):
+                self.export_button.setEnabled(False)
+                self.show_status("  Exporting...")
+                # The rows are copied so later edits cannot race the writer.
+                self.export_worker = ExportWorker(
+                    report_path(*filename),
+                    [list(row) for row in self.table_data],
+                    REPORT_COLUMNS + (DUPLICATES_COLUMN,),
                 )
+                self.export_worker.signals.finished.connect(self.export_finished)
+                self.export_worker.signals.failed.connect(self.export_failed)
+                QThreadPool.globalInstance().start(self.export_worker)
+
+    def export_finished(self, stats: ExportStats):
+        self.export_button.setEnabled(True)
+        self.show_status(
+            f"  Exported {stats.rows} rows to {stats.path.name} in"
+            f" {stats.seconds:.2f} s ({stats.rows_per_second:.0f} rows/s,"
+            f" {stats.bytes_per_second / 1024:.0f} KiB/s)"
+        )
+
+    def export_failed(self, error: str):
+        self.export_button.setEnabled(True)
+        self.show_status("  Export failed: " + error)
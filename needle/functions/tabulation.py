@@ -0,0 +1,124 @@
+import glob
+import os
+import pathlib
+from types import MappingProxyType
+
+from .classify import Sources
+
+REPORT_COLUMNS = ("FOLDER NAME", "ZIP SOURCE", "XML/SGML", "PDF SOURCE")
+NO_SOURCE = "--"
+DUPLICATES_COLUMN = "DUPLICATE OF"
+# Archives named per duplicated source, the rest are only counted.
+DUPLICATES_SHOWN = 5
+
+
+def folder_name(input_path) -> str:
+    return pathlib.Path(input_path).name.replace(".zip", "")
+
+
+# Shared by every record until a scan or edit gives it its own value.
+UNSELECTED = (None, None, None)
+EMPTY_MAP = MappingProxyType({})
+
+
+class Record:
+    # One tabulated archive. Slots keep a row to the attributes below, the
+    # table renders straight from these and no widget holds any state.
+    __slots__ = (
+        "number",
+        "folder",
+        "sources",
+        "error",
+        "selected",
+        "checked",
+        "locked",
+        "hidden",
+        "pdf_info",
+        "duplicates",
+    )
+
+    def __init__(self, number: int, folder: str, sources: Sources, error=None):
+        self.number = number
+        self.folder = folder
+        self.sources = sources
+        self.error = error
+        # Index of the chosen source per column, None until one is picked.
+        self.selected = UNSELECTED
+        self.checked = False
+        self.locked = False
+        self.hidden = False
+        self.pdf_info = EMPTY_MAP
+        self.duplicates = EMPTY_MAP
+
+    def select(self, column: int, index):
+        selected = list(self.selected)
+        selected[column] = index
+        self.selected = tuple(selected)
+
+
+def new_record(sources: Sources, row: int, input_path, error=None) -> Record:
+    return Record(row + 1, folder_name(input_path), sources, error)
+
+
+def source_text(record: Record, column: int):
+    # None means the user still has to pick one of several sources.
+    sources = record.sources[column]
+    if len(sources) > 1:
+        selected = record.selected[column]
+        return None if selected is None else sources[selected]
+    return sources[0] if sources else NO_SOURCE
+
+
+def record_values(record: Record):
+    if not any(record.sources.counts):
+        return None
+    return [record.folder] + [source_text(record, column) for column in range(3)]
+
+
+def report_values(record: Record) -> list:
+    # Without anyone to pick a source, every candidate is listed.
+    values = [record.folder]
+    for column, sources in enumerate(record.sources[:3]):
+        selected = record.selected[column]
+        if selected is not None:
+            values.append(sources[selected])
+        else:
+            values.append("; ".join(sources) if sources else NO_SOURCE)
+    return values
+
+
+def duplicate_text(record: Record) -> str:
+    # Reports name the earlier archives holding the same content, the first
+    # occurrence itself is not flagged.
+    row = record.number - 1
+    parts = []
+    for name, group in record.duplicates.items():
+        folders = group.folders(row, DUPLICATES_SHOWN, earlier=True)
+        if folders:
+            text = more_text(folders, group.count(row, earlier=True))
+            parts.append(f"{name} = {text}")
+    return "; ".join(parts)
+
+
+def more_text(folders: list, count: int) -> str:
+    more = count - len(folders)
+    return ", ".join(folders) + (f" and {more:,} more" if more else "")
+
+
+def collect_inputs(patterns: list, recursive: bool = False) -> list:
+    found = {}
+    for pattern in patterns:
+        path = pathlib.Path(pattern)
+        if path.is_dir():
+            matches = sorted(path.rglob("*.zip") if recursive else path.glob("*.zip"))
+        elif path.is_file():
+            matches = [path]
+        else:
+            matches = sorted(
+                pathlib.Path(each)
+                for each in glob.glob(os.path.expanduser(pattern), recursive=True)
+                if each.lower().endswith(".zip")
+            )
+        for match in matches:
+            found.setdefault(match.resolve(), match)
+    return list(found.values())
@@ -0,0 +1,85 @@
+import pathlib
+import re
+
+from PySide6.QtWidgets import QApplication
+
+from .trace import tracer
+
+THEMES_FOLDER = pathlib.Path(__file__).resolve().parents[1] / "themes"
+COMPONENTS = "components.qss"
+DEFAULT_THEME = "py_dracula_dark"
+
+# Values for the @names used in components.qss, one palette per theme file.
+PALETTES = {
+    "py_dracula_dark": {
+        "button_bg": "rgb(100, 30, 156)",
+        "button_hover_bg": "rgb(111, 56, 167)",
+        "button_border": "rgb(100, 100, 100)",
+        "browse_bg": "rgb(50, 50, 50)",
+        "disabled_bg": "rgb(50, 50, 50)",
+        "disabled_border": "rgb(100, 100, 100)",
+        "proceed_disabled_border": "rgb(150, 150, 150)",
+        "pressed_bg": "#6272a4",
+        "pressed_border": "#bd93f1",
+        "accent_border": "#6272a4",
+        "hover_border": "rgb(180, 100, 180)",
+        "focus_border": "rgb(139, 233, 253)",
+        "multiple_border": "rgb(255, 85, 85)",
+        "menu_selected_bg": "#566388",
+    },
+    "py_dracula_light": {
+        "button_bg": "#bd93f9",
+        "button_hover_bg": "#c9a7fa",
+        "button_border": "#6272a4",
+        "browse_bg": "#f8f8f2",
+        "disabled_bg": "#e0e0e0",
+        "disabled_border": "#aaaaaa",
+        "proceed_disabled_border": "#999999",
+        "pressed_bg": "#6272a4",
+        "pressed_border": "#bd93f9",
+        "accent_border": "#6272a4",
+        "hover_border": "rgb(180, 100, 180)",
+        "focus_border": "#7284b9",
+        "multiple_border": "rgb(255, 85, 85)",
+        "menu_selected_bg": "#7284b9",
+    },
+}
+
+compiled = {}
+current_theme = None
+
+
+def read_theme(name: str) -> str:
+    return (THEMES_FOLDER / f"{name}.qss").read_text(encoding="utf-8")
+
+
+def compile_components(name: str) -> str:
+    palette = PALETTES[name]
+    components = (THEMES_FOLDER / COMPONENTS).read_text(encoding="utf-8")
+    return re.sub(r"@(\w+)", lambda match: palette[match[1]], components)
+
+
+def compile_theme(name: str) -> str:
+    # Each theme is read and filled in once, switching back to it later only
+    # hands Qt the finished string.
+    found = compiled.get(name)
+    if found is None:
+        found = compiled[name] = read_theme(name) + "\n" + compile_components(name)
+    return found
+
+
+def apply_theme(name: str = DEFAULT_THEME, app: QApplication = None):
+    # One application-wide sheet is parsed once and matched by class and
+    # object name, instead of every widget instance parsing its own.
+    global current_theme
+    app = app or QApplication.instance()
+    # Setting the sheet repolishes every existing widget right away.
+    with tracer.span("apply_theme", "style", theme=name):
+        app.setStyleSheet(compile_theme(name))
+    current_theme = name
+
+
+def next_theme() -> str:
+    names = list(PALETTES)
+    index = names.index(current_theme) + 1 if current_theme in names else 0
+    return names[index % len(names)]
@@ -0,0 +1,117 @@
+import atexit
+import json
+import os
+import pathlib
+import threading
+import time
+from contextlib import nullcontext
+from typing import Optional
+
+# Past this many spans new ones are counted but not kept, a long session
+# with tracing left on cannot grow without bound.
+MAX_EVENTS = 1_000_000
+
+NULL_SPAN = nullcontext()
+
+
+class Span:
+    __slots__ = ("tracer", "name", "category", "args", "start")
+
+    def __init__(self, tracer: "Tracer", name: str, category: str, args: dict):
+        self.tracer = tracer
+        self.name = name
+        self.category = category
+        self.args = args
+
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, kind, error, traceback):
+        end = time.perf_counter_ns()
+        if kind is not None:
+            self.args["error"] = f"{kind.__name__}: {error}"
+        self.tracer.complete(self.name, self.category, self.start, end, self.args)
+
+
+class Tracer:
+    def __init__(self, path=None) -> None:
+        self.path = None
+        self.enabled = False
+        self.events = []
+        self.dropped = 0
+        self.threads = {}
+        self.origin = time.perf_counter_ns()
+        self.pid = os.getpid()
+        if path:
+            self.start(path)
+
+    def start(self, path=None):
+        # Spans are kept in memory and written once, at exit or on demand.
+        if path is not None and self.path is None:
+            atexit.register(self.flush)
+        self.path = pathlib.Path(path) if path is not None else self.path
+        self.enabled = True
+
+    def stop(self):
+        self.enabled = False
+
+    def span(self, name: str, category: str = "needle", **args):
+        # Disabled, a span is the shared no-op context and nothing is timed.
+        if not self.enabled:
+            return NULL_SPAN
+        return Span(self, name, category, args)
+
+    def complete(self, name: str, category: str, start: int, end: int, args: dict):
+        if len(self.events) >= MAX_EVENTS:
+            self.dropped += 1
+            return
+        thread = threading.get_native_id()
+        if thread not in self.threads:
+            self.threads[thread] = threading.current_thread().name
+        event = {
+            "name": name,
+            "cat": category,
+            "ph": "X",
+            "ts": (start - self.origin) / 1000,
+            "dur": (end - start) / 1000,
+            "pid": self.pid,
+            "tid": thread,
+        }
+        if args:
+            event["args"] = args
+        # list.append is atomic, worker threads need no lock.
+        self.events.append(event)
+
+    def trace_events(self) -> list:
+        names = [
+            {
+                "name": "thread_name",
+                "ph": "M",
+                "pid": self.pid,
+                "tid": thread,
+                "args": {"name": name},
+            }
+            for thread, name in list(self.threads.items())
+        ]
+        return names + list(self.events)
+
+    def write(self, path) -> pathlib.Path:
+        # Chrome's about:tracing and ui.perfetto.dev both open this format.
+        path = pathlib.Path(path)
+        payload = {"traceEvents": self.trace_events(), "displayTimeUnit": "ms"}
+        if self.dropped:
+            payload["otherData"] = {"dropped_spans": self.dropped}
+        path.write_text(json.dumps(payload, default=str), encoding="utf-8")
+        return path
+
+    def flush(self) -> Optional[pathlib.Path]:
+        import multiprocessing
+
+        # Pool processes inherit NEEDLE_TRACE, only the parent writes the file.
+        if self.path is None or not self.events or multiprocessing.parent_process():
+            return None
+        return self.write(self.path)
+
+
+tracer = Tracer(os.environ.get("NEEDLE_TRACE"))
@@ -0,0 +1,106 @@
+import os
+import pathlib
+from typing import Iterable, NamedTuple
+
+from PySide6.QtCore import QFileSystemWatcher, QObject, QTimer, Signal
+
+# Events are coalesced for this long, a copy into the inbox fires many.
+DEBOUNCE_MS = 750
+
+
+class FolderChanges(NamedTuple):
+    added: list
+    changed: list
+    removed: list
+
+    def __bool__(self) -> bool:
+        return bool(self.added or self.changed or self.removed)
+
+
+def snapshot(folders: Iterable) -> dict:
+    # One scandir per folder, size and mtime come with the directory entry
+    # on most platforms.
+    found = {}
+    for folder in folders:
+        try:
+            entries = os.scandir(folder)
+        except OSError:
+            continue
+        with entries:
+            for entry in entries:
+                if not entry.name.lower().endswith(".zip"):
+                    continue
+                try:
+                    if not entry.is_file():
+                        continue
+                    stat = entry.stat()
+                except OSError:
+                    continue
+                found[pathlib.Path(entry.path)] = (stat.st_size, stat.st_mtime_ns)
+    return found
+
+
+class FolderWatcher(QObject):
+    changes = Signal(object)
+
+    def __init__(self, folders: Iterable, known: dict = None, parent=None) -> None:
+        super().__init__(parent)
+        self.folders = [pathlib.Path(each) for each in folders]
+        # What the table shows, and what the previous poll saw.
+        self.known = snapshot(self.folders) if known is None else dict(known)
+        self.seen = dict(self.known)
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.setInterval(DEBOUNCE_MS)
+        self.timer.timeout.connect(self.poll)
+        self.watcher = QFileSystemWatcher(self)
+        self.watcher.directoryChanged.connect(self.schedule)
+        self.watcher.fileChanged.connect(self.schedule)
+
+    def start(self):
+        folders = [each.as_posix() for each in self.folders if each.is_dir()]
+        if folders:
+            self.watcher.addPaths(folders)
+        self.watch_files()
+
+    def stop(self):
+        self.timer.stop()
+        for paths in (self.watcher.directories(), self.watcher.files()):
+            if paths:
+                self.watcher.removePaths(paths)
+
+    def watch_files(self):
+        # Rewrites in place do not always touch the directory, the archives
+        # themselves are watched too.
+        files = [path.as_posix() for path in self.known]
+        missing = sorted(set(files) - set(self.watcher.files()))
+        if missing:
+            self.watcher.addPaths(missing)
+
+    def schedule(self, path: str = ""):
+        self.timer.start()
+
+    def poll(self):
+        current = snapshot(self.folders)
+        added, changed, unsettled = [], [], False
+        for path, stat in current.items():
+            if self.known.get(path) == stat:
+                continue
+            # An archive still being written changes between polls, it is
+            # only picked up once two polls agree.
+            if self.seen.get(path) != stat:
+                unsettled = True
+                continue
+            (changed if path in self.known else added).append(path)
+            self.known[path] = stat
+        removed = [path for path in self.known if path not in current]
+        for path in removed:
+            del self.known[path]
+        self.seen = current
+        if unsettled:
+            self.timer.start()
+        if added:
+            self.watch_files()
+        changes = FolderChanges(sorted(added), sorted(changed), sorted(removed))
+        if changes:
+            self.changes.emit(changes)
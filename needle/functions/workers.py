@@ -0,0 +1,169 @@
+import threading
+import time
+
+from PySide6.QtCore import QObject, QRunnable, Signal
+
+from .export import write_report
+from .nested import error_text
+from .trace import tracer
+
+
+class ScanSignals(QObject):
+    rows = Signal(list)
+    progress = Signal(int, int, str)
+    finished = Signal(bool)
+
+
+class ScanWorker(QRunnable):
+    # Results are handed to the GUI thread in batches at most this often, so
+    # each batch is a single model insert that fits inside one frame.
+    EMIT_INTERVAL = 0.05
+    MAX_BATCH = 512
+
+    def __init__(self, input_paths: list, scanner, rows: list = None) -> None:
+        super().__init__()
+        self.input_paths = list(input_paths)
+        self.scanner = scanner
+        self.rows = rows
+        self.signals = ScanSignals()
+        self.cancelled = threading.Event()
+
+    def cancel(self):
+        self.cancelled.set()
+
+    def run(self):
+        total = len(self.input_paths)
+        batch = []
+        done = 0
+        emitted = time.monotonic()
+        results = self.scanner.scan(self.input_paths, self.rows)
+        try:
+            for result in results:
+                if self.cancelled.is_set():
+                    break
+                done += 1
+                batch.append(result)
+                now = time.monotonic()
+                if len(batch) >= self.MAX_BATCH or now - emitted >= self.EMIT_INTERVAL:
+                    self.signals.rows.emit(batch)
+                    self.signals.progress.emit(done, total, result.path.name)
+                    batch = []
+                    emitted = now
+        finally:
+            results.close()
+            if batch:
+                self.signals.rows.emit(batch)
+                self.signals.progress.emit(done, total, "")
+            self.signals.finished.emit(self.cancelled.is_set())
+
+
+class ExportSignals(QObject):
+    finished = Signal(object)
+    failed = Signal(str)
+
+
+class ExportWorker(QRunnable):
+    def __init__(self, path, rows: list, columns) -> None:
+        super().__init__()
+        self.path = path
+        self.rows = rows
+        self.columns = columns
+        self.signals = ExportSignals()
+
+    def run(self):
+        try:
+            with tracer.span(
+                "write_report", "export", path=str(self.path), rows=len(self.rows)
+            ):
+                stats = write_report(self.path, self.rows, self.columns)
+        except Exception as error:
+            # Writer libraries raise their own types, xlsxwriter's
+            # FileCreateError among them. Whatever it is, the page is told.
+            self.signals.failed.emit(error_text(error))
+        else:
+            self.signals.finished.emit(stats)
+
+
+class SegregationSignals(QObject):
+    verdicts = Signal(list)
+    progress = Signal(int, int)
+    finished = Signal(object)
+
+
+class SegregationWorker(QRunnable):
+    EMIT_INTERVAL = ScanWorker.EMIT_INTERVAL
+    MAX_BATCH = ScanWorker.MAX_BATCH
+
+    def __init__(self, jobs: list, segregator) -> None:
+        super().__init__()
+        self.jobs = list(jobs)
+        self.segregator = segregator
+        self.signals = SegregationSignals()
+        self.cancelled = threading.Event()
+
+    def cancel(self):
+        self.cancelled.set()
+
+    def run(self):
+        total = len(self.jobs)
+        batch = []
+        done = 0
+        emitted = time.monotonic()
+        results = self.segregator.run(self.jobs)
+        try:
+            for done, result in enumerate(results, 1):
+                if self.cancelled.is_set():
+                    break
+                batch.append(result)
+                now = time.monotonic()
+                if len(batch) >= self.MAX_BATCH or now - emitted >= self.EMIT_INTERVAL:
+                    self.signals.verdicts.emit(batch)
+                    self.signals.progress.emit(done, total)
+                    batch = []
+                    emitted = now
+        finally:
+            results.close()
+            if batch:
+                self.signals.verdicts.emit(batch)
+                self.signals.progress.emit(done, total)
+            self.signals.finished.emit(self.segregator.stats)
+
+
+class PdfInfoSignals(QObject):
+    infos = Signal(list)
+    finished = Signal(object)
+
+
+class PdfInfoWorker(QRunnable):
+    EMIT_INTERVAL = ScanWorker.EMIT_INTERVAL
+    MAX_BATCH = ScanWorker.MAX_BATCH
+
+    def __init__(self, jobs: list, inspector) -> None:
+        super().__init__()
+        self.jobs = list(jobs)
+        self.inspector = inspector
+        self.signals = PdfInfoSignals()
+        self.cancelled = threading.Event()
+
+    def cancel(self):
+        self.cancelled.set()
+
+    def run(self):
+        batch = []
+        emitted = time.monotonic()
+        results = self.inspector.run(self.jobs)
+        try:
+            for result in results:
+                if self.cancelled.is_set():
+                    break
+                batch.append(result)
+                now = time.monotonic()
+                if len(batch) >= self.MAX_BATCH or now - emitted >= self.EMIT_INTERVAL:
+                    self.signals.infos.emit(batch)
+                    batch = []
+                    emitted = now
+        finally:
+            results.close()
+            if batch:
+                self.signals.infos.emit(batch)
+            self.signals.finished.emit(self.inspector.stats)
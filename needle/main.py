@@ -1,12 +1,16 @@
 import sys
 import os
 import pathlib
+import time
 
 from modules import *
 from widgets import *
 from Custom_Widgets.Widgets import *
 from dialogs.ni_dialog import No_Input
-from functions.tabulate import TableModel
+from functions import icon_cache
+from functions.pages import PageRegistry
+from functions.theme import next_theme
+from functions.trace import tracer
 
 widgets = None
 
@@ -14,10 +18,22 @@ widgets = None
 class MainWindow(QMainWindow):
     def __init__(self):
         super().__init__()
+        started = time.perf_counter()
         self.ui = Ui_MainWindow()
-        self.ui.setupUi(self)
+        with tracer.span("setupUi", "page"):
+            self.ui.setupUi(self)
         global widgets
         widgets = self.ui
+
+        # Page contents are registered here and built on first navigation,
+        # setupUi only creates the empty pages.
+        self.pages = PageRegistry(widgets.stackedWidget)
+        self.pages.record("setupUi", time.perf_counter() - started)
+        self.pages.register(widgets.Tabulation)
+        self.pages.register(widgets.Segregation, self.buildSegregation)
+        self.pages.register(widgets.Compilation)
+        self.pages.register(widgets.Formatting)
+
         loadJsonStyle(self, self.ui)
 
         # QSizeGrip(self.ui.size_grip)
@@ -28,6 +44,8 @@ class MainWindow(QMainWindow):
         widgets.btn_compile.clicked.connect(self.buttonClick)
         widgets.btn_format.clicked.connect(self.buttonClick)
 
+        UIFunctions.registerMenu(self)
+
         self.numAddWidget = 1
         self.ui.titleContainer.addWidget(inputBlock())
 
@@ -41,43 +59,60 @@ class MainWindow(QMainWindow):
             UIFunctions.toggleRightBox(self, True)
 
         widgets.settingsTopBtn.clicked.connect(openCloseRightBox)
-        self.show()
 
+        # The theme goes on before the window is shown so every widget is
+        # polished once, against the final stylesheet.
         useCustomTheme = True
-        themeFile = r"needle\themes\py_dracula_dark.qss"
 
         if useCustomTheme:
-            UIFunctions.theme(self, themeFile, True)
+            UIFunctions.theme(self, Settings.THEME, True)
             AppFunctions.setThemeHack(self)
 
-        widgets.stackedWidget.setCurrentWidget(widgets.Tabulation)
-        widgets.btn_tabulate.setStyleSheet(
-            UIFunctions.selectMenu(widgets.btn_tabulate.styleSheet())
+        QShortcut(
+            QKeySequence("Ctrl+Shift+T"),
+            self,
+            lambda: UIFunctions.theme(self, next_theme(), True),
         )
+        self.pages.show(widgets.Tabulation)
+        UIFunctions.selectMenu(self, "btn_tabulate")
+        self.show()
+        icon_cache.prewarm()
+        if Settings.PREBUILD_PAGES:
+            QTimer.singleShot(0, self.pages.prebuild)
+        if os.environ.get("NEEDLE_TRACE_STARTUP"):
+            # The first zero timer fires once the window has been shown.
+            QTimer.singleShot(0, lambda: self.pages.trace(started))
+
+    def buildSegregation(self, page):
+        from functions.segregate import SegregationView
+
+        self.segregation = SegregationView()
+        widgets.SegregationLayout.addWidget(self.segregation)
+
+    def segregate(self, jobs, segregator):
+        self.pages.show(widgets.Segregation)
+        UIFunctions.selectMenu(self, "btn_arrange")
+        self.segregation.start(jobs, segregator)
 
     def buttonClick(self):
         btn = self.sender()
         btnName = btn.objectName()
 
         if btnName == "btn_tabulate":
-            widgets.stackedWidget.setCurrentWidget(widgets.Tabulation)
-            UIFunctions.resetStyle(self, btnName)
-            btn.setStyleSheet(UIFunctions.selectMenu(btn.styleSheet()))
+            self.pages.show(widgets.Tabulation)
+            UIFunctions.selectMenu(self, btnName)
 
         if btnName == "btn_arrange":
-            widgets.stackedWidget.setCurrentWidget(widgets.Segregation)
-            UIFunctions.resetStyle(self, btnName)
-            btn.setStyleSheet(UIFunctions.selectMenu(btn.styleSheet()))
+            self.pages.show(widgets.Segregation)
+            UIFunctions.selectMenu(self, btnName)
 
         if btnName == "btn_compile":
-            widgets.stackedWidget.setCurrentWidget(widgets.Compilation)  # SET PAGE
-            UIFunctions.resetStyle(self, btnName)  # RESET ANOTHERS BUTTONS SELECTED
-            btn.setStyleSheet(UIFunctions.selectMenu(btn.styleSheet()))  # SELECT MENU
+            self.pages.show(widgets.Compilation)  # SET PAGE
+            UIFunctions.selectMenu(self, btnName)
 
         if btnName == "btn_format":
-            widgets.stackedWidget.setCurrentWidget(widgets.Formatting)  # SET PAGE
-            UIFunctions.resetStyle(self, btnName)  # RESET ANOTHERS BUTTONS SELECTED
-            btn.setStyleSheet(UIFunctions.selectMenu(btn.styleSheet()))  # SELECT MENU
+            self.pages.show(widgets.Formatting)  # SET PAGE
+            UIFunctions.selectMenu(self, btnName)
 
 
 class btn_proceed(QPushButton):
@@ -86,39 +121,10 @@ class btn_proceed(QPushButton):
         self.make_settings()
 
     def make_settings(self):
-        icon = QIcon()
-        icon.addFile(
-            ":/icons/icons/cil-arrow-circle-right.png", QSize(), QIcon.Normal, QIcon.Off
-        )
-        self.setIcon(icon)
+        self.setIcon(icon_cache.icon("cil-arrow-circle-right.png"))
         self.setText("  Proceed")
         self.setMinimumHeight(40)
         self.setMinimumWidth(100)
-        self.setStyleSheet(
-            """
-    btn_proceed {
-        background-color: rgb(100, 30, 156);
-        border: 1.5px solid;
-        border-color: rgb(100, 100, 100);
-        border-radius: 15px;
-    }
-
-    btn_proceed:hover {
-        background-color: rgb(111, 56, 167);
-        border-color: rgb(180, 100, 180);
-    }
-
-    btn_proceed:disabled {
-        background-color: rgb(50, 50, 50);
-        border-color: rgb(150, 150, 150);
-    }
-
-    btn_proceed:pressed {
-        background-color: #6272a4;
-        border-color: #bd93f1;
-    }
-"""
-        )
 
 
 class btn_browse(QPushButton):
@@ -127,34 +133,9 @@ class btn_browse(QPushButton):
         self.make_settings()
 
     def make_settings(self):
-        icon = QIcon()
-        icon.addFile(":/icons/icons/cil-browser.png", QSize(), QIcon.Normal, QIcon.Off)
-        self.setIcon(icon)
+        self.setIcon(icon_cache.icon("cil-browser.png"))
         self.setMinimumHeight(40)
         self.setMinimumWidth(40)
-        self.setStyleSheet(
-            """
-    btn_browse {
-        background-color: rgb(50, 50, 50);
-        border: 1.5px solid;
-        border-color: #6272a4;
-        border-radius: 15px;
-    }
-
-    btn_browse:hover {
-        background-color: rgb(50, 50, 50);
-        border-color: rgb(180, 100, 180);
-        border-radius: 15px;
-    }
-
-    btn_browse:pressed {
-        background-color: #6272a4;
-        border-color: #bd93f9;
-        border-radius: 15px;
-    }
-
-"""
-        )
 
 
 class pathText(QLineEdit):
@@ -162,19 +143,6 @@ class pathText(QLineEdit):
         super(pathText, self).__init__()
         self.setPlaceholderText("Please browse your files here")
         self.setMinimumHeight(40)
-        self.setStyleSheet(
-            """
-    pathText {
-        border-radius:15px;
-        border-color: #6272a4;                               
-    }
-    
-    pathText:hover {
-        border-radius: 15px;
-        border-color: rgb(180, 100, 180);
-    }
-"""
-        )
 
 
 class inputBlock(QWidget):
@@ -234,10 +202,29 @@ class inputBlock(QWidget):
             No_Input().exec()
 
     def arrange_input(self):
+        # The scanning and export stack is imported on first use so it is not
+        # part of the time to the first window.
+        from functions.tabulate import TableModel, table_signals
+
+        table_signals.segregation_requested.connect(
+            self.window().segregate, Qt.UniqueConnection
+        )
+
         widgets.TableContainer.setAlignment(Qt.AlignTop)
-        widgets.TableContainer.addWidget(
-            TableModel(self.file_paths, widgets.TableContainer)
+        # Without configured folders, the folders the archives were picked
+        # from are the ones watched.
+        watch_folders = Settings.WATCH_FOLDERS or sorted(
+            {pathlib.Path(each).parent for each in self.file_paths}
         )
+        with tracer.span("proceed", "page", archives=len(self.file_paths)):
+            widgets.TableContainer.addWidget(
+                TableModel(
+                    self.file_paths,
+                    widgets.TableContainer,
+                    watch_folders,
+                    Settings.NESTED_DEPTH,
+                )
+            )
 
 
 class DropLineEdit(QtWidgets.QLineEdit):
@@ -7,12 +7,19 @@ class Settings:
     RIGHT_BOX_WIDTH = 240
     TIME_ANIMATION = 500
 
+    # BUILD PAGES NOT SHOWN YET WHILE THE APP IS IDLE
+    PREBUILD_PAGES = True
+
+    # INBOX FOLDERS FOR THE TABULATION WATCH, EMPTY WATCHES THE BROWSED FOLDERS
+    WATCH_FOLDERS = []
+
+    # LEVELS OF ARCHIVES INSIDE ZIP SOURCES TO OPEN WHILE TABULATING, 0 LISTS
+    # THEM BY NAME ONLY. EACH INNER ARCHIVE IS DECOMPRESSED TO BE LISTED
+    NESTED_DEPTH = 0
+
+    # THEME, A FILE NAME FROM THE THEMES FOLDER
+    THEME = "py_dracula_dark"
+
     # BTNS LEFT AND RIGHT BOX COLORS
     BTN_LEFT_BOX_COLOR = "background-color: rgb(44, 49, 58);"
     BTN_RIGHT_BOX_COLOR = "background-color: #39a8fc;"
-
-    # MENU SELECTED STYLESHEET
-    MENU_SELECTED_STYLESHEET = """
-    border-left: 22px solid qlineargradient(spread:pad, x1:0.034, y1:0, x2:0.216, y2:0, stop:0.499 rgba(255, 121, 198, 255), stop:0.5 rgba(85, 170, 255, 0));
-    background-color: rgb(40, 44, 52);
-    """
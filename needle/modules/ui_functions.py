@@ -1,4 +1,5 @@
 from main import *
+from functions.theme import apply_theme
 
 
 class UIFunctions(MainWindow):
@@ -122,31 +123,34 @@ class UIFunctions(MainWindow):
 
     # SELECT/DESELECT MENU
     # ///////////////////////////////////////////////////////////////
-    # SELECT
-    def selectMenu(getStyle):
-        select = getStyle + Settings.MENU_SELECTED_STYLESHEET
-        return select
-
-    # DESELECT
-    def deselectMenu(getStyle):
-        deselect = getStyle.replace(Settings.MENU_SELECTED_STYLESHEET, "")
-        return deselect
-
-    # START SELECTION
-    def selectStandardMenu(self, widget):
-        for w in self.ui.topMenu.findChildren(QPushButton):
-            if w.objectName() == widget:
-                w.setStyleSheet(UIFunctions.selectMenu(w.styleSheet()))
-
-    # RESET SELECTION
-    def resetStyle(self, widget):
-        for w in self.ui.topMenu.findChildren(QPushButton):
-            if w.objectName() != widget:
-                w.setStyleSheet(UIFunctions.deselectMenu(w.styleSheet()))
+    # REGISTER MENU BUTTONS ONCE
+    def registerMenu(self):
+        self.menuButtons = {
+            w.objectName(): w for w in self.ui.topMenu.findChildren(QPushButton)
+        }
+        self.selectedMenu = None
+
+    # SELECT, THE "selected" PROPERTY IS STYLED IN themes/components.qss
+    def selectMenu(self, widget):
+        button = self.menuButtons[widget]
+        if button is self.selectedMenu:
+            return
+        if self.selectedMenu is not None:
+            UIFunctions.setMenuSelected(self.selectedMenu, False)
+        UIFunctions.setMenuSelected(button, True)
+        self.selectedMenu = button
+
+    def setMenuSelected(button, selected):
+        button.setProperty("selected", selected)
+        # Property selectors are only re-evaluated when the widget is polished.
+        button.style().unpolish(button)
+        button.style().polish(button)
 
     # IMPORT THEMES FILES QSS/CSS
     # ///////////////////////////////////////////////////////////////
-    def theme(self, file, useCustomTheme):
+    def theme(self, name, useCustomTheme):
         if useCustomTheme:
-            str = open(file, "r").read()
-            self.ui.styleSheet.setStyleSheet(str)
+            # The theme is set on the application, the sheet generated into
+            # the central widget would otherwise take precedence over it.
+            self.ui.styleSheet.setStyleSheet("")
+            apply_theme(name)
@@ -0,0 +1,102 @@
+import io
+import pathlib
+import sys
+import tempfile
+import unittest
+import zipfile
+from unittest import mock
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parents[1] / "needle"))
+
+from functions import cdir
+
+MEMBERS = {
+    "data/DMC-HON-A-00001.xml": b"<dmodule/>" * 50,
+    "data/manual.pdf": b"%PDF-1.4 stored",
+    "data/été.sgm": b"<book/>",
+    "data/empty/": b"",
+}
+
+
+def expected(path: pathlib.Path) -> list:
+    with zipfile.ZipFile(path) as archive:
+        return [
+            cdir.Member(info.filename, info.compress_size, info.file_size, info.CRC)
+            for info in archive.infolist()
+        ]
+
+
+class CentralDirectoryTest(unittest.TestCase):
+    def setUp(self):
+        folder = tempfile.TemporaryDirectory()
+        self.addCleanup(folder.cleanup)
+        self.folder = pathlib.Path(folder.name)
+
+    def archive(self, name: str, comment: bytes = b"", **options) -> pathlib.Path:
+        path = self.folder / name
+        with zipfile.ZipFile(path, "w", **options) as archive:
+            for member, data in MEMBERS.items():
+                compression = zipfile.ZIP_STORED if member.endswith(".pdf") else None
+                archive.writestr(member, data, compress_type=compression)
+            archive.comment = comment
+        return path
+
+    def test_matches_zipfile(self):
+        path = self.archive("plain.zip", b"delivery", compression=zipfile.ZIP_DEFLATED)
+        self.assertEqual(cdir.read(str(path)), expected(path))
+        self.assertEqual(cdir.read(str(path), names_only=True), list(MEMBERS))
+
+    def test_zip64(self):
+        # Lowering zipfile's limit writes zip64 extra fields and end records
+        # without a 4 GiB file.
+        with mock.patch.object(zipfile, "ZIP64_LIMIT", 64):
+            path = self.archive("zip64.zip", compression=zipfile.ZIP_STORED)
+        raw = path.read_bytes()
+        self.assertIn(cdir.END_64_SIGNATURE, raw)
+        # Central headers past the limit carry saturated sizes.
+        central = raw[raw.index(b"PK\x01\x02") :]
+        self.assertIn(b"\xff" * 8, central)
+        self.assertEqual(cdir.read(str(path)), expected(path))
+
+    def test_prepended_data(self):
+        path = self.archive("plain.zip")
+        sfx = self.folder / "sfx.zip"
+        sfx.write_bytes(b"MZ stub" * 100 + path.read_bytes())
+        self.assertEqual(cdir.read(str(sfx), names_only=True), list(MEMBERS))
+
+    def test_unusual_archives_fall_back_to_zipfile(self):
+        # Bytes after the end record, which zipfile tolerates.
+        path = self.archive("odd.zip")
+        path.write_bytes(path.read_bytes() + b"\x00" * 16)
+        with self.assertRaises(cdir.CentralDirectoryError):
+            cdir.read(str(path))
+        self.assertEqual(cdir.list_member_info(str(path)), expected(path))
+        self.assertEqual(cdir.list_members(str(path)), list(MEMBERS))
+
+    def test_stored_inner_archive(self):
+        inner = self.archive("inner.zip")
+        outer = self.folder / "outer.zip"
+        with zipfile.ZipFile(outer, "w") as archive:
+            archive.write(inner, "SOURCE.zip")
+        with zipfile.ZipFile(outer) as archive:
+            info = archive.getinfo("SOURCE.zip")
+            self.assertEqual(cdir.list_inner_members(archive, info), list(MEMBERS))
+            with cdir.open_stored(
+                str(outer), info.header_offset, info.file_size
+            ) as stream:
+                self.assertEqual(stream.read(), inner.read_bytes())
+                stream.seek(-4, io.SEEK_END)
+                self.assertEqual(stream.read(), inner.read_bytes()[-4:])
+
+    def test_deflated_inner_archive(self):
+        inner = self.archive("inner.zip")
+        outer = self.folder / "outer.zip"
+        with zipfile.ZipFile(outer, "w", zipfile.ZIP_DEFLATED) as archive:
+            archive.write(inner, "SOURCE.zip")
+        with zipfile.ZipFile(outer) as archive:
+            info = archive.getinfo("SOURCE.zip")
+            self.assertEqual(cdir.list_inner_members(archive, info), list(MEMBERS))
+
+
+if __name__ == "__main__":
+    unittest.main()
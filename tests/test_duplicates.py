@@ -0,0 +1,51 @@
+import pathlib
+import sys
+import unittest
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parents[1] / "needle"))
+
+from functions.classify import Fingerprint, Sources
+from functions.duplicates import DuplicateIndex
+
+
+def sources(*fingerprints) -> Sources:
+    names = [fingerprint.name for fingerprint in fingerprints]
+    return Sources(names, [], [], fingerprints=fingerprints)
+
+
+class RemoveTest(unittest.TestCase):
+    def test_repeated_member(self):
+        # The same content under two names in one archive shares one key.
+        index = DuplicateIndex()
+        index.add(
+            0,
+            "FIRST",
+            sources(
+                Fingerprint("a.zip", "a.zip", 1, 10),
+                Fingerprint("copy.zip", "old/copy.zip", 1, 10),
+            ),
+        )
+        index.add(1, "SECOND", sources(Fingerprint("b.zip", "b.zip", 1, 10)))
+
+        self.assertEqual(index.remove(0), {(1, 10)})
+        self.assertEqual(index.rows_of({(1, 10)}), {1})
+        self.assertEqual(index.matches(1), {})
+        self.assertEqual(index.remove(1), set())
+        self.assertEqual(index.groups, {})
+
+    def test_repeated_member_alone(self):
+        index = DuplicateIndex()
+        index.add(
+            0,
+            "ONLY",
+            sources(
+                Fingerprint("a.zip", "a.zip", 1, 10),
+                Fingerprint("copy.zip", "old/copy.zip", 1, 10),
+            ),
+        )
+        self.assertEqual(index.remove(0), set())
+        self.assertEqual(index.groups, {})
+
+
+if __name__ == "__main__":
+    unittest.main()
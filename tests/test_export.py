@@ -0,0 +1,54 @@
+import csv
+import pathlib
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parents[1] / "needle"))
+
+from functions.export import FILE_FILTERS, ReportWriter, report_path, write_report
+
+
+class ReportPathTest(unittest.TestCase):
+    def test_typed_suffix_wins(self):
+        path = report_path("/out/report.CSV", "Excel (*.xlsx)")
+        self.assertEqual(path, pathlib.Path("/out/report.CSV"))
+
+    def test_missing_suffix_follows_filter(self):
+        for selected, suffix in (
+            ("Excel (*.xlsx)", ".xlsx"),
+            ("CSV (*.csv)", ".csv"),
+            ("Parquet (*.parquet)", ".parquet"),
+        ):
+            self.assertIn(selected, FILE_FILTERS)
+            path = report_path("/out/report", selected)
+            self.assertEqual(path, pathlib.Path("/out/report" + suffix))
+
+    def test_no_filter_defaults_to_excel(self):
+        self.assertEqual(report_path("/out/v1.2"), pathlib.Path("/out/v1.2.xlsx"))
+
+
+class WriteReportTest(unittest.TestCase):
+    def test_csv(self):
+        with tempfile.TemporaryDirectory() as folder:
+            path = report_path(pathlib.Path(folder) / "report", "CSV (*.csv)")
+            stats = write_report(path, [["A", "a.zip", "a.sgm", "--"]], "ABCD")
+            with open(path, newline="", encoding="utf-8") as report:
+                rows = list(csv.reader(report))
+        self.assertEqual(stats.rows, 1)
+        self.assertEqual(rows, [list("ABCD"), ["A", "a.zip", "a.sgm", "--"]])
+
+    def test_incomplete_writer_fails_on_creation(self):
+        class NoClose(ReportWriter):
+            def open(self):
+                pass
+
+            def write_chunk(self, chunk: list):
+                pass
+
+        with self.assertRaises(TypeError):
+            NoClose("/out/report.csv")
+
+
+if __name__ == "__main__":
+    unittest.main()
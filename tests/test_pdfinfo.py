@@ -0,0 +1,129 @@
+import io
+import pathlib
+import sys
+import tempfile
+import unittest
+import zipfile
+import zlib
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parents[1] / "needle"))
+
+from functions.pdfinfo import PdfError, inspect_archive, read_info
+
+
+def classic_pdf(pages: int, title: str, trailer: bytes = b"") -> bytes:
+    kids = " ".join(f"{3 + n} 0 R" for n in range(pages))
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        f"<< /Type /Pages /Kids [{kids}] /Count {pages} >>".encode(),
+    ]
+    objects += [b"<< /Type /Page /Parent 2 0 R >>"] * pages
+    objects.append(f"<< /Title ({title}) >>".encode())
+    out = bytearray(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+    offsets = []
+    for number, text in enumerate(objects, 1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n%s\nendobj\n" % (number, text)
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    out += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    out += b"trailer\n<< /Size %d /Root 1 0 R /Info %d 0 R %s>>\n" % (
+        len(objects) + 1,
+        len(objects),
+        trailer,
+    )
+    out += b"startxref\n%d\n%%%%EOF\n" % xref
+    return bytes(out)
+
+
+def compressed_pdf(pages: int) -> bytes:
+    # Catalog and page tree inside an object stream, located through a
+    # cross-reference stream.
+    inner = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        f"<< /Type /Pages /Kids [] /Count {pages} >>".encode(),
+    ]
+    header, data = [], b""
+    for number, text in enumerate(inner, 1):
+        header.append(b"%d %d" % (number, len(data)))
+        data += text + b"\n"
+    header = b" ".join(header) + b"\n"
+    packed = zlib.compress(header + data)
+    out = bytearray(b"%PDF-1.5\n")
+    container = len(out)
+    out += b"3 0 obj\n<< /Type /ObjStm /N 2 /First %d" % len(header)
+    out += b" /Length %d /Filter /FlateDecode >>\nstream\n" % len(packed)
+    out += packed + b"\nendstream\nendobj\n"
+    xref = len(out)
+    rows = [(0, 0, 255), (2, 3, 0), (2, 3, 1), (1, container, 0), (1, xref, 0)]
+    raw = b"".join(
+        bytes([kind]) + field.to_bytes(4, "big") + bytes([index])
+        for kind, field, index in rows
+    )
+    packed = zlib.compress(raw)
+    out += (
+        b"4 0 obj\n<< /Type /XRef /Size 5 /W [1 4 1] /Root 1 0 R"
+        b" /Filter /FlateDecode /Length %d >>\nstream\n" % len(packed)
+    )
+    out += packed + b"\nendstream\nendobj\nstartxref\n%d\n%%%%EOF\n" % xref
+    return bytes(out)
+
+
+def info_of(data: bytes):
+    return read_info(io.BytesIO(data), len(data), "manual.pdf")
+
+
+class ReadInfoTest(unittest.TestCase):
+    def test_plain(self):
+        info = info_of(classic_pdf(3, "Component Maintenance Manual"))
+        self.assertEqual(info.pages, 3)
+        self.assertEqual(info.version, "1.4")
+        self.assertEqual(info.title, "Component Maintenance Manual")
+        self.assertFalse(info.encrypted)
+        self.assertEqual(info.summary, "3 pp")
+
+    def test_encrypted(self):
+        info = info_of(classic_pdf(2, "ciphertext", b"/Encrypt 9 0 R "))
+        self.assertTrue(info.encrypted)
+        self.assertEqual(info.pages, 2)
+        # Strings of an encrypted file are not shown.
+        self.assertIsNone(info.title)
+        self.assertEqual(info.summary, "2 pp, encrypted")
+        self.assertIn("Encrypted: yes", info.description)
+
+    def test_cross_reference_stream(self):
+        info = info_of(compressed_pdf(7))
+        self.assertEqual(info.pages, 7)
+        self.assertEqual(info.version, "1.5")
+
+    def test_not_a_pdf(self):
+        with self.assertRaises(PdfError):
+            info_of(b"<html></html>")
+
+
+class InspectArchiveTest(unittest.TestCase):
+    def test_members(self):
+        folder = tempfile.TemporaryDirectory()
+        self.addCleanup(folder.cleanup)
+        path = pathlib.Path(folder.name) / "DELIVERY.zip"
+        with zipfile.ZipFile(path, "w") as archive:
+            archive.writestr("pdf/stored.pdf", classic_pdf(4, "Stored"))
+            archive.writestr(
+                "pdf/deflated.pdf",
+                classic_pdf(5, "Deflated", b"/Encrypt 9 0 R "),
+                compress_type=zipfile.ZIP_DEFLATED,
+            )
+            archive.writestr("pdf/broken.pdf", b"%PDF-1.4\ntruncated")
+
+        stored, deflated, broken, missing = inspect_archive(
+            path, ["stored.pdf", "deflated.pdf", "broken.pdf", "gone.pdf"]
+        )
+        self.assertEqual((stored.pages, stored.title), (4, "Stored"))
+        self.assertEqual((deflated.pages, deflated.encrypted), (5, True))
+        self.assertEqual(broken.error, "no startxref")
+        self.assertEqual(broken.summary, "unreadable")
+        self.assertEqual(missing.error, "not found")
+
+
+if __name__ == "__main__":
+    unittest.main()
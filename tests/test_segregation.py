@@ -0,0 +1,54 @@
+import pathlib
+import sys
+import tempfile
+import unittest
+import zipfile
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parents[1] / "needle"))
+
+from functions.segregation import (
+    ISPEC,
+    NON_S1000D,
+    S1000D,
+    UNREADABLE,
+    SegregationJob,
+    segregate,
+)
+from functions.tabulation import NO_SOURCE
+
+HEADERS = {
+    "dm.xml": b'<?xml version="1.0"?><dmodule xmlns:xsi="x"/>',
+    "ata.sgm": b'<!DOCTYPE cmm PUBLIC "-//ATA//DTD CMM//EN"><cmm/>',
+    "ispec.xml": b'<?xml version="1.0"?><amm xsi:noNamespaceSchemaLocation="iSpec2200.xsd"/>',
+    "plain.xml": b'<!DOCTYPE book SYSTEM "metadata.dtd"><book/>',
+}
+
+
+class SgmlSourceTest(unittest.TestCase):
+    def setUp(self):
+        folder = tempfile.TemporaryDirectory()
+        self.addCleanup(folder.cleanup)
+        self.path = pathlib.Path(folder.name) / "DELIVERY.zip"
+        with zipfile.ZipFile(self.path, "w", zipfile.ZIP_DEFLATED) as archive:
+            for name, header in HEADERS.items():
+                archive.writestr(f"data/{name}", header)
+
+    def verdict(self, name: str):
+        job = SegregationJob(0, self.path, "DELIVERY", NO_SOURCE, name, NO_SOURCE)
+        return segregate(job)
+
+    def test_categories(self):
+        self.assertEqual(self.verdict("dm.xml").category, S1000D)
+        self.assertEqual(self.verdict("ata.sgm").category, ISPEC)
+        self.assertEqual(self.verdict("ispec.xml").category, ISPEC)
+        # Unmarked markup is not ISPEC, DATA in metadata.dtd included.
+        self.assertEqual(self.verdict("plain.xml").category, NON_S1000D)
+
+    def test_missing_member(self):
+        verdict = self.verdict("gone.sgm")
+        self.assertEqual(verdict.category, UNREADABLE)
+        self.assertIn("not found", verdict.error)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,91 @@
+import io
+import pathlib
+import sys
+import tempfile
+import unittest
+import zipfile
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parents[1] / "needle"))
+
+from functions.sniff import sniff_archive, sniff_stream
+
+DATA_MODULE = b"""<?xml version="1.0" encoding="ISO-8859-1"?>
+<!-- generated -->
+<!DOCTYPE dmodule [
+  <!ENTITY ICN-1 SYSTEM "ICN-1.cgm" NDATA cgm>
+  <!NOTATION cgm PUBLIC "-//USA-DOD//NOTATION CGM//EN">
+]>
+<dmodule xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance"
+  xsi:noNamespaceSchemaLocation="http://www.s1000d.org/S1000D_4-1/xml_schema_flat/descript.xsd">
+<identAndStatusSection/>
+</dmodule>
+"""
+
+
+class SniffStreamTest(unittest.TestCase):
+    def sniff(self, head: bytes, **options):
+        return sniff_stream(io.BytesIO(head), "member.xml", **options)
+
+    def test_s1000d(self):
+        header = self.sniff(DATA_MODULE)
+        self.assertEqual(header.root, "dmodule")
+        self.assertEqual(header.doctype, "dmodule")
+        self.assertEqual(header.encoding, "ISO-8859-1")
+        self.assertIn("descript.xsd", header.schema)
+        self.assertEqual(header.kind, "S1000D")
+        self.assertIsNone(header.error)
+
+    def test_ispec(self):
+        header = self.sniff(
+            b'<!DOCTYPE cmm PUBLIC "-//ATA//DTD CMM//EN" "cmm.dtd">\n<cmm chapnbr="32">'
+        )
+        self.assertEqual(header.root, "cmm")
+        self.assertEqual(header.public_id, "-//ATA//DTD CMM//EN")
+        self.assertEqual(header.system_id, "cmm.dtd")
+        self.assertEqual(header.kind, "ISPEC")
+
+    def test_other_markup(self):
+        header = self.sniff(
+            b'<!DOCTYPE book SYSTEM "metadata.dtd"><x:book xmlns:x="urn:book"/>'
+        )
+        self.assertEqual(header.root, "book")
+        self.assertEqual(header.namespace, "urn:book")
+        self.assertIsNone(header.kind)
+
+    def test_utf16(self):
+        header = self.sniff('<?xml version="1.0"?><pm/>'.encode("utf-16"))
+        self.assertEqual(header.root, "pm")
+        self.assertEqual(header.kind, "S1000D")
+
+    def test_truncated(self):
+        header = self.sniff(b'<?xml version="1.0"?><dmod')
+        self.assertIsNone(header.root)
+        self.assertEqual(header.error, "no root element")
+
+    def test_limit(self):
+        header = self.sniff(b"<!--" + b"x" * 200 + b"--><dmodule/>", limit=100)
+        self.assertEqual(header.bytes_read, 100)
+        self.assertEqual(header.error, "header too long")
+
+
+class SniffArchiveTest(unittest.TestCase):
+    def test_members(self):
+        folder = tempfile.TemporaryDirectory()
+        self.addCleanup(folder.cleanup)
+        path = pathlib.Path(folder.name) / "DELIVERY.zip"
+        with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as archive:
+            archive.writestr("data/DMC-A.xml", DATA_MODULE)
+            archive.writestr("data/CMM.sgm", b"<!DOCTYPE cmm><cmm>")
+            archive.writestr("data/manual.pdf", b"%PDF-1.4")
+            archive.writestr("data/", b"")
+
+        headers = sniff_archive(path)
+        self.assertEqual([header.name for header in headers], ["DMC-A.xml", "CMM.sgm"])
+        self.assertEqual([header.root for header in headers], ["dmodule", "cmm"])
+        self.assertEqual(
+            [header.name for header in sniff_archive(path, ["CMM.sgm"])], ["CMM.sgm"]
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
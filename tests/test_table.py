@@ -0,0 +1,69 @@
+import os
+import pathlib
+import sys
+import unittest
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parents[1] / "needle"))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PySide6.QtWidgets import QApplication
+
+from functions.classify import Fingerprint, Sources
+from functions.tabulate import LoadTable
+from functions.tabulation import new_record
+
+app = QApplication.instance() or QApplication([])
+
+
+def record(row: int, crc: int):
+    fingerprints = (Fingerprint("same.sgm", "same.sgm", crc, 10),)
+    sources = Sources([], ["same.sgm"], [], fingerprints=fingerprints)
+    return new_record(sources, row, f"/deliveries/D{row}.zip")
+
+
+def folders(table: LoadTable) -> list:
+    proxy = table.model()
+    return [proxy.index(row, 1).data() for row in range(proxy.rowCount())]
+
+
+class DuplicateStatusTest(unittest.TestCase):
+    def test_appended_duplicates_are_searchable(self):
+        table = LoadTable()
+        for row in range(3):
+            table.source_model.append_rows([record(row, 1)])
+        table.model().set_query("duplicate")
+        self.assertEqual(folders(table), ["D0", "D1", "D2"])
+
+    def test_upserted_duplicates_are_searchable(self):
+        table = LoadTable()
+        table.source_model.append_rows([record(0, 1), record(1, 2)])
+        table.source_model.upsert_rows([record(1, 1), record(2, 1)])
+        table.model().set_query("duplicate")
+        self.assertEqual(folders(table), ["D0", "D1", "D2"])
+
+    def test_status_sort_sees_duplicates(self):
+        table = LoadTable()
+        table.source_model.append_rows([record(0, 9)])
+        for row in range(1, 4):
+            table.source_model.append_rows([record(row, 1 if row > 1 else 2)])
+        # D2 and D3 share content, the rest are plain "ok" rows.
+        table.model().sort_by("status")
+        self.assertEqual(folders(table), ["D2", "D3", "D0", "D1"])
+
+
+class RowOrderTest(unittest.TestCase):
+    def test_upsert_and_remove_keep_input_order(self):
+        table = LoadTable()
+        model = table.source_model
+        model.append_rows([record(row, row) for row in (0, 2, 4)])
+        model.upsert_rows([record(3, 3), record(1, 1), record(2, 7), record(5, 5)])
+        model.remove_numbers([3, 6])
+        self.assertEqual([each.number for each in model.rows], [1, 2, 4, 5])
+        self.assertEqual(model.numbers, [1, 2, 4, 5])
+        self.assertEqual([each.folder for each in model.rows], ["D0", "D1", "D3", "D4"])
+        self.assertEqual(model.position(5), 3)
+        self.assertEqual(model.position(3), -1)
+
+
+if __name__ == "__main__":
+    unittest.main()